@@ -0,0 +1,184 @@
+"""
+Benchmark allowlist bentuk parameter
+====================================
+Access log sintetis mirip produksi (seeded): beberapa endpoint dengan id
+numerik, UUID, token hex, tanggal, nilai enum, teks pencarian bebas dan
+~1% serangan. Allowlist dipelajari dari "hari 1" lalu "hari 2" (seed
+berbeda) diputar ulang lewat scan_lines dengan dan tanpa allowlist.
+
+Dicetak: ukuran file dan waktu save/load, false positive terukur pada
+key acak, lalu per run: µs verdict per payload (query sudah di-parse),
+throughput replay penuh (parse log + verdict), skip rate (bagian
+payload lolos tier 0 yang tidak perlu DFA) dan payload yang masih
+mencapai tier 1. Verdict kedua run harus identik.
+
+Regresi: bentuk dipelajari dari teks ternormalisasi, jadi bentuk bersih
+"id=5%20%20" tidak boleh meloloskan "id=1%27%23" (→ 1'#) dengan
+Normalizer aktif.
+
+Jalankan: python bench/bench_allowlist.py [jumlah_baris]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from urllib.parse import quote
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+from allowlist import ShapeAllowlist, log_samples
+from engine import Engine
+from logstream import extract_payloads, new_stats, parse_record, scan_lines
+from normalizer import Normalizer
+
+STATUSES = ['paid', 'pending', 'shipped', 'cancelled']
+SORTS = ['price-asc', 'price-desc', 'newest', 'rating']
+SEARCHES = ['red shoes', "men's jacket", 'usb-c cable', 'rock & roll t-shirt',
+            'o-ring 12mm', 'phone case', 'garden hose 15m', 'kid\'s bike']
+ATTACKS = ["1' OR '1'='1", "admin'--", "1 UNION SELECT username, password FROM users",
+           "x' AND 1=1 #", "1; DROP TABLE users", "' OR 1=1 --"]
+
+
+def _date(rng: random.Random) -> str:
+    return f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+
+def _query(rng: random.Random) -> str:
+    """Satu request target; ~1% parameter berisi serangan."""
+    kind = rng.randrange(6)
+    if kind == 0:
+        path, params = '/product', [('id', rng.randint(1, 99999)),
+                                    ('ref', f"{rng.getrandbits(64):016x}")]
+    elif kind == 1:
+        path, params = '/user', [('uid', uuid.UUID(int=rng.getrandbits(128)))]
+    elif kind == 2:
+        path, params = '/orders', [('from', _date(rng)), ('to', _date(rng)),
+                                   ('status', rng.choice(STATUSES)),
+                                   ('page', rng.randint(1, 40))]
+    elif kind == 3:
+        text = rng.choice(SEARCHES) if rng.random() < 0.8 else f"item {rng.randint(1, 999)}'s"
+        path, params = '/search', [('q', text), ('lang', rng.choice(['en', 'id']))]
+    elif kind == 4:
+        path, params = '/api/items', [('limit', rng.choice([10, 20, 50])),
+                                      ('offset', rng.randint(0, 500) * 10),
+                                      ('sort', rng.choice(SORTS))]
+    else:
+        path, params = '/cart', [('sku', f"SKU-{rng.randint(1000, 9999)}-{rng.choice('ABC')}"),
+                                 ('qty', rng.randint(1, 5)), ('coupon', rng.choice(['', 'SALE-10']))]
+    if rng.random() < 0.01:
+        i = rng.randrange(len(params))
+        params[i] = (params[i][0], rng.choice(ATTACKS))
+    return path + '?' + '&'.join(f"{k}={quote(str(v))}" for k, v in params)
+
+
+def write_log(path: str, n: int, seed: int):
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(n):
+            f.write(f'10.0.{i % 7}.{i % 250} - - [17/Oct/2026:13:55:36 +0000] '
+                    f'"GET {_query(rng)} HTTP/1.1" 200 {rng.randint(0, 9999)} "-" "bench"\n')
+
+
+def records(path: str) -> list:
+    """(endpoint, payload) per request, sudah di-parse."""
+    out = []
+    with open(path, 'rb') as f:
+        for line in f:
+            target = parse_record(line)[1]
+            out.append((target.partition('?')[0], extract_payloads(target)))
+    return out
+
+
+def verdict_time(requests: list, engine: Engine) -> float:
+    """µs per payload untuk analyze_batch saja."""
+    start = time.perf_counter()
+    count = 0
+    for endpoint, payloads in requests:
+        engine.analyze_batch(payloads, endpoint)
+        count += len(payloads)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def replay(path: str, engine: Engine) -> tuple:
+    stats = new_stats()
+    start = time.perf_counter()
+    with open(path, 'rb') as f:
+        verdicts = [r['detected'] for r in scan_lines(f, engine, stats)]
+    return time.perf_counter() - start, stats, verdicts
+
+
+def measured_fp(allowlist: ShapeAllowlist, trials: int = 200_000, seed: int = 3) -> int:
+    """Key acak yang tidak pernah dipelajari tetapi dianggap dikenal."""
+    rng = random.Random(seed)
+    return sum(rng.getrandbits(96).to_bytes(12, 'little') in allowlist.digests
+               for _ in range(trials))
+
+
+def check_escape_regression():
+    """Escape percent dengan digit berbeda tidak boleh berbagi bentuk."""
+    allowlist = ShapeAllowlist.learn([('/p', 'id=5%20%20')] * 3, Engine(normalizer=Normalizer(2)))
+    engine = Engine(normalizer=Normalizer(2), allowlist=allowlist)
+    result = engine.analyze_batch(['id=1%27%23'], '/p')[0]
+    assert result['detected'], "id=1%27%23 lolos lewat allowlist"
+    assert result['detected'] == Engine(normalizer=Normalizer(2)).analyze_batch(['id=1%27%23'])[0]['detected']
+    try:
+        Engine(allowlist=allowlist)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("allowlist dengan setelan normalizer berbeda diterima")
+    print("Regresi: id=1%27%23 terdeteksi walau id=5%20%20 dipelajari; "
+          "setelan normalizer berbeda ditolak\n")
+
+
+def main():
+    check_escape_regression()
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp:
+        day1, day2 = os.path.join(tmp, 'day1.log'), os.path.join(tmp, 'day2.log')
+        write_log(day1, n, seed=1)
+        write_log(day2, n, seed=2)
+
+        start = time.perf_counter()
+        with open(day1, 'rb') as f:
+            allowlist = ShapeAllowlist.learn(log_samples(f), Engine())
+        learn = time.perf_counter() - start
+        path = os.path.join(tmp, 'allowlist.bin')
+        start = time.perf_counter()
+        allowlist.save(path)
+        save = time.perf_counter() - start
+        start = time.perf_counter()
+        allowlist = ShapeAllowlist.load(path)
+        load = time.perf_counter() - start
+
+        st = allowlist.stats()
+        print(f"belajar {n:,} baris: {learn:.2f} s → {st['shapes']} bentuk, "
+              f"file {os.path.getsize(path):,} byte, {st['width']} byte/digest")
+        print(f"save {save * 1e3:.2f} ms, load {load * 1e3:.2f} ms")
+        trials = 1_000_000
+        print(f"FP budget {st['fp_budget']:.0e}, perkiraan {st['fp_expected']:.1e}, "
+              f"terukur {measured_fp(allowlist, trials)}/{trials:,} key acak\n")
+
+        requests = records(day2)
+        print(f"{'run':<10} {'µs verdict':>10} {'payload/s':>10} {'baris/s':>9} {'skip':>7} "
+              f"{'tier1':>7} {'detected':>9}")
+        verdicts = None
+        for label, make in (('tanpa', Engine), ('allowlist', lambda: Engine(allowlist=allowlist))):
+            verdict_us = verdict_time(requests, make())
+            engine = make()
+            elapsed, stats, detected = replay(day2, engine)
+            if verdicts is None:
+                verdicts = detected
+            assert detected == verdicts, "verdict berbeda dengan allowlist"
+            tiers = engine.tier_stats()
+            print(f"{label:<10} {verdict_us:10.2f} {stats['payloads'] / elapsed:10,.0f} "
+                  f"{stats['lines'] / elapsed:9,.0f} {tiers.get('allowlist_rate', 0.0):7.1%} "
+                  f"{tiers['tier1']:7d} {stats['detected']:9d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark scanning bytes/mmap vs pipeline str per baris
+=======================================================
+Mode --batch lama membaca setiap baris, decode ke str, lalu menjalankan
+tier 0/1 per payload. Mode --mmap mencari baris kandidat dengan regex
+bytes langsung di mmap dan hanya mendecode baris kandidat.
+
+File uji: satu payload per baris dari corpus seeded (bench/corpus.py),
+dengan proporsi serangan yang bisa diatur. Verdict terdeteksi kedua
+mode dibandingkan baris per baris, juga untuk file CRLF dengan
+signature ber-$ (pipeline str membuang '\r\n', regex bytes harus ikut).
+
+Jalankan: python bench/bench_bytescan.py [jumlah_baris]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+from corpus import generate_corpus
+from bytescan import scan_file
+from engine import Engine
+from logstream import new_stats, read_lines, scan_payload_lines
+from ruleset import DEFAULT_RULES, load_ruleset
+
+CLEAN_FAMILIES = ('form', 'json', 'near_miss')
+
+
+# Signature ber-$ untuk kasus CRLF (ditambahkan ke rules.dsl)
+LINE_END_RULES = """
+SIGNATURE trailing_quote
+    PATTERN: "'$"
+    SEVERITY: LOW
+    RESPONSE: LOG
+    MESSAGE: "Quote di akhir nilai"
+
+SIGNATURE trailing_drop
+    PATTERN: "DROP$"
+    SEVERITY: HIGH
+    RESPONSE: BLOCK
+    MESSAGE: "DROP di akhir nilai"
+"""
+
+
+def write_payload_file(path: str, n_lines: int, attack_rate: float, seed: int = 1,
+                       newline: str = '\n'):
+    corpus = generate_corpus(seed, per_bucket=100, lengths=(16, 64, 256, 1024))
+    clean = [c['payload'] for c in corpus if c['family'] in CLEAN_FAMILIES]
+    attacks = [c['payload'] for c in corpus if c['family'] not in CLEAN_FAMILIES]
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        for _ in range(n_lines):
+            pool = attacks if rng.random() < attack_rate else clean
+            f.write(rng.choice(pool) + newline)
+
+
+def run(scanner, engine) -> tuple:
+    stats = new_stats()
+    start = time.perf_counter()
+    hits = [(r['line'], r['type']) for r in scanner(engine, stats) if r['detected']]
+    return time.perf_counter() - start, hits, stats
+
+
+def main():
+    n_lines = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    engines = {'bawaan': Engine(), 'ruleset': Engine(ruleset=load_ruleset())}
+    print(f"{'serangan':>8} {'rules':<8} {'MB':>6} {'str s':>7} {'mmap s':>7} {'speedup':>8}"
+          f" {'decode':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'payloads.txt')
+        for rate in (0.01, 0.05, 0.2):
+            write_payload_file(path, n_lines, rate)
+            size = os.path.getsize(path) / 1e6
+            for label, engine in engines.items():
+                t_str, hits_str, _ = run(
+                    lambda e, s: scan_payload_lines(read_lines(path), e, s), engine)
+                t_mmap, hits_mmap, stats = run(
+                    lambda e, s: scan_file(path, e, s), engine)
+                assert hits_str == hits_mmap, "verdict mode mmap berbeda"
+                print(f"{rate:8.0%} {label:<8} {size:6.1f} {t_str:7.2f} {t_mmap:7.2f}"
+                      f" {t_str / t_mmap:7.1f}x {stats['records'] / stats['lines']:7.1%}")
+
+        # File CRLF + signature ber-$: verdict mmap harus tetap sama
+        rules = os.path.join(tmp, 'line_end.dsl')
+        with open(DEFAULT_RULES, encoding='utf-8') as src, open(rules, 'w') as dst:
+            dst.write(src.read() + LINE_END_RULES)
+        engine = Engine(ruleset=load_ruleset(rules))
+        write_payload_file(path, n_lines, 0.05, newline='\r\n')
+        with open(path, 'ab') as f:
+            f.write(b"a DROP\r\nid=7#\r\nq=o'\r\n")
+        _, hits_str, _ = run(lambda e, s: scan_payload_lines(read_lines(path), e, s), engine)
+        _, hits_mmap, _ = run(lambda e, s: scan_file(path, e, s), engine)
+        assert hits_str == hits_mmap, "verdict mode mmap berbeda pada file CRLF"
+        print(f"\nCRLF + signature $: {len(hits_str)} deteksi, identik str vs mmap")
+
+
+if __name__ == "__main__":
+    main()
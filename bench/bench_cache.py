@@ -0,0 +1,67 @@
+"""
+Benchmark VerdictCache pada trace Zipfian
+=========================================
+Trafik produksi miring: sedikit payload (health check, paginasi) muncul
+sangat sering. Trace di-replay dengan popularitas Zipf(s) di atas
+sejumlah payload unik, lalu dibandingkan tanpa dan dengan cache.
+
+Jalankan: python bench/bench_cache.py [panjang_trace] [payload_unik]
+"""
+
+import itertools
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bench_engine import make_batch
+from engine import Engine
+
+
+def zipf_trace(universe: list, n: int, s: float = 1.1, seed: int = 7) -> list:
+    """n payload dengan peluang rank k sebanding 1/k^s."""
+    rng = random.Random(seed)
+    weights = [1.0 / (k ** s) for k in range(1, len(universe) + 1)]
+    cum = list(itertools.accumulate(weights))
+    trace = rng.choices(universe, cum_weights=cum, k=n)
+    # Variasi huruf besar/kecil: key ternormalisasi tetap sama
+    return [p.upper() if rng.random() < 0.1 else p for p in trace]
+
+
+def run(engine: Engine, trace: list, batch: bool):
+    start = time.perf_counter()
+    if batch:
+        results = engine.analyze_batch(trace)
+    else:
+        analyze = engine.analyze
+        results = [analyze(p) for p in trace]
+    return time.perf_counter() - start, results
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    unique = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+    universe = list(dict.fromkeys(make_batch(unique * 2, seed=3)))[:unique]
+    trace = zipf_trace(universe, n)
+    print(f"Trace: {n} payload, {len(set(trace))} unik (Zipf s=1.1)\n")
+
+    print(f"{'mode':<22} {'cache':>8} {'waktu':>9} {'payload/s':>11} {'hit rate':>9} {'evict':>8}")
+    for batch in (False, True):
+        label = 'analyze_batch()' if batch else 'analyze()'
+        t_base, expected = run(Engine(), trace, batch)
+        print(f"{label:<22} {'-':>8} {t_base:8.2f}s {n / t_base:11,.0f} {'-':>9} {'-':>8}")
+        for size in (1_000, 10_000, 100_000):
+            engine = Engine(cache_size=size)
+            t, results = run(engine, trace, batch)
+            assert [(r['payload'], r['type'], r['action']) for r in results] == \
+                   [(r['payload'], r['type'], r['action']) for r in expected]
+            st = engine.cache.stats()
+            print(f"{label:<22} {size:>8} {t:8.2f}s {n / t:11,.0f} {st['hit_rate']:9.1%} "
+                  f"{st['evictions']:>8} ({t_base / t:.1f}x)")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark scanning resumable (Pike VM) vs `re` atas payload utuh
+================================================================
+Engine.stream() menerima payload per potongan (mis. body request yang
+datang bertahap) tanpa menampungnya utuh. Benchmark ini mengukur
+throughput feed() untuk beberapa ukuran potongan, dibandingkan dengan
+analyze_batch() yang menjalankan `re` di payload utuh, serta
+memastikan verdict keduanya sama.
+
+Payload uji: gabungan payload bersih dari corpus seeded (bench/corpus.py)
+sepanjang ±size byte, dengan/atau tanpa satu serangan di tengah.
+
+Jalankan: python bench/bench_chunked.py [ukuran_byte]
+"""
+
+import os
+import random
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+from corpus import generate_corpus
+from engine import Engine
+from ruleset import load_ruleset
+
+CLEAN_FAMILIES = ('form', 'json', 'near_miss')
+CHUNK_SIZES = (64, 4096)
+
+
+def build_payload(size: int, attack: bool, seed: int = 1) -> str:
+    corpus = generate_corpus(seed, per_bucket=50, lengths=(64, 256, 1024))
+    clean = [c['payload'] for c in corpus if c['family'] in CLEAN_FAMILIES]
+    attacks = [c['payload'] for c in corpus if c['family'] not in CLEAN_FAMILIES]
+    rng = random.Random(seed)
+    parts, total = [], 0
+    while total < size:
+        parts.append(rng.choice(clean))
+        total += len(parts[-1]) + 1
+    if attack:
+        parts.insert(len(parts) // 2, rng.choice(attacks))
+    return '&'.join(parts)
+
+
+def stream_scan(engine, data: bytes, chunk_size: int) -> tuple:
+    scanner = engine.stream()
+    start = time.perf_counter()
+    for i in range(0, len(data), chunk_size):
+        if scanner.feed(data[i:i + chunk_size]) is not None:
+            break
+    result = scanner.finish()
+    return time.perf_counter() - start, result
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    engines = {'bawaan': Engine(), 'ruleset': Engine(ruleset=load_ruleset())}
+    print(f"{'payload':<8} {'rules':<8} {'chunk':>6} {'stream MB/s':>12} {'re MB/s':>9}"
+          f" {'verdict':>8}")
+    for attack in (False, True):
+        payload = build_payload(size, attack)
+        data = payload.encode('utf-8')
+        for label, engine in engines.items():
+            start = time.perf_counter()
+            expected = engine.analyze_batch([payload])[0]
+            t_re = time.perf_counter() - start
+            for chunk_size in CHUNK_SIZES:
+                t_stream, result = stream_scan(engine, data, chunk_size)
+                assert result['detected'] == expected['detected'], "verdict stream berbeda"
+                print(f"{'serangan' if attack else 'bersih':<8} {label:<8} {chunk_size:6d}"
+                      f" {len(data) / t_stream / 1e6:12.2f} {len(data) / t_re / 1e6:9.1f}"
+                      f" {result['action']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark Engine.analyze_batch vs analyze() lama
+=================================================
+analyze() lama membangun Lexer, Parser dan DFASimulator baru untuk
+setiap payload. Engine dibangun sekali lalu dipakai ulang.
+
+Jalankan: python bench/bench_engine.py [jumlah_payload]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from automata import DFASimulator
+from engine import Engine
+from lexer import Lexer
+from parser import Parser
+
+
+def legacy_analyze(payload: str) -> dict:
+    """Replika analyze() sebelum Engine (tanpa output verbose)."""
+    result = {'payload': payload, 'detected': False, 'type': None, 'action': 'ALLOW'}
+    tokens = Lexer(payload).tokenize()
+    Parser(tokens).parse()
+    dfa_result = DFASimulator().check_sql_injection(payload)
+    if dfa_result['detected']:
+        result['detected'] = True
+        result['type'] = dfa_result['type']
+        result['action'] = 'BLOCK'
+    return result
+
+
+def make_batch(n: int, seed: int = 21) -> list:
+    rng = random.Random(seed)
+    words = ["admin", "user", "page", "sort", "name", "search", "order", "blue"]
+    attacks = ["id=1' OR '1'='1", "id=1' OR 1=1", "admin'--", "user'#",
+               "q=x' AND 'a'='a", "name=o'reilly"]
+    batch = []
+    for _ in range(n):
+        if rng.random() < 0.05:
+            batch.append(rng.choice(attacks))
+        else:
+            batch.append('&'.join(f"{rng.choice(words)}={rng.choice(words)}{rng.randint(0, 99)}"
+                                  for _ in range(rng.randint(1, 4))))
+    return batch
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    batch = make_batch(n)
+
+    start = time.perf_counter()
+    expected = [legacy_analyze(p) for p in batch]
+    t_legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine = Engine()
+    results = engine.analyze_batch(batch)
+    t_engine = time.perf_counter() - start
+
+    assert results == expected
+    print(f"{n} payload (hasil identik)")
+    print(f"  analyze() lama     : {t_legacy:7.2f} s  ({n / t_legacy:9.0f} payload/s)")
+    print(f"  Engine.analyze_batch: {t_engine:7.2f} s  ({n / t_engine:9.0f} payload/s)")
+    print(f"  speedup            : {t_legacy / t_engine:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark fingerprint token vs Parser (tier 2)
+==============================================
+Corpus seeded (bench/corpus.py). Untuk setiap panjang dicetak µs per
+payload untuk Lexer, Parser dan fingerprint (dari token yang sama),
+lalu recall per family serangan dan false positive per family bersih
+untuk fingerprint, DFA (pattern bawaan) dan pipeline Engine dengan
+fingerprints (DFA + fingerprint; hit fingerprint saja → ALERT).
+
+Terakhir, output CLI --batch --fingerprints dibandingkan dengan jalur
+--mmap dan --vectorize (keduanya harus memberi verdict yang identik,
+termasuk ALERT fingerprint untuk baris tanpa kandidat prefilter).
+
+Tabel fingerprint: signatures/fingerprints.txt (bangun ulang dengan
+python src/fingerprint.py signatures/attacks.txt signatures/benign.txt).
+
+Jalankan: python bench/bench_fingerprint.py
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+MAIN = os.path.join(BENCH_DIR, '..', 'src', 'main.py')
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+from automata import DFASimulator
+from corpus import FAMILIES, generate_corpus
+from engine import Engine
+from fingerprint import FingerprintTable
+from lexer import Lexer
+from parser import Parser
+
+ATTACK_FAMILIES = ('boolean', 'comment')
+
+
+def timed(fn, items, repeat: int = 3) -> tuple:
+    best, out = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = [fn(x) for x in items]
+        best = min(best, time.perf_counter() - start)
+    return best / len(items), out
+
+
+def main():
+    table = FingerprintTable.load()
+    corpus = generate_corpus(11, per_bucket=60, lengths=(16, 64, 256, 1024))
+    print(f"tabel: {len(table)} fingerprint (max_shape={table.max_shape})\n")
+
+    print(f"{'panjang':>7} {'lexer µs':>9} {'parser µs':>10} {'fingerprint µs':>15}")
+    for length in (16, 64, 256, 1024):
+        payloads = [c['payload'] for c in corpus if c['length'] == length]
+        t_lex, streams = timed(lambda p: Lexer(p).tokenize(), payloads)
+        t_parse, _ = timed(lambda t: Parser(t).parse(), streams)
+        t_fp, _ = timed(table.match, streams)
+        print(f"{length:7d} {t_lex * 1e6:9.1f} {t_parse * 1e6:10.1f} {t_fp * 1e6:15.1f}")
+
+    simulator = DFASimulator()
+    engine = Engine(fingerprints=table)
+    print(f"\n{'family':<10} {'fingerprint':>12} {'dfa':>7} {'engine':>7}   "
+          f"(recall serangan / FP bersih)")
+    for family in FAMILIES:
+        payloads = [c['payload'] for c in corpus if c['family'] == family]
+        by_fp = sum(table.match(Lexer(p).tokenize()) is not None for p in payloads)
+        by_dfa = sum(simulator.check_sql_injection(p)['detected'] for p in payloads)
+        by_engine = sum(r['detected'] for r in engine.analyze_batch(payloads))
+        kind = 'recall' if family in ATTACK_FAMILIES else 'FP'
+        print(f"{family:<10} {by_fp / len(payloads):12.1%} {by_dfa / len(payloads):7.1%} "
+              f"{by_engine / len(payloads):7.1%}   {kind}")
+
+    check_cli(corpus)
+
+
+def check_cli(corpus):
+    """--batch --fingerprints: jalur --mmap / --vectorize = jalur biasa."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'payloads.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            for c in corpus:
+                f.write(c['payload'].replace('\n', ' ') + '\n')
+        outputs = {}
+        for flag in ('', '--mmap', '--vectorize'):
+            cmd = [sys.executable, MAIN, '--batch', path, '--fingerprints'] + ([flag] if flag else [])
+            outputs[flag] = subprocess.run(cmd, capture_output=True, text=True,
+                                           check=True).stdout
+    alerts = outputs[''].count('FINGERPRINT')
+    print(f"\nCLI --batch --fingerprints: {len(corpus)} baris, {alerts} ALERT fingerprint")
+    for flag in ('--mmap', '--vectorize'):
+        same = outputs[flag] == outputs['']
+        print(f"  {flag:<12} {'✅ identik' if same else '❌ BERBEDA'}")
+        assert same, f"{flag} mengubah verdict --fingerprints"
+
+
+if __name__ == "__main__":
+    main()
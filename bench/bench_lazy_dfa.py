@@ -0,0 +1,129 @@
+"""
+Benchmark LazyDFA (Ruleset.check) vs `re` per signature
+=======================================================
+1. Corpus seeded (bench/corpus.py) dengan signatures/rules.dsl:
+   verdict, signature, dan span kedua cara harus sama; dicetak µs per
+   payload untuk setiap panjang.
+2. Latensi terburuk: signature pengguna yang rawan backtracking
+   (mis. "(\\w+\\s?)+;") pada payload musuh dengan panjang bertambah.
+   `re` tumbuh eksponensial, LazyDFA linear.
+3. Span locate() vs re.search pada pattern acak (seeded) dengan badan
+   repeat yang bisa kosong, mis. ".(?:(a*|a*(a|b)))+a*.".
+
+Jalankan: python bench/bench_lazy_dfa.py
+"""
+
+import os
+import random
+import re
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+from corpus import generate_corpus
+from lazy_dfa import LazyDFA
+from ruleset import DEFAULT_RULES, Signature, Ruleset, load_ruleset
+
+EVIL_PATTERN = r"(\w+\s?)+;"
+RE_BUDGET = 2.0  # detik; panjang berikutnya dilewati setelah re melewati ini
+
+
+def re_check(ruleset: Ruleset, payload: str) -> tuple:
+    """Cara lama: re.search per kandidat prefilter, match pertama."""
+    for i in ruleset.prefilter.candidates(payload):
+        match = ruleset.regex(i).search(payload)
+        if match:
+            return ruleset.signatures[i].name, match.span()
+    return None, None
+
+
+def lazy_check(ruleset: Ruleset, payload: str) -> tuple:
+    result = ruleset.check(payload)
+    return result['signature'], result['span']
+
+
+def random_pattern(rng: random.Random, depth: int = 0) -> str:
+    """Pattern kecil: alternatif, repeat (greedy/lazy/bounded) bersarang."""
+    if depth > 2 or rng.random() < 0.3:
+        return rng.choice(['a', 'b', '.', '[ab]', 'a*', 'b?', '\\d', '\\b', '^'])
+    kind = rng.random()
+    if kind < 0.35:
+        return ''.join(random_pattern(rng, depth + 1) for _ in range(rng.randint(1, 3)))
+    if kind < 0.6:
+        alts = [random_pattern(rng, depth + 1) for _ in range(rng.randint(2, 3))]
+        return '(?:' + '|'.join(alts) + ')'
+    quantifier = rng.choice(['*', '+', '?', '{0,2}', '{1,3}', '*?', '+?', '??', '{1,2}?'])
+    return '(?:' + random_pattern(rng, depth + 1) + ')' + quantifier
+
+
+def check_spans(n_patterns: int = 3000, seed: int = 19):
+    rng = random.Random(seed)
+    cases = [('.(?:(a*|a*(a|b)))+a*.', 'cab1')]
+    for _ in range(n_patterns):
+        pattern = random_pattern(rng)
+        for _ in range(8):
+            cases.append((pattern, ''.join(rng.choice('ab1c') for _ in range(rng.randint(0, 8)))))
+    for pattern, text in cases:
+        match = re.search(pattern, text, re.IGNORECASE)
+        got = LazyDFA([pattern]).locate(0, text)
+        assert got == (match.span() if match else None), f"span berbeda: {pattern!r} {text!r}"
+    print(f"\nspan locate() = re.search pada {len(cases):,} pasangan pattern/teks")
+
+
+def timed(fn, payloads, repeat: int = 3) -> tuple:
+    best, out = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = [fn(p) for p in payloads]
+        best = min(best, time.perf_counter() - start)
+    return best / len(payloads), out
+
+
+def main():
+    ruleset = load_ruleset(DEFAULT_RULES, use_cache=False)
+    corpus = generate_corpus(3, per_bucket=40)
+    print(f"{'panjang':>7} {'re µs':>8} {'lazy µs':>8} {'rasio':>6}")
+    for length in sorted({c['length'] for c in corpus}):
+        payloads = [c['payload'] for c in corpus if c['length'] == length]
+        t_re, expected = timed(lambda p: re_check(ruleset, p), payloads)
+        t_lazy, got = timed(lambda p: lazy_check(ruleset, p), payloads)
+        assert got == expected, f"hasil berbeda pada panjang {length}"
+        print(f"{length:7d} {t_re * 1e6:8.1f} {t_lazy * 1e6:8.1f} {t_lazy / t_re:5.1f}x")
+    print(f"cache: {ruleset.automaton.stats}")
+
+    evil = Ruleset([Signature('evil', EVIL_PATTERN, 'HIGH', 'BLOCK', 'backtracking')])
+    regex = re.compile(EVIL_PATTERN, re.IGNORECASE)
+    print(f"\nsignature {EVIL_PATTERN!r}, payload ';' + 'a' * n + '!'")
+    print(f"{'n':>6} {'re ms':>10} {'lazy ms':>9}")
+    re_slow = False
+    for n in (16, 18, 20, 22, 24, 26, 1000, 100_000):
+        payload = ';' + 'a' * n + '!'  # ';' agar lolos prefilter
+        start = time.perf_counter()
+        assert not evil.check(payload)['detected']
+        t_lazy = time.perf_counter() - start
+        if re_slow:
+            t_re = '-'
+        else:
+            start = time.perf_counter()
+            assert regex.search(payload) is None
+            elapsed = time.perf_counter() - start
+            re_slow = elapsed > RE_BUDGET
+            t_re = f"{elapsed * 1e3:10.1f}"
+        print(f"{n:6d} {t_re:>10} {t_lazy * 1e3:9.1f}")
+
+    # Cache kecil: flush + fallback NFA tetap memberi hasil yang sama
+    small = LazyDFA([s.pattern for s in ruleset.signatures], max_cache=16, max_flushes=1)
+    payloads = [c['payload'] for c in corpus]
+    for p in payloads:
+        mask = small.scan(p)
+        for i, sig in enumerate(ruleset.signatures):
+            assert bool(mask >> i & 1) == bool(ruleset.regex(i).search(p))
+    print(f"\ncache 16 transisi: {small.stats}")
+
+    check_spans()
+
+
+if __name__ == "__main__":
+    main()
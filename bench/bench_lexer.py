@@ -0,0 +1,93 @@
+"""
+Benchmark Lexer.tokenize (scanner single-pass)
+==============================================
+Membandingkan scanner master-regex dengan scanner lama (slice + coba
+9 pattern satu per satu) dan menunjukkan skala linear 100 B - 1 MB.
+
+Jalankan: python bench/bench_lexer.py
+"""
+
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from lexer import Lexer, Token, TokenType
+
+# Pattern terkompilasi scanner lama (satu regex per jenis token)
+LEGACY_PATTERNS = [(tt, re.compile(p, re.IGNORECASE)) for tt, p in Lexer.TOKEN_PATTERNS]
+
+
+def legacy_tokenize(text: str):
+    """Scanner lama: slice sisa input lalu coba setiap pattern."""
+    patterns = LEGACY_PATTERNS
+    tokens = []
+    position = 0
+    while position < len(text):
+        remaining = text[position:]
+        for token_type, pattern in patterns:
+            match = pattern.match(remaining)
+            if match:
+                value = match.group(0)
+                if token_type != TokenType.WHITESPACE:
+                    tokens.append(Token(token_type, value, position))
+                position += len(value)
+                break
+        else:
+            tokens.append(Token(TokenType.UNKNOWN, text[position], position))
+            position += 1
+    tokens.append(Token(TokenType.EOF, '', position))
+    return tokens
+
+
+def make_payload(size: int, seed: int = 1) -> str:
+    """Payload campuran form-post dan fragmen serangan sepanjang `size`."""
+    rng = random.Random(seed)
+    parts = ["user=admin", "&id=1' OR '1'='1", "&q=select+from", " 1=1 ",
+             "admin'--", "x#", "&n=12345", "a1b2", ";(", "\t"]
+    out = []
+    length = 0
+    while length < size:
+        part = rng.choice(parts)
+        out.append(part)
+        length += len(part)
+    return ''.join(out)[:size]
+
+
+def timeit(fn, arg, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def check_equivalence(samples: int = 2000):
+    rng = random.Random(7)
+    alphabet = "ab1 '\"=<>-#&?+*/%,.;()_OR AND\t"
+    for _ in range(samples):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        new = [(t.type, t.value, t.position) for t in Lexer(text).tokenize()]
+        old = [(t.type, t.value, t.position) for t in legacy_tokenize(text)]
+        assert new == old, text
+    print(f"Equivalence: {samples} payload acak menghasilkan token identik")
+
+
+def main():
+    check_equivalence()
+    print(f"\n{'size':>10} {'master (ms)':>12} {'ns/byte':>8} {'legacy (ms)':>12}")
+    for size in [100, 1_000, 10_000, 100_000, 1_000_000]:
+        text = make_payload(size)
+        new = timeit(lambda t: Lexer(t).tokenize(), text)
+        # Scanner lama kuadratik; dibatasi agar benchmark tetap singkat
+        old = timeit(legacy_tokenize, text, 1) if size <= 100_000 else None
+        old_s = f"{old * 1e3:12.2f}" if old is not None else f"{'-':>12}"
+        print(f"{size:>10} {new * 1e3:12.2f} {new / size * 1e9:8.0f} {old_s}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark overhead instrumentasi metrics
+========================================
+Membandingkan Engine tanpa metrics (hanya cek ``is None`` per tahap)
+dengan Engine(metrics=Metrics()) yang mencatat latency per tahap,
+hit per rule, ukuran payload dan verdict.
+
+Jalankan: python bench/bench_metrics.py [per_bucket]
+"""
+
+import gc
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+from corpus import generate_corpus
+from engine import Engine
+from metrics import Metrics
+
+
+def best_of(fn, repeat: int = 15) -> float:
+    best = float('inf')
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def main():
+    per_bucket = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    payloads = [item['payload'] for item in generate_corpus(1, per_bucket)]
+
+    plain = Engine()
+    measured = Engine(metrics=Metrics())
+    t_off = best_of(lambda: plain.analyze_batch(payloads))
+    t_on = best_of(lambda: measured.analyze_batch(payloads))
+    t_off_single = best_of(lambda: [plain.analyze(p) for p in payloads])
+    t_on_single = best_of(lambda: [measured.analyze(p) for p in payloads])
+
+    n = len(payloads)
+    print(f"{len(payloads)} payload")
+    print(f"{'mode':<16} {'off µs/payload':>15} {'on µs/payload':>14} {'overhead':>9}")
+    for label, off, on in (('analyze_batch', t_off, t_on),
+                           ('analyze', t_off_single, t_on_single)):
+        print(f"{label:<16} {off / n * 1e6:15.2f} {on / n * 1e6:14.2f} {on / off - 1:9.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark Normalizer (transducer satu pass) vs rantai decoder naif
+==================================================================
+Rantai naif: unquote_plus, unquote × (depth - 1), re.sub komentar,
+re.sub whitespace, casefold — setiap tahap membuat string baru.
+Transducer (normalizer.py) menghasilkan teks yang sama plus offset map
+ke payload mentah dalam satu pass. Kolom 'naif+map' adalah rantai yang
+sama dengan offset per karakter dibawa di setiap tahap (syarat untuk
+melaporkan span di payload mentah).
+
+Payload uji: corpus seeded (bench/corpus.py) dalam beberapa bentuk
+evasion: asli, URL-encoded, double-encoded, spasi → /**/, spasi → '+'.
+Hasil kedua cara dibandingkan per payload; di akhir dicetak recall
+deteksi serangan ter-encode dengan dan tanpa normalizer.
+
+Jalankan: python bench/bench_normalizer.py [depth]
+"""
+
+import os
+import re
+import sys
+import time
+from urllib.parse import quote, unquote, unquote_plus
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+from corpus import generate_corpus
+from engine import Engine
+from normalizer import Normalizer
+
+ATTACK_FAMILIES = ('boolean', 'comment')
+INLINE_COMMENT = re.compile(r'/\*!\d*|/\*.*?\*/|\*/', re.S)
+WHITESPACE = re.compile(r'\s+')
+ESCAPE_RUN = re.compile(r'(?:%[0-9A-Fa-f]{2})+')
+PLUS = re.compile(r'\+')
+
+VARIANTS = {
+    'asli': lambda p: p,
+    'url': lambda p: quote(p, safe='=&'),
+    'url x2': lambda p: quote(quote(p, safe='=&'), safe='=&'),
+    'komentar': lambda p: p.replace(' ', '/**/'),
+    'plus': lambda p: p.replace(' ', '+'),
+}
+
+
+def naive_normalize(payload: str, depth: int) -> str:
+    if depth:
+        payload = unquote_plus(payload)
+    for _ in range(depth - 1):
+        payload = unquote(payload)
+    payload = INLINE_COMMENT.sub(' ', payload)
+    return WHITESPACE.sub(' ', payload).casefold()
+
+
+def _rewrite(text: str, origin: list, pattern, repl) -> tuple:
+    """Satu tahap naif dengan offset: setiap karakter hasil repl → awal match."""
+    out, org, last = [], [], 0
+    for m in pattern.finditer(text):
+        out.append(text[last:m.start()])
+        org.extend(origin[last:m.start()])
+        replacement = repl(m)
+        out.append(replacement)
+        org.extend([origin[m.start()]] * len(replacement))
+        last = m.end()
+    out.append(text[last:])
+    org.extend(origin[last:])
+    return ''.join(out), org
+
+
+def naive_normalize_map(payload: str, depth: int) -> tuple:
+    text, origin = payload, list(range(len(payload)))
+    unquote_run = lambda m: bytes.fromhex(m.group().replace('%', '')).decode('utf-8', 'replace')
+    for level in range(depth):
+        if level == 0:
+            text, origin = _rewrite(text, origin, PLUS, lambda m: ' ')
+        text, origin = _rewrite(text, origin, ESCAPE_RUN, unquote_run)
+    text, origin = _rewrite(text, origin, INLINE_COMMENT, lambda m: ' ')
+    text, origin = _rewrite(text, origin, WHITESPACE, lambda m: ' ')
+    folded = text.casefold()
+    if len(folded) != len(text):
+        origin = [o for c, o in zip(text, origin) for _ in c.casefold()]
+    return folded, origin
+
+
+def timed(fn, payloads, repeat: int = 3) -> tuple:
+    best, out = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = [fn(p) for p in payloads]
+        best = min(best, time.perf_counter() - start)
+    return best / len(payloads), out
+
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    normalizer = Normalizer(depth)
+    corpus = generate_corpus(3, per_bucket=40, lengths=(16, 64, 256, 1024))
+
+    print(f"{'varian':<9} {'panjang':>7} {'naif µs':>8} {'naif+map µs':>12}"
+          f" {'transducer µs':>14} {'vs naif':>8} {'vs map':>7}")
+    for name, encode in VARIANTS.items():
+        for length in (16, 64, 256, 1024):
+            payloads = [encode(c['payload']) for c in corpus if c['length'] == length]
+            t_naive, expected = timed(lambda p: naive_normalize(p, depth), payloads)
+            t_map, mapped = timed(lambda p: naive_normalize_map(p, depth)[0], payloads)
+            t_trans, got = timed(lambda p: normalizer.normalize(p).text, payloads)
+            assert got == expected == mapped, f"hasil berbeda untuk varian {name}"
+            print(f"{name:<9} {length:7d} {t_naive * 1e6:8.1f} {t_map * 1e6:12.1f}"
+                  f" {t_trans * 1e6:14.1f} {t_trans / t_naive:7.1f}x {t_trans / t_map:6.2f}x")
+
+    attacks = [c['payload'] for c in corpus if c['family'] in ATTACK_FAMILIES]
+    print(f"\nrecall serangan ter-encode (depth={depth}):")
+    for label, engine in (('tanpa', Engine()), ('normalizer', Engine(normalizer=normalizer))):
+        recalls = []
+        for name, encode in VARIANTS.items():
+            results = engine.analyze_batch([encode(p) for p in attacks])
+            recalls.append(f"{name} {sum(r['detected'] for r in results) / len(results):6.1%}")
+        print(f"  {label:<11} " + '  '.join(recalls))
+
+
+if __name__ == "__main__":
+    main()
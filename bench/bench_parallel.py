@@ -0,0 +1,55 @@
+"""
+Benchmark scanning paralel: 1, 2, 4, 8 worker
+=============================================
+Jalankan: python bench/bench_parallel.py [jumlah_baris]
+"""
+
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_stream import write_log
+from engine import Engine
+from logstream import run_stream
+from parallel import run_parallel_stream
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 400_000
+    devnull = open(os.devnull, 'w')
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'access.log')
+        write_log(path, n)
+        print(f"{n} baris ({os.path.getsize(path) / 1e6:.1f} MB), "
+              f"CPU tersedia: {len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()}")
+
+        engine = Engine()
+        # Urutan output (semua verdict) harus identik dengan mode sekuensial
+        expected = io.StringIO()
+        run_stream(path, engine, show_all=True, out=expected, err=devnull)
+        out = io.StringIO()
+        run_parallel_stream(path, 4, show_all=True, out=out, err=devnull, engine=engine)
+        assert out.getvalue() == expected.getvalue(), "urutan output berbeda"
+        print("Output 4 worker identik dengan sekuensial (--all)")
+
+        # Pengukuran memakai output default (hanya deteksi)
+        start = time.perf_counter()
+        run_stream(path, engine, out=devnull, err=devnull)
+        t_seq = time.perf_counter() - start
+        print(f"\n{'worker':>7} {'waktu (s)':>10} {'baris/s':>10} {'speedup':>8}")
+        print(f"{'seq':>7} {t_seq:10.2f} {n / t_seq:10.0f} {1.0:8.2f}")
+
+        for workers in [1, 2, 4, 8]:
+            start = time.perf_counter()
+            run_parallel_stream(path, workers, out=devnull, err=devnull, engine=engine)
+            elapsed = time.perf_counter() - start
+            print(f"{workers:>7} {elapsed:10.2f} {n / elapsed:10.0f} {t_seq / elapsed:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark Parser predictive satu lintasan
+=========================================
+Parser lama memindai seluruh daftar token 3-4 kali dengan any() dan
+membuat child AST statis. Parser baru membaca token sekali, berhenti
+pada serangan pertama (tanpa explain) dan menghasilkan span asli.
+
+Jalankan: python bench/bench_parser.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from lexer import Lexer, TokenType
+from parser import Parser
+
+
+def legacy_parse(tokens: list) -> bool:
+    """Alur parser lama: scan any() berulang + scan pengumpul nilai."""
+    has_or_and = any(t.type == TokenType.SQL_KEYWORD and t.value.upper() in ['OR', 'AND']
+                     for t in tokens)
+    has_always_true = any(t.type == TokenType.ALWAYS_TRUE for t in tokens)
+    if has_or_and and has_always_true:
+        parts = [t.value for t in tokens
+                 if t.type in [TokenType.SQL_QUOTE, TokenType.SQL_KEYWORD,
+                               TokenType.ALWAYS_TRUE, TokenType.SQL_OPERATOR,
+                               TokenType.NUMBER]]
+        return bool(parts)
+    if any(t.type == TokenType.SQL_COMMENT for t in tokens):
+        return next(t for t in tokens if t.type == TokenType.SQL_COMMENT) is not None
+    return False
+
+
+def best_of(fn, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    filler = "user=admin&page=2&q=blue shoes&"
+    cases = {
+        'bersih': '',
+        "serangan di akhir": "id=1' OR '1'='1",
+        "serangan di awal": None,
+    }
+    print(f"{'kasus':<18} {'token':>9} {'lama ms':>9} {'baru ms':>9} {'explain ms':>11}"
+          f" {'ns/token':>9}")
+    for label, attack in cases.items():
+        for reps in (100, 1_000, 10_000, 100_000):
+            if attack is None:
+                text = "admin'-- " + filler * reps
+            else:
+                text = filler * reps + attack
+            stream = Lexer(text).tokenize()
+            tokens = list(stream)
+            n = len(stream)
+            t_old = best_of(lambda: legacy_parse(tokens))
+            t_new = best_of(lambda: Parser(stream).parse())
+            t_explain = best_of(lambda: Parser(stream, explain=True).parse())
+            print(f"{label:<18} {n:>9} {t_old * 1e3:9.2f} {t_new * 1e3:9.2f}"
+                  f" {t_explain * 1e3:11.2f} {t_new / n * 1e9:9.0f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark prefilter Aho-Corasick pada trafik bersih
+====================================================
+Membandingkan loop lama (re.search), loop regex terkompilasi, dan
+versi prefilter, untuk SQL_PATTERNS dan SQL_PATTERNS + rules.dsl.
+
+Jalankan: python bench/bench_prefilter.py
+"""
+
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from automata import DFASimulator
+from prefilter import LiteralPrefilter
+
+RULES = os.path.join(os.path.dirname(__file__), '..', 'signatures', 'rules.dsl')
+
+
+def dsl_patterns() -> list:
+    """Ambil baris PATTERN dari rules.dsl (tanpa validasi)."""
+    patterns = []
+    with open(RULES, encoding='utf-8') as f:
+        for line in f:
+            match = re.match(r'\s*PATTERN:\s*"(.*)"\s*$', line)
+            if match:
+                patterns.append(match.group(1))
+    return patterns
+
+
+def synthetic_patterns(n: int, seed: int = 2) -> list:
+    """Signature sintetis berjumlah besar (ruleset ribuan signature)."""
+    rng = random.Random(seed)
+    stems = ["xp_cmdshell", "waitfor", "benchmark", "sleep", "load_file",
+             "outfile", "information_schema", "pg_sleep", "dbms_pipe"]
+    return [rf"{rng.choice(stems)}{i}\s*\(" for i in range(n)]
+
+
+def clean_corpus(n: int, seed: int = 11) -> list:
+    rng = random.Random(seed)
+    words = ["admin", "user", "page", "sort", "name", "search", "shoes",
+             "order", "category", "blue", "android", "home", "size"]
+    payloads = []
+    for _ in range(n):
+        params = [f"{rng.choice(words)}={rng.choice(words)}{rng.randint(0, 999)}"
+                  for _ in range(rng.randint(1, 6))]
+        payloads.append('&'.join(params))
+    return payloads
+
+
+def run_search(patterns, payloads):
+    """Loop check_sql_injection sebelum prefilter (re.search string)."""
+    hits = 0
+    for payload in payloads:
+        for pattern in patterns:
+            if re.search(pattern, payload, re.IGNORECASE):
+                hits += 1
+                break
+    return hits
+
+
+def run_plain(compiled, payloads):
+    hits = 0
+    for payload in payloads:
+        for regex in compiled:
+            if regex.search(payload):
+                hits += 1
+                break
+    return hits
+
+
+def run_prefiltered(prefilter, compiled, payloads):
+    hits = 0
+    for payload in payloads:
+        for i in prefilter.candidates(payload):
+            if compiled[i].search(payload):
+                hits += 1
+                break
+    return hits
+
+
+def check_soundness(compiled, prefilter, samples: int):
+    """Setiap pattern yang cocok harus termasuk kandidat prefilter."""
+    rng = random.Random(5)
+    alphabet = "aorndORAND '\"=1#-/*;UNIONSELECTdrop table\t"
+    for _ in range(samples):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        candidates = set(prefilter.candidates(text))
+        for i, regex in enumerate(compiled):
+            if regex.search(text):
+                assert i in candidates, (regex.pattern, text)
+
+
+def main():
+    payloads = clean_corpus(20000)
+    total = sum(len(p) for p in payloads)
+    print(f"Corpus bersih: {len(payloads)} payload, rata-rata {total / len(payloads):.0f} B")
+
+    base = [p for p, _, _ in DFASimulator.SQL_PATTERNS]
+    for label, patterns in [("SQL_PATTERNS", base),
+                            ("SQL_PATTERNS + rules.dsl", base + dsl_patterns()),
+                            ("+ 2000 signature sintetis",
+                             base + dsl_patterns() + synthetic_patterns(2000))]:
+        # min_patterns=0: paksa prefilter aktif agar bisa dibandingkan
+        prefilter = LiteralPrefilter(patterns, min_patterns=0)
+        compiled = [re.compile(p, re.IGNORECASE) for p in patterns]
+        # Ruleset besar: sampel lebih sedikit agar baseline tetap singkat
+        small = len(patterns) < 100
+        sample = payloads if small else payloads[:2000]
+        check_soundness(compiled, prefilter, 20000 if small else 500)
+
+        if small:
+            start = time.perf_counter()
+            run_search(patterns, sample)
+            t_search = time.perf_counter() - start
+
+        start = time.perf_counter()
+        run_plain(compiled, sample)
+        t_plain = time.perf_counter() - start
+
+        start = time.perf_counter()
+        run_prefiltered(prefilter, compiled, sample)
+        t_pre = time.perf_counter() - start
+
+        mode = "Aho-Corasick" if prefilter.use_automaton else "substring"
+        if not LiteralPrefilter(patterns).enabled:
+            mode += ", nonaktif secara default"
+        print(f"\n{label} ({len(patterns)} pattern, {mode}, soundness OK)")
+        if small:
+            print(f"  re.search (lama): {len(sample) / t_search:10.0f} payload/s")
+        print(f"  tanpa prefilter : {len(sample) / t_plain:10.0f} payload/s")
+        print(f"  dengan prefilter: {len(sample) / t_pre:10.0f} payload/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark urutan rule adaptif (mode first-match) dan mode all-matches
+=====================================================================
+Trafik sintetis dari corpus seeded (bench/corpus.py) dengan campuran
+family yang diberi bobot, dijalankan lewat Engine (tier 0 tetap aktif).
+Dicetak rata-rata rule yang dievaluasi per payload tier 1 dan waktu per
+payload untuk urutan deklarasi (default) vs urutan adaptif
+(Engine(adaptive_order=True), hanya payload sampel yang dicatat per
+regex), serta biaya mode all-matches (satu scan LazyDFA untuk semua rule).
+
+Verdict (detected) kedua urutan harus sama; tipe yang dilaporkan boleh
+berbeda bila beberapa rule match sekaligus.
+
+Jalankan: python bench/bench_rule_order.py [jumlah_payload]
+"""
+
+import os
+import random
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+from corpus import generate_corpus
+from engine import Engine
+
+# Bobot family per campuran trafik
+MIXES = {
+    'normal': {'form': 45, 'json': 30, 'near_miss': 20, 'boolean': 3, 'comment': 2},
+    'scanner': {'form': 20, 'json': 10, 'near_miss': 10, 'boolean': 20, 'comment': 40},
+}
+LENGTHS = (16, 64, 256, 1024)
+
+
+def traffic(corpus: list, weights: dict, n: int, seed: int = 5) -> list:
+    rng = random.Random(seed)
+    by_family = {}
+    for item in corpus:
+        by_family.setdefault(item['family'], []).append(item['payload'])
+    families = list(weights)
+    picks = rng.choices(families, weights=[weights[f] for f in families], k=n)
+    return [rng.choice(by_family[f]) for f in picks]
+
+
+def run(engine: Engine, payloads: list) -> tuple:
+    start = time.perf_counter()
+    results = engine.analyze_batch(payloads)
+    return (time.perf_counter() - start) / len(payloads), results
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    corpus = generate_corpus(7, per_bucket=60, lengths=LENGTHS)
+
+    print(f"{'campuran':<9} {'mode':<10} {'rule/payload':>12} {'µs/payload':>11}  urutan akhir")
+    for mix, weights in MIXES.items():
+        payloads = traffic(corpus, weights, n)
+        verdicts = None
+        for label, engine in (('deklarasi', Engine()), ('adaptif', Engine(adaptive_order=True)),
+                              ('all', Engine(all_matches=True, adaptive_order=True))):
+            elapsed, results = run(engine, payloads)
+            detected = [r['detected'] for r in results]
+            if verdicts is None:
+                verdicts = detected
+            assert detected == verdicts, f"verdict berbeda ({mix}, {label})"
+            if label == 'all':
+                rules = sum(len(r['matches']) for r in results) / len(results)
+                print(f"{mix:<9} {label:<10} {'-':>12} {elapsed * 1e6:11.1f}"
+                      f"  {rules:.2f} match/payload")
+                continue
+            stats = engine.simulator.rule_order.stats()
+            print(f"{mix:<9} {label:<10} {stats['avg_evaluated']:12.2f} {elapsed * 1e6:11.1f}"
+                  f"  {stats['order']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark cold-start ruleset: compile DSL vs artifact cache
+============================================================
+Setiap pengukuran memakai proses Python baru (seperti sensor CLI).
+Waktu load (sampai Ruleset siap) dan check pertama dilaporkan terpisah;
+payload probe memicu signature terakhir agar check pertama benar-benar
+menjalankan automaton, bukan hanya prefilter.
+
+Jalankan: python bench/bench_ruleset.py
+"""
+
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, {src!r})
+from ruleset import load_ruleset
+rules = load_ruleset({path!r}, cache_dir={cache!r}, use_cache={use_cache})
+loaded = time.perf_counter()
+result = rules.check({payload!r})
+assert result['signature'] == {expected!r}, result
+print(loaded - start, time.perf_counter() - loaded)
+"""
+
+STEMS = ["xp_cmdshell", "waitfor\\s+delay", "benchmark", "sleep", "load_file",
+         "into\\s+outfile", "information_schema", "pg_sleep", "dbms_pipe"]
+
+
+def synthetic_dsl(n: int, seed: int = 4) -> str:
+    rng = random.Random(seed)
+    blocks = []
+    for i in range(n):
+        blocks.append(
+            f"SIGNATURE sig_{i}\n"
+            f"    PATTERN: \"{rng.choice(STEMS)}{i}\\s*\\(['\\\"]?\\d+\"\n"
+            f"    SEVERITY: {rng.choice(['CRITICAL', 'HIGH', 'MEDIUM', 'LOW'])}\n"
+            f"    RESPONSE: {rng.choice(['BLOCK', 'ALERT'])}\n"
+            f"    MESSAGE: \"Synthetic signature {i}\"\n"
+        )
+    return '\n'.join(blocks)
+
+
+def synthetic_payload(n: int, seed: int = 4) -> str:
+    """Payload yang match signature terakhir synthetic_dsl(n, seed)."""
+    rng = random.Random(seed)
+    for _ in range(n):
+        stem = rng.choice(STEMS)
+        rng.choice(['CRITICAL', 'HIGH', 'MEDIUM', 'LOW'])
+        rng.choice(['BLOCK', 'ALERT'])
+    literal = stem.replace('\\s+', ' ')
+    return f"id=1&q={literal}{n - 1}('5"
+
+
+def probe(path: str, cache: str, use_cache: bool, n: int) -> tuple:
+    """(load s, check pertama s, wall proses s) dari proses baru."""
+    code = PROBE.format(src=SRC, path=path, cache=cache, use_cache=use_cache,
+                        payload=synthetic_payload(n), expected=f"sig_{n - 1}")
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                         text=True, check=True).stdout
+    load, first = map(float, out.split())
+    return load, first, time.perf_counter() - start
+
+
+def main():
+    print(f"{'':>10} {'---------- compile ----------':>30} {'----------- cache -----------':>30}")
+    print(f"{'signature':>10} {'load ms':>9} {'check ms':>9} {'proses ms':>10}"
+          f" {'load ms':>9} {'check ms':>9} {'proses ms':>10}")
+    for n in [7, 1000, 5000]:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'rules.dsl')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(synthetic_dsl(n))
+            cache = os.path.join(tmp, 'cache')
+
+            cold = probe(path, cache, False, n)
+            probe(path, cache, True, n)  # isi cache
+            warm = probe(path, cache, True, n)
+            print(f"{n:>10}" + ''.join(f" {load * 1e3:9.1f} {first * 1e3:9.1f} {wall * 1e3:10.1f}"
+                                       for load, first, wall in (cold, warm)))
+
+
+if __name__ == "__main__":
+    main()
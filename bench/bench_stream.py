@@ -0,0 +1,65 @@
+"""
+Benchmark mode --stream: throughput dan memori konstan
+======================================================
+Membuat access log sintetis (combined + JSON lines) lalu memindainya
+dengan ukuran berbeda; RSS maksimum harus tetap datar.
+
+Jalankan: python bench/bench_stream.py
+"""
+
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+PROBE = """
+import os, resource, sys
+sys.path.insert(0, {src!r})
+from engine import Engine
+from logstream import run_stream
+devnull = open(os.devnull, 'w')
+run_stream({path!r}, Engine(), out=devnull, err=devnull)
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def write_log(path: str, n: int, seed: int = 8):
+    rng = random.Random(seed)
+    words = ["admin", "page", "sort", "name", "search", "blue"]
+    attacks = ["id=1%27%20OR%20%271%27%3D%271", "name=admin%27--", "q=user%27%23"]
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(n):
+            if rng.random() < 0.02:
+                query = rng.choice(attacks)
+            else:
+                query = '&'.join(f"{rng.choice(words)}={rng.choice(words)}{rng.randint(0, 99)}"
+                                 for _ in range(rng.randint(1, 3)))
+            if i % 4 == 0:
+                f.write(f'{{"remote_addr": "10.0.0.{i % 250}", "request": "GET /p?{query} HTTP/1.1", '
+                        f'"status": 200}}\n')
+            else:
+                f.write(f'10.0.0.{i % 250} - - [10/Oct/2026:13:55:36 +0000] '
+                        f'"GET /p?{query} HTTP/1.1" 200 {rng.randint(0, 9999)} "-" "bench"\n')
+
+
+def main():
+    print(f"{'baris':>10} {'MB':>7} {'baris/s':>10} {'max RSS (MB)':>13}")
+    for n in [10_000, 100_000, 400_000]:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'access.log')
+            write_log(path, n)
+            size = os.path.getsize(path) / 1e6
+            code = PROBE.format(src=SRC, path=path)
+            start = time.perf_counter()
+            rss = int(subprocess.run([sys.executable, '-c', code], capture_output=True,
+                                     text=True, check=True).stdout)
+            elapsed = time.perf_counter() - start
+            print(f"{n:>10} {size:7.1f} {n / elapsed:10.0f} {rss / 1024:13.1f}")
+
+
+if __name__ == "__main__":
+    main()
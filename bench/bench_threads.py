@@ -0,0 +1,82 @@
+"""
+Benchmark skala thread: analyze_batch dengan 1, 2, 4, 8 thread
+==============================================================
+Batch dari corpus seeded (campuran mirip trafik normal, bench/corpus.py)
+dianalisis dengan analyze_batch_parallel(executor='thread'): setiap
+potongan memakai Engine.worker() di atas tabel bersama. Sebagai
+pembanding dicetak satu thread tanpa pool dan process pool dengan
+jumlah worker yang sama. Verdict semua run harus identik.
+
+Dengan GIL, thread tidak menambah throughput (hanya overhead pool);
+skala baru terlihat di CPython free-threaded (python3.13t) dan bila
+CPU tersedia ≥ jumlah thread.
+
+Jalankan: python bench/bench_threads.py [jumlah_baris]
+"""
+
+import os
+import random
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+from corpus import generate_corpus
+from engine import Engine
+from parallel import analyze_batch_parallel
+from ruleset import load_ruleset
+
+RULES = os.path.join(BENCH_DIR, '..', 'signatures', 'rules.dsl')
+WEIGHTS = {'form': 45, 'json': 30, 'near_miss': 20, 'boolean': 3, 'comment': 2}
+THREADS = (1, 2, 4, 8)
+
+
+def batch(n: int, seed: int = 5) -> list:
+    corpus = generate_corpus(seed, per_bucket=60, lengths=(16, 64, 256, 1024))
+    rng = random.Random(seed)
+    by_family = {}
+    for item in corpus:
+        by_family.setdefault(item['family'], []).append(item['payload'])
+    families = list(WEIGHTS)
+    picks = rng.choices(families, weights=[WEIGHTS[f] for f in families], k=n)
+    return [rng.choice(by_family[f]) for f in picks]
+
+
+def timed(fn, repeat: int = 3) -> tuple:
+    best, out = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    payloads = batch(n)
+    ruleset = load_ruleset(RULES)
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count()
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'aktif' if gil else 'nonaktif'}, "
+          f"CPU tersedia: {cpus}, {n:,} baris\n")
+
+    elapsed, baseline = timed(lambda: Engine(ruleset=ruleset).analyze_batch(payloads))
+    expected = [r['detected'] for r in baseline]
+    print(f"{'mode':<10} {'n':>3} {'baris/s':>10} {'speedup':>8}")
+    print(f"{'serial':<10} {1:>3} {n / elapsed:10,.0f} {1.0:8.2f}")
+    t_serial = elapsed
+
+    for executor in ('thread', 'process'):
+        for workers in THREADS:
+            if workers == 1 and executor == 'process':
+                continue
+            engine = Engine(ruleset=ruleset)
+            elapsed, results = timed(lambda: analyze_batch_parallel(
+                payloads, workers, engine, RULES, executor=executor))
+            assert [r['detected'] for r in results] == expected, "verdict berbeda"
+            print(f"{executor:<10} {workers:>3} {n / elapsed:10,.0f} {t_serial / elapsed:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
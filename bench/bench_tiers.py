@@ -0,0 +1,70 @@
+"""
+Benchmark analyze() bertingkat
+==============================
+Sebelumnya analyze() selalu menjalankan Lexer + Parser lalu DFA check.
+Sekarang: tier 0 (cek karakter pemicu) → tier 1 (DFA) → tier 2
+(Lexer/Parser hanya untuk payload terdeteksi).
+
+Jalankan: python bench/bench_tiers.py [jumlah_payload]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bench_engine import make_batch
+from engine import Engine
+from lexer import Lexer
+from parser import Parser
+from ruleset import load_ruleset
+
+
+def untiered_analyze(engine: Engine, payload: str) -> dict:
+    """analyze() sebelum tier: Lexer + Parser selalu, lalu DFA check."""
+    Parser(Lexer(payload).tokenize()).parse()
+    result = {'payload': payload, 'detected': False, 'type': None, 'action': 'ALLOW'}
+    dfa_result = engine.simulator.check_sql_injection(payload)
+    if dfa_result['detected']:
+        result.update(detected=True, type=dfa_result['type'], action='BLOCK')
+    return result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    corpora = {
+        'query string (nama=nilai)': make_batch(n),
+        'nilai parameter saja': [p.split('=', 1)[-1] for p in make_batch(n)],
+    }
+
+    for label, batch in corpora.items():
+        print(f"[{label}] {n} payload")
+        engine = Engine()
+        start = time.perf_counter()
+        expected = [untiered_analyze(engine, p) for p in batch]
+        t_old = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = [engine.analyze(p) for p in batch]
+        t_new = time.perf_counter() - start
+        assert [(r['type'], r['action']) for r in results] == \
+               [(r['type'], r['action']) for r in expected]
+
+        st = engine.tier_stats()
+        print(f"  analyze() tanpa tier : {t_old:6.2f} s ({n / t_old:10,.0f} payload/s)")
+        print(f"  analyze() bertingkat : {t_new:6.2f} s ({n / t_new:10,.0f} payload/s)"
+              f"  {t_old / t_new:.1f}x")
+        print(f"  tier0 {st['tier0']} → tier1 {st['tier1']} ({st['escalation_tier1']:.1%})"
+              f" → tier2 {st['tier2']} ({st['escalation_tier2']:.1%})")
+
+        ruled = Engine(ruleset=load_ruleset())
+        for p in batch:
+            ruled.analyze(p)
+        st = ruled.tier_stats()
+        print(f"  + rules.dsl: tier0 → tier1 {st['escalation_tier1']:.1%}, "
+              f"tier1 → tier2 {st['escalation_tier2']:.1%}\n")
+
+
+if __name__ == "__main__":
+    main()
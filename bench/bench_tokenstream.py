@@ -0,0 +1,74 @@
+"""
+Benchmark TokenStream vs List[Token]
+====================================
+tokenize() dulu menghasilkan satu dataclass Token per token (enum,
+salinan substring, posisi). TokenStream menyimpan tipe di array('B') dan
+offset di array('I'); nilai di-slice dari source hanya saat dibutuhkan.
+
+Jalankan: python bench/bench_tokenstream.py
+"""
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bench_lexer import make_payload, timeit
+from lexer import Lexer, Token, TokenType
+
+
+def list_tokenize(text: str):
+    """Representasi lama: master pattern + satu Token per token."""
+    match_at = Lexer.MASTER_PATTERN.match
+    group_types = Lexer.GROUP_TYPES
+    whitespace = TokenType.WHITESPACE
+    tokens = []
+    pos = 0
+    length = len(text)
+    while pos < length:
+        match = match_at(text, pos)
+        if match:
+            end = match.end()
+            token_type = group_types[match.lastgroup]
+            if token_type is not whitespace:
+                tokens.append(Token(token_type, text[pos:end], pos))
+            pos = end
+        else:
+            tokens.append(Token(TokenType.UNKNOWN, text[pos], pos))
+            pos += 1
+    tokens.append(Token(TokenType.EOF, '', pos))
+    return tokens
+
+
+def retained_bytes(fn, text: str) -> int:
+    """Memori yang masih dipegang hasil fn(text) (tanpa source)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = fn(text)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def main():
+    text = make_payload(20_000)
+    assert list(Lexer(text).tokenize()) == list_tokenize(text)
+    print("Equivalence: token identik\n")
+
+    print(f"{'size':>10} {'token':>8} {'list ms':>9} {'stream ms':>10} {'speedup':>8}"
+          f" {'list B/tok':>11} {'stream B/tok':>13}")
+    for size in [1_000, 10_000, 100_000, 1_000_000]:
+        text = make_payload(size)
+        n_tokens = len(Lexer(text).tokenize())
+        t_list = timeit(list_tokenize, text)
+        t_stream = timeit(lambda t: Lexer(t).tokenize(), text)
+        m_list = retained_bytes(list_tokenize, text)
+        m_stream = retained_bytes(lambda t: Lexer(t).tokenize(), text)
+        print(f"{size:>10} {n_tokens:>8} {t_list * 1e3:9.2f} {t_stream * 1e3:10.2f}"
+              f" {t_list / t_stream:7.1f}x {m_list / n_tokens:11.1f} {m_stream / n_tokens:13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark mode trace simulate_dfa
+=================================
+Payload 1 MB (teks form dengan quote, '#' dan '--' tersebar) dijalankan
+lewat simulate_dfa untuk setiap mode trace. Dicetak waktu per payload,
+puncak memori selama simulasi (tracemalloc, diukur terpisah dari waktu)
+dan jumlah entri trace. Baris run() = CompiledDFA.run() tanpa
+simulate_dfa sebagai batas bawah mode off.
+
+Ekuivalensi: rle yang di-expand identik dengan full, ring = K
+perubahan state terakhir dari full, pada payload acak.
+
+Jalankan: python bench/bench_trace.py [ukuran_byte]
+"""
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from automata import DFASimulator
+from dfa_trace import expand_rle
+
+MODES = ['off', 'full', 'rle', 'ring:32', 'sampled:100']
+
+
+def make_payload(size: int, seed: int = 4) -> str:
+    rng = random.Random(seed)
+    words = ["user", "name", "id", "sort", "page", "q", "admin", "lang"]
+    parts = []
+    total = 0
+    while total < size:
+        part = f"{rng.choice(words)}={rng.randint(0, 9999)}&"
+        if rng.random() < 0.02:
+            part = rng.choice(["o'reilly&", "tag=#sale&", "a--b&", "x'#&"])
+        parts.append(part)
+        total += len(part)
+    return ''.join(parts)[:size]
+
+
+def check_equivalence(sim: DFASimulator):
+    rng = random.Random(8)
+    for _ in range(2000):
+        payload = ''.join(rng.choice("ab'#-OR =1") for _ in range(rng.randint(0, 40)))
+        for kind in ('boolean', 'comment'):
+            full = sim.simulate_dfa(payload, kind, 'full')['trace']
+            assert expand_rle(sim.simulate_dfa(payload, kind, 'rle')['trace']) == full
+            changes = [(i, payload[i - 1], full[i - 1], full[i])
+                       for i in range(1, len(full)) if full[i] != full[i - 1]]
+            assert sim.simulate_dfa(payload, kind, 'ring:4')['trace'] == changes[-4:]
+    print("Equivalence: 2000 payload acak, rle/ring konsisten dengan full\n")
+
+
+def peak_bytes(fn) -> int:
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1 << 20
+    sim = DFASimulator()
+    check_equivalence(sim)
+    payload = make_payload(size)
+    compiled = sim.compiled_dfas['comment']
+
+    print(f"payload {size:,} byte, comment DFA (sampled: rata-rata 100 payload)")
+    print(f"{'mode':<12} {'ms/payload':>10} {'puncak memori':>14} {'entri trace':>12}")
+    start = time.perf_counter()
+    compiled.run(payload)
+    elapsed = time.perf_counter() - start
+    print(f"{'run()':<12} {elapsed * 1e3:10.1f} {peak_bytes(lambda: compiled.run(payload)):14,} {'-':>12}")
+
+    for mode in MODES:
+        repeat = 100 if mode.startswith('sampled') else 1
+        tracer_sim = DFASimulator(trace=mode)
+
+        def simulate():
+            for _ in range(repeat):
+                result = tracer_sim.simulate_dfa(payload, 'comment')
+            return result
+
+        start = time.perf_counter()
+        simulate()
+        elapsed = (time.perf_counter() - start) / repeat
+        peak = peak_bytes(simulate)
+        result = sim.simulate_dfa(payload, 'comment', mode)
+        entries = len(result['trace']) if result['trace'] is not None else 0
+        print(f"{mode:<12} {elapsed * 1e3:10.1f} {peak:14,} {entries:12,}")
+
+
+if __name__ == "__main__":
+    main()
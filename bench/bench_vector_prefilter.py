@@ -0,0 +1,99 @@
+"""
+Benchmark prefilter batch: NumPy vs loop Python
+===============================================
+Batch offline dari corpus seeded (bench/corpus.py), campuran family
+mirip trafik normal. Dicetak baris/detik dan bagian baris yang lolos
+ke DFA untuk:
+
+    tier0        loop Python Engine._tier0_clean (karakter pertama)
+    python       VectorPrefilter backend Python (substring per payload)
+    numpy        VectorPrefilter backend NumPy (matriks ber-padding)
+
+lalu analyze_batch penuh tanpa / dengan vectorize per ukuran blok.
+Verdict harus identik.
+
+Jalankan: python bench/bench_vector_prefilter.py [jumlah_baris]
+"""
+
+import os
+import random
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+from automata import DFASimulator
+from corpus import generate_corpus
+from engine import Engine
+from vector_prefilter import HAS_NUMPY, VectorPrefilter
+
+WEIGHTS = {'form': 45, 'json': 30, 'near_miss': 20, 'boolean': 3, 'comment': 2}
+LENGTHS = (16, 64, 256, 1024)
+BLOCKS = (256, 4096, 65536)
+
+
+def batch(n: int, seed: int = 9) -> list:
+    corpus = generate_corpus(seed, per_bucket=60, lengths=LENGTHS)
+    rng = random.Random(seed)
+    by_family = {}
+    for item in corpus:
+        by_family.setdefault(item['family'], []).append(item['payload'])
+    families = list(WEIGHTS)
+    picks = rng.choices(families, weights=[WEIGHTS[f] for f in families], k=n)
+    return [rng.choice(by_family[f]) for f in picks]
+
+
+def timed(fn, repeat: int = 3) -> tuple:
+    best, out = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    payloads = batch(n)
+    engine = Engine()
+    patterns = [p for p, _, _ in DFASimulator.SQL_PATTERNS]
+
+    def tier0():
+        rows, clean = engine.trigger_rows, engine._tier0_clean
+        return [rows is not None and p.isascii() and clean(p) for p in payloads]
+
+    runs = [('tier0', tier0),
+            ('python', lambda: VectorPrefilter(patterns, backend='python').clean(payloads))]
+    if HAS_NUMPY:
+        runs.append(('numpy', lambda: VectorPrefilter(patterns, backend='numpy').clean(payloads)))
+    else:
+        print("NumPy tidak terpasang: baris numpy dilewati\n")
+
+    print(f"{n:,} baris, rata-rata {sum(map(len, payloads)) / n:.0f} byte\n")
+    print(f"{'prefilter':<10} {'baris/s':>12} {'lolos ke DFA':>13}")
+    for label, fn in runs:
+        elapsed, clean = timed(fn)
+        print(f"{label:<10} {n / elapsed:12,.0f} {1 - sum(clean) / n:13.1%}")
+
+    print(f"\n{'analyze_batch':<22} {'baris/s':>12}")
+    elapsed, baseline = timed(lambda: Engine().analyze_batch(payloads))
+    print(f"{'tanpa vectorize':<22} {n / elapsed:12,.0f}")
+    expected = [r['detected'] for r in baseline]
+    for size in BLOCKS:
+        vectorized = Engine(vectorize=True)
+
+        def run():
+            out = []
+            for i in range(0, n, size):
+                out.extend(vectorized.analyze_batch(payloads[i:i + size]))
+            return out
+
+        elapsed, results = timed(run)
+        assert [r['detected'] for r in results] == expected, "verdict berbeda"
+        label = f"vectorize blok {size}"
+        print(f"{label:<22} {n / elapsed:12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
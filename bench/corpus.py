@@ -0,0 +1,107 @@
+"""
+Generator corpus payload sintetis (seeded)
+==========================================
+Corpus untuk benchmark suite: setiap payload punya family dan target
+panjang, dan corpus yang sama selalu dihasilkan untuk seed yang sama.
+
+Family:
+    form       form post bersih (a=b&c=d)
+    json       body JSON bersih
+    boolean    Boolean-based SQLi (' OR '1'='1, OR 1=1, ...)
+    comment    Comment-based SQLi (admin'--, user'#)
+    near_miss  input bersih yang mirip serangan (o'reilly, #tag,
+               "or" di teks biasa, 1=1 tanpa konteks SQL)
+
+Jalankan: python bench/corpus.py [seed] untuk melihat contoh.
+"""
+
+import json
+import random
+import sys
+from typing import Dict, List
+
+FAMILIES = ('form', 'json', 'boolean', 'comment', 'near_miss')
+LENGTHS = (16, 64, 256, 1024, 4096)
+
+WORDS = ["admin", "user", "page", "sort", "name", "search", "order", "blue",
+         "shoes", "category", "price", "limit", "offset", "token", "lang", "id"]
+
+BOOLEAN_ATTACKS = ["' OR '1'='1", "' OR 1=1", "' AND '1'='1", "1' or '1'='1",
+                   "x' OR 'a'='a", "' oR 1 = 1", "'OR'1'='1'"]
+COMMENT_ATTACKS = ["admin'--", "user'#", "x'-- -", "' --", "1'#comment"]
+NEAR_MISSES = ["o'reilly", "rock 'n' roll", "#hashtag", "black or white",
+               "tom and jerry", "1=1 math", "a--b", "c#", "it's-fine",
+               "x = 1", "'quoted'", "order=asc"]
+
+
+def _word(rng: random.Random) -> str:
+    return rng.choice(WORDS)
+
+
+def _form(rng: random.Random, length: int) -> str:
+    parts = []
+    size = 0
+    while size < length:
+        part = f"{_word(rng)}={_word(rng)}{rng.randint(0, 999)}"
+        parts.append(part)
+        size += len(part) + 1
+    return '&'.join(parts)[:length]
+
+
+def _json(rng: random.Random, length: int) -> str:
+    body = {}
+    while len(json.dumps(body)) < length:
+        body[f"{_word(rng)}{len(body)}"] = rng.choice(
+            [_word(rng), rng.randint(0, 10 ** 6), [_word(rng), _word(rng)], True])
+    return json.dumps(body)
+
+
+def _embed(rng: random.Random, length: int, fragment: str) -> str:
+    """Sisipkan fragmen di posisi acak dalam form post sepanjang length."""
+    filler = _form(rng, max(0, length - len(fragment) - len(_word(rng)) - 2))
+    # Sisipkan sebagai nilai parameter baru di batas '&'
+    cuts = [0] + [i + 1 for i, c in enumerate(filler) if c == '&']
+    cut = rng.choice(cuts)
+    param = f"{_word(rng)}={fragment}"
+    if cut == 0:
+        return param + ('&' + filler if filler else '')
+    return filler[:cut] + param + '&' + filler[cut:]
+
+
+GENERATORS = {
+    'form': _form,
+    'json': _json,
+    'boolean': lambda rng, n: _embed(rng, n, rng.choice(BOOLEAN_ATTACKS)),
+    'comment': lambda rng, n: _embed(rng, n, rng.choice(COMMENT_ATTACKS)),
+    'near_miss': lambda rng, n: _embed(rng, n, rng.choice(NEAR_MISSES)),
+}
+
+
+def generate_corpus(seed: int = 1, per_bucket: int = 50,
+                    lengths=LENGTHS, families=FAMILIES) -> List[Dict]:
+    """
+    Corpus deterministik: per_bucket payload untuk setiap (family, length).
+
+    Returns:
+        list of dict dengan family, length, payload
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for family in families:
+        generate = GENERATORS[family]
+        for length in lengths:
+            for _ in range(per_bucket):
+                corpus.append({'family': family, 'length': length,
+                               'payload': generate(rng, length)})
+    return corpus
+
+
+def main():
+    seed = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    corpus = generate_corpus(seed, per_bucket=2, lengths=(64,))
+    for item in corpus:
+        print(f"{item['family']:<10} {item['payload']!r}")
+
+
+if __name__ == "__main__":
+    main()
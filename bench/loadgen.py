@@ -0,0 +1,138 @@
+"""
+Load generator untuk HTTP inspection service
+============================================
+Klien asyncio dengan koneksi keep-alive (opsional pipelining) yang
+mengukur latency p50/p99 dan throughput POST /analyze.
+
+Jalankan:
+    python bench/loadgen.py --spawn                 # jalankan server sendiri
+    python bench/loadgen.py --addr 127.0.0.1:8080   # server yang sudah jalan
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+PAYLOADS = ["username=admin&password=123", "page=2&sort=asc", "q=blue+shoes",
+            "id=1' OR '1'='1", "admin'--", "name=o'reilly", "search=order+by+date"]
+
+
+def percentile(sorted_values, p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def build_request(host: str, batch: int, rng: random.Random) -> bytes:
+    if batch == 1:
+        body = json.dumps({'payload': rng.choice(PAYLOADS)})
+    else:
+        body = json.dumps({'payloads': [rng.choice(PAYLOADS) for _ in range(batch)]})
+    body = body.encode('utf-8')
+    return (f"POST /analyze HTTP/1.1\r\nHost: {host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+            ).encode('latin-1') + body
+
+
+async def read_response(reader) -> int:
+    head = await reader.readuntil(b'\r\n\r\n')
+    status = int(head.split(b' ', 2)[1])
+    length = 0
+    for line in head.split(b'\r\n'):
+        if line.lower().startswith(b'content-length:'):
+            length = int(line.split(b':', 1)[1])
+    await reader.readexactly(length)
+    return status
+
+
+async def client(host: str, port: int, n_requests: int, pipeline: int, batch: int,
+                 latencies: list, seed: int):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    sent = 0
+    while sent < n_requests:
+        depth = min(pipeline, n_requests - sent)
+        requests = [build_request(host, batch, rng) for _ in range(depth)]
+        start = time.perf_counter()
+        writer.write(b''.join(requests))
+        await writer.drain()
+        for _ in range(depth):
+            status = await read_response(reader)
+            if status != 200:
+                raise RuntimeError(f"status {status}")
+            latencies.append(time.perf_counter() - start)
+        sent += depth
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run_load(host: str, port: int, connections: int, requests: int,
+                   pipeline: int, batch: int) -> dict:
+    latencies = []
+    per_client = max(1, requests // connections)
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        client(host, port, per_client, pipeline, batch, latencies, seed)
+        for seed in range(connections)
+    ])
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'rps': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 50) * 1e3,
+        'p99_ms': percentile(latencies, 99) * 1e3,
+        'max_ms': latencies[-1] * 1e3 if latencies else 0.0,
+    }
+
+
+def spawn_server(port: int, executor: str, workers: int) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(SRC, 'main.py'), '--serve', f'127.0.0.1:{port}',
+         '--executor', executor, '--workers', str(workers)],
+        stderr=subprocess.PIPE, text=True,
+    )
+    proc.stderr.readline()  # tunggu baris "[serve] ... mendengarkan"
+    return proc
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Load generator Mini-IDS')
+    ap.add_argument('--addr', default='127.0.0.1:8765')
+    ap.add_argument('--spawn', action='store_true', help='Jalankan server sendiri')
+    ap.add_argument('--executor', default='thread', choices=['thread', 'process'])
+    ap.add_argument('--workers', type=int, default=2)
+    ap.add_argument('--connections', type=int, nargs='+', default=[1, 8, 32])
+    ap.add_argument('--requests', type=int, default=4000)
+    ap.add_argument('--pipeline', type=int, default=1)
+    ap.add_argument('--batch', type=int, default=1)
+    args = ap.parse_args()
+
+    host, _, port = args.addr.rpartition(':')
+    port = int(port)
+    proc = spawn_server(port, args.executor, args.workers) if args.spawn else None
+    try:
+        print(f"POST /analyze, batch={args.batch}, pipeline={args.pipeline}, "
+              f"executor={args.executor}")
+        print(f"{'koneksi':>8} {'request':>8} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        for connections in args.connections:
+            r = asyncio.run(run_load(host, port, connections, args.requests,
+                                     args.pipeline, args.batch))
+            print(f"{connections:>8} {r['requests']:>8} {r['rps']:8.0f} {r['p50_ms']:8.2f} "
+                  f"{r['p99_ms']:8.2f} {r['max_ms']:8.2f}")
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
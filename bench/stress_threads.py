@@ -0,0 +1,163 @@
+"""
+Stress test pemakaian bersamaan dari banyak thread
+==================================================
+Setiap thread menjalankan payload corpus (seeded) dalam urutan acak
+sendiri terhadap objek BERSAMA lalu membandingkan setiap hasil dengan
+referensi sekuensial:
+
+    dfa       DFA.start() + step() atas boolean_dfa / comment_dfa
+    lazy      LazyDFA.scan() dengan cache kecil (flush terus-menerus)
+    engine    Engine bersama (ruleset + VerdictCache kecil + all_matches)
+    workers   analyze_batch_parallel(executor='thread') + jumlah tier
+
+switchinterval diperkecil agar thread sering berganti di tengah scan
+walau dengan GIL; di build free-threaded (3.13t) thread benar-benar
+berjalan bersamaan. Exit code 1 bila ada satu saja hasil yang berbeda.
+
+Jalankan: python bench/stress_threads.py [thread] [putaran]
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+from automata import DFASimulator
+from corpus import generate_corpus
+from engine import Engine
+from lazy_dfa import LazyDFA
+from parallel import analyze_batch_parallel
+from ruleset import load_ruleset
+
+RULES = os.path.join(BENCH_DIR, '..', 'signatures', 'rules.dsl')
+
+
+def payloads() -> list:
+    corpus = generate_corpus(seed=11, per_bucket=12, lengths=(16, 64, 256))
+    extra = ["1' OR '1'='1", "admin'--", "x' AND 1=1 #", "1 UNION SELECT a, b FROM users",
+             "men's jacket", "o'reilly", "id=1%27%20OR%201=1", "'K'"]
+    return [item['payload'] for item in corpus] + extra
+
+
+def dfa_trace(dfa, payload: str) -> list:
+    run = dfa.start()
+    trace = [run.current_state]
+    for char in payload:
+        run.step(char)
+        trace.append(run.current_state)
+    return trace
+
+
+def verdict(result: dict) -> tuple:
+    return (result['detected'], result['type'], result['action'],
+            tuple((m['type'], m['span']) for m in result['matches']))
+
+
+def main():
+    n_threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'aktif' if gil else 'nonaktif'}, "
+          f"{n_threads} thread × {rounds} putaran")
+
+    items = payloads()
+    ruleset = load_ruleset(RULES)
+    sim = DFASimulator()
+    lazy = LazyDFA([p for p, _, _ in DFASimulator.SQL_PATTERNS] +
+                   [sig.pattern for sig in ruleset.signatures], max_cache=64)
+    engine = Engine(ruleset=ruleset, cache_size=64, all_matches=True)
+
+    # Referensi sekuensial dengan objek baru (tanpa state bersama)
+    ref_lazy = LazyDFA(lazy.patterns)
+    expected = {
+        'dfa': {p: (sim.simulate_dfa(p, 'boolean', 'full')['trace'],
+                    sim.simulate_dfa(p, 'comment', 'full')['trace'])
+                for p in items},
+        'lazy': {p: ref_lazy.scan(p) for p in items},
+        'engine': {p: verdict(r) for p, r in
+                   zip(items, Engine(ruleset=ruleset, all_matches=True).analyze_batch(items))},
+    }
+    serial = Engine(ruleset=ruleset, all_matches=True)
+    serial.analyze_batch(items)
+
+    failures = []
+    counts = dict.fromkeys(['dfa', 'lazy', 'engine', 'workers'], 0)
+    lock = threading.Lock()
+    barrier = threading.Barrier(n_threads)
+
+    def fail(kind: str, payload: str, got, want):
+        with lock:
+            failures.append((kind, payload, got, want))
+
+    def hammer(seed: int):
+        rng = random.Random(seed)
+        barrier.wait()
+        for _ in range(rounds):
+            order = items[:]
+            rng.shuffle(order)
+            for p in order:
+                got = (dfa_trace(sim.boolean_dfa, p), dfa_trace(sim.comment_dfa, p))
+                if got != expected['dfa'][p]:
+                    fail('dfa', p, got, expected['dfa'][p])
+                got = lazy.scan(p)
+                if got != expected['lazy'][p]:
+                    fail('lazy', p, got, expected['lazy'][p])
+            for p, r in zip(order, engine.analyze_batch(order)):
+                if verdict(r) != expected['engine'][p]:
+                    fail('engine', p, verdict(r), expected['engine'][p])
+            with lock:
+                counts['dfa'] += len(order)
+                counts['lazy'] += len(order)
+                counts['engine'] += len(order)
+
+    def pooled(seed: int):
+        # Thread pool di dalam thread: worker engine dari engine bersama
+        rng = random.Random(seed)
+        barrier.wait()
+        for _ in range(rounds):
+            order = items[:]
+            rng.shuffle(order)
+            owner = Engine(ruleset=ruleset, all_matches=True)
+            results = analyze_batch_parallel(order, 4, owner, executor='thread')
+            for p, r in zip(order, results):
+                if verdict(r) != expected['engine'][p]:
+                    fail('workers', p, verdict(r), expected['engine'][p])
+            if owner.tier_counts != serial.tier_counts:
+                fail('workers', '<tier_counts>', owner.tier_counts, serial.tier_counts)
+            with lock:
+                counts['workers'] += len(order)
+
+    previous = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    threads = [threading.Thread(target=pooled if i % 4 == 3 else hammer, args=(i,))
+               for i in range(n_threads)]
+    start = time.perf_counter()
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(previous)
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(items)} payload, {elapsed:.1f} s")
+    for kind, count in counts.items():
+        bad = sum(1 for f in failures if f[0] == kind)
+        print(f"  {kind:<8} {count:7,} pemeriksaan, {bad} berbeda")
+    print(f"  LazyDFA bersama: {lazy.stats['flushes']} flush, "
+          f"{lazy.stats['nfa_fallbacks']} fallback NFA")
+    print(f"  VerdictCache bersama: {engine.cache.stats()['evictions']:,} eviction")
+    if failures:
+        for kind, p, got, want in failures[:5]:
+            print(f"❌ {kind}: {p!r}\n   dapat {got}\n   harus {want}")
+        sys.exit(1)
+    print("✅ semua hasil identik dengan referensi sekuensial")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Benchmark suite Mini-IDS dengan baseline dan ambang regresi
+===========================================================
+Mengukur setiap tahap secara terpisah pada corpus seeded (bench/corpus.py):
+
+    lexer     Lexer(payload).tokenize()
+    parser    Parser(tokens).parse()           (token sudah tersedia)
+    dfa       DFASimulator.check_sql_injection(payload)
+    analyze   Engine.analyze(payload)          (end-to-end, tanpa cache)
+
+Hasil (ns per payload per family/panjang) ditulis sebagai JSON lalu
+dibandingkan dengan baseline. Baseline bersifat per mesin; dengan
+--normalize waktu diskalakan dengan loop kalibrasi Python murni untuk
+membandingkan baseline dari mesin lain (lebih bising). Exit code 1 bila
+total suatu tahap melewati ambang; bucket family/panjang individual
+lebih bising dan hanya dilaporkan sebagai peringatan (kecuali --strict).
+
+Jalankan:
+    python bench/suite.py                      # ukur + bandingkan baseline
+    python bench/suite.py --update-baseline    # simpan hasil sebagai baseline
+    python bench/suite.py --quick              # corpus kecil
+    python bench/suite.py --strict             # bucket juga jadi regresi
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+from collections import defaultdict
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+from corpus import generate_corpus
+from automata import DFASimulator
+from engine import Engine
+from lexer import Lexer
+from parser import Parser
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, 'results.json')
+STAGES = ('lexer', 'parser', 'dfa', 'analyze')
+
+
+def calibrate(repeat: int = 5) -> float:
+    """ns untuk loop referensi Python murni (satuan normalisasi)."""
+    def work():
+        total = 0
+        for i in range(200_000):
+            total += i & 7
+        return total
+
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        work()
+        best = min(best, time.perf_counter_ns() - start)
+    return float(best)
+
+
+def time_per_item(fn, items, repeat: int) -> float:
+    """ns per item, terbaik dari repeat putaran (GC dimatikan saat mengukur)."""
+    best = float('inf')
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter_ns()
+            for item in items:
+                fn(item)
+            best = min(best, time.perf_counter_ns() - start)
+    finally:
+        gc.enable()
+    return best / len(items)
+
+
+def run_suite(seed: int = 1, per_bucket: int = 50, repeat: int = 5) -> dict:
+    corpus = generate_corpus(seed, per_bucket)
+    buckets = defaultdict(list)
+    for item in corpus:
+        buckets[f"{item['family']}/{item['length']}"].append(item['payload'])
+
+    simulator = DFASimulator()
+    engine = Engine()
+    stages = {stage: {} for stage in STAGES}
+    detection = defaultdict(lambda: [0, 0])
+    # Kalibrasi diselingi dengan pengukuran: kondisi CPU sama dengan tahap
+    calibration = calibrate()
+
+    for key, payloads in buckets.items():
+        calibration = min(calibration, calibrate(1))
+        streams = [Lexer(p).tokenize() for p in payloads]
+        stages['lexer'][key] = time_per_item(lambda p: Lexer(p).tokenize(), payloads, repeat)
+        stages['parser'][key] = time_per_item(lambda t: Parser(t).parse(), streams, repeat)
+        stages['dfa'][key] = time_per_item(simulator.check_sql_injection, payloads, repeat)
+        stages['analyze'][key] = time_per_item(engine.analyze, payloads, repeat)
+
+        family = key.split('/')[0]
+        for p in payloads:
+            detection[family][0] += engine.analyze(p)['detected']
+            detection[family][1] += 1
+
+    for stage in STAGES:
+        stages[stage]['total'] = sum(stages[stage].values())
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'per_bucket': per_bucket,
+            'calibration_ns': calibration,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'stages': stages,
+        'detection_rate': {f: hit / n for f, (hit, n) in detection.items()},
+    }
+
+
+def _scale(results: dict, baseline: dict, normalize: bool) -> float:
+    if not normalize:
+        return 1.0
+    return baseline['meta']['calibration_ns'] / results['meta']['calibration_ns']
+
+
+def compare(results: dict, baseline: dict, threshold: float,
+            bucket_threshold: float, normalize: bool = False) -> list:
+    """
+    Bandingkan waktu dengan baseline.
+
+    Total per tahap memakai threshold; bucket individual (lebih bising)
+    memakai bucket_threshold.
+
+    Returns:
+        list of (stage, bucket, rasio, ambang) yang melewati ambang
+    """
+    scale = _scale(results, baseline, normalize)
+    regressions = []
+    for stage, buckets in results['stages'].items():
+        base_buckets = baseline['stages'].get(stage, {})
+        for key, value in buckets.items():
+            if key not in base_buckets:
+                continue
+            ratio = value * scale / base_buckets[key]
+            limit = threshold if key == 'total' else bucket_threshold
+            if ratio > limit:
+                regressions.append((stage, key, ratio, limit))
+    return regressions
+
+
+def print_report(results: dict, baseline: dict = None, normalize: bool = False):
+    scale = _scale(results, baseline, normalize) if baseline is not None else 1.0
+    print(f"{'tahap':<9} {'total µs':>10} {'baseline µs':>12} {'rasio':>7}")
+    for stage in STAGES:
+        total = results['stages'][stage]['total']
+        line = f"{stage:<9} {total / 1e3:10.1f}"
+        if baseline is not None and stage in baseline['stages']:
+            base = baseline['stages'][stage]['total']
+            line += f" {base / 1e3:12.1f} {total * scale / base:7.2f}"
+        print(line)
+    print("\nDetection rate per family:")
+    for family, rate in results['detection_rate'].items():
+        print(f"  {family:<10} {rate:6.1%}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Benchmark suite Mini-IDS')
+    ap.add_argument('--seed', type=int, default=1)
+    ap.add_argument('--per-bucket', type=int, default=50)
+    ap.add_argument('--repeat', type=int, default=5)
+    ap.add_argument('--quick', action='store_true', help='Corpus kecil (10 per bucket)')
+    ap.add_argument('--output', default=DEFAULT_OUTPUT)
+    ap.add_argument('--baseline', default=DEFAULT_BASELINE)
+    ap.add_argument('--update-baseline', action='store_true')
+    ap.add_argument('--threshold', type=float, default=1.25,
+                    help='Ambang rasio untuk total per tahap (default: 1.25)')
+    ap.add_argument('--bucket-threshold', type=float, default=1.6,
+                    help='Ambang rasio per bucket family/panjang (default: 1.6)')
+    ap.add_argument('--normalize', action='store_true',
+                    help='Skalakan dengan loop kalibrasi (baseline dari mesin lain)')
+    ap.add_argument('--strict', action='store_true',
+                    help='Bucket yang melewati ambang juga dihitung regresi')
+    args = ap.parse_args()
+
+    per_bucket = 10 if args.quick else args.per_bucket
+    results = run_suite(args.seed, per_bucket, args.repeat)
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print_report(results)
+        print(f"\nBaseline disimpan ke {args.baseline}")
+        return
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_report(results, baseline, args.normalize)
+    print(f"\nHasil ditulis ke {args.output}")
+    if baseline is None:
+        print("Belum ada baseline (jalankan dengan --update-baseline)")
+        return
+
+    if any(results['meta'][k] != baseline['meta'].get(k) for k in ('seed', 'per_bucket')):
+        print("Catatan: seed/per_bucket berbeda dari baseline; hasil kurang sebanding")
+
+    flagged = compare(results, baseline, args.threshold, args.bucket_threshold,
+                      args.normalize)
+    regressions = [r for r in flagged if args.strict or r[1] == 'total']
+    warnings = [r for r in flagged if r not in regressions]
+    if warnings:
+        print(f"\n⚠️  {len(warnings)} bucket di atas ambang (peringatan):")
+        for stage, key, ratio, limit in warnings:
+            print(f"  {stage:<9} {key:<16} {ratio:5.2f}x (ambang {limit:.2f}x)")
+    if regressions:
+        print(f"\n❌ {len(regressions)} regresi:")
+        for stage, key, ratio, limit in regressions:
+            print(f"  {stage:<9} {key:<16} {ratio:5.2f}x (ambang {limit:.2f}x)")
+        sys.exit(1)
+    print("\n✅ Tidak ada regresi di atas ambang")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""
+Allowlist Bentuk Parameter
+==========================
+Sebagian besar parameter punya bentuk tetap per endpoint: id numerik,
+UUID, tanggal, nilai enum. ShapeAllowlist mempelajari bentuk tersebut
+dari trafik yang sudah dinilai bersih oleh Engine, lalu payload dengan
+bentuk yang dikenal langsung ALLOW tanpa DFASimulator, ruleset, Lexer
+maupun Parser (tier 0 tetap lebih dulu karena lebih murah).
+
+Bentuk (template) sebuah payload "nama=nilai":
+
+    UUID           → \\x03       /user?id=9f1c...-...  → id=\\x03
+    run hex ≥ 8    → \\x02       (token, hash)
+    run digit      → \\x01       date=2026-10-17      → date=\\x01-\\x01-\\x01
+    karakter lain  → tetap       sort=asc             → sort=asc
+
+Key = endpoint + NUL + template. Huruf tidak di-template,
+sehingga kata kunci SQL, quote dan operator selalu ikut membentuk key.
+
+Template diambil dari teks yang diperiksa DFA, yaitu hasil Normalizer
+bila engine memakainya, bukan payload mentah: pada payload mentah
+digit escape %27 (quote), %23 (#) dan %20 (spasi) sama-sama menjadi
+placeholder, sehingga bentuk bersih "id=5%20%20" meloloskan
+"id=1%27%23". Karena itu allowlist mencatat setelan Normalizer saat
+belajar dan Engine menolak allowlist dengan setelan berbeda.
+
+Keamanan:
+- Hanya payload dengan verdict ALLOW yang dipelajari, dan hanya bentuk
+  yang muncul minimal min_count kali (nilai sekali lewat tidak masuk).
+- Bentuk diterima hanya bila semua wakilnya juga ALLOW: setiap
+  placeholder diganti nilai yang berbentuk sama (digit 0, 1, 9, angka
+  panjang; run hex dan UUID dengan huruf a-f). Pattern seperti
+  '1'='1' atau OR 0=0 memakai nilai literal, jadi '2'='3' yang bersih
+  tidak boleh meloloskan '1'='1'. Placeholder tidak pernah memuat
+  huruf di luar a-f, jadi kata kunci SQL tidak bisa bersembunyi di
+  dalamnya.
+- False positive (payload tak dikenal dianggap dikenal) dibatasi budget
+  fp_rate eksplisit lewat lebar digest; hash di-key dengan salt acak
+  per file sehingga tabrakan tidak bisa dicari di luar.
+
+Penyimpanan berupa set digest terpotong, bukan Bloom filter: dengan
+budget 1e-6 Bloom filter butuh ~20 probe bit per lookup di Python,
+sedangkan set digest hanya satu hash dan satu lookup set. File berisi
+digest berurutan (n × width byte) sehingga load cukup satu read.
+- File menyimpan versi ruleset saat belajar; allowlist dengan versi
+  berbeda harus ditolak pemanggil (lihat main.py).
+
+Belajar dari log:
+    python allowlist.py access.log -o allowlist.bin [--rules rules.dsl] [--normalize]
+"""
+
+import argparse
+import math
+import os
+import re
+import struct
+import sys
+import tempfile
+from collections import Counter
+from hashlib import blake2b
+from typing import Iterable, List, Optional, Tuple
+
+MAGIC = b'MIDSALW2'
+# magic, width (byte per digest), n, fp_rate, panjang salt, panjang versi,
+# panjang setelan normalizer
+HEADER = struct.Struct('<8sBQdHHH')
+MIN_WIDTH, MAX_WIDTH = 4, 16
+
+DEFAULT_FP_RATE = 1e-6
+DEFAULT_MIN_COUNT = 3
+
+UUID = re.compile(r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}')
+HEX_RUN = re.compile(r'[0-9a-fA-F]{8,}')
+DIGITS = re.compile(r'[0-9]+')
+PLACEHOLDERS = re.compile('[\x01\x02\x03]')
+
+
+def _hex_run(match) -> str:
+    """Run hex campuran digit + huruf → placeholder (kata / angka biasa tetap)."""
+    run = match.group()
+    return run if run.isdigit() or run.isalpha() else '\x02'
+
+
+def template(payload: str) -> str:
+    """Payload → bentuk (UUID, run hex, run digit diganti placeholder)."""
+    if '-' in payload:
+        payload = UUID.sub('\x03', payload)
+    payload = HEX_RUN.sub(_hex_run, payload)
+    return DIGITS.sub('\x01', payload)
+
+
+def normalizer_spec(normalizer) -> str:
+    """Setelan Normalizer sebagai string ('' = tanpa normalisasi)."""
+    if normalizer is None:
+        return ''
+    return f"depth={normalizer.depth},plus={int(normalizer.plus)},casefold={int(normalizer.casefold)}"
+
+
+# Nilai wakil per placeholder (template(nilai) == placeholder); wakil
+# ke-k mengganti setiap placeholder dengan nilai ke-k
+REPRESENTATIVES = {
+    '\x01': ('0', '1', '9', '12345678901234567890'),
+    '\x02': ('0000000a', '1111111a', 'fffffff9', 'abcdef0123456789abcdef'),
+    '\x03': ('00000000-0000-0000-0000-00000000000a', '11111111-1111-1111-1111-111111111111',
+             'ffffffff-ffff-ffff-ffff-fffffffffff9', '99999999-9999-9999-9999-99999999999f'),
+}
+
+
+def representatives(shape: str) -> List[str]:
+    """Payload konkret untuk bentuk (satu per baris REPRESENTATIVES)."""
+    if PLACEHOLDERS.search(shape) is None:
+        return [shape]
+    return [PLACEHOLDERS.sub(lambda m: REPRESENTATIVES[m.group()][k], shape)
+            for k in range(len(REPRESENTATIVES['\x01']))]
+
+
+class DigestSet:
+    """
+    Himpunan digest blake2b (di-key salt) selebar width byte.
+
+    Lebar dihitung dari kapasitas n dan budget false positive p: satu
+    key asing cocok dengan salah satu dari n digest 8w bit dengan
+    peluang ≤ n / 2^(8w), jadi w = ceil(log2(n / p) / 8).
+    """
+
+    def __init__(self, capacity: int, fp_rate: float = DEFAULT_FP_RATE,
+                 salt: Optional[bytes] = None, width: Optional[int] = None):
+        if not 0 < fp_rate < 1:
+            raise ValueError("fp_rate harus di antara 0 dan 1")
+        if width is None:
+            bits = math.log2(max(1, capacity) / fp_rate)
+            width = min(MAX_WIDTH, max(MIN_WIDTH, math.ceil(bits / 8)))
+        self.width = width
+        self.fp_rate = fp_rate
+        self.salt = salt if salt is not None else os.urandom(16)
+        self.digests = set()
+        self._hasher = blake2b(digest_size=self.width, key=self.salt)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_hasher']  # objek hash tidak bisa di-pickle
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._hasher = blake2b(digest_size=self.width, key=self.salt)
+
+    def __len__(self):
+        return len(self.digests)
+
+    def digest(self, key: bytes) -> bytes:
+        h = self._hasher.copy()
+        h.update(key)
+        return h.digest()
+
+    def add(self, key: bytes):
+        self.digests.add(self.digest(key))
+
+    def __contains__(self, key: bytes) -> bool:
+        return self.digest(key) in self.digests
+
+    def expected_fp_rate(self) -> float:
+        """Peluang key asing dianggap dikenal, untuk isi saat ini."""
+        return len(self.digests) / 2.0 ** (8 * self.width)
+
+
+class ShapeAllowlist:
+    """
+    Bentuk parameter bersih yang dikenal, per endpoint.
+
+    known(text, endpoint) → True bila bentuknya pernah dipelajari
+    (atau false positive, dengan peluang ≤ budget fp_rate). text adalah
+    payload setelah Normalizer yang setelannya tercatat di normalizer.
+    """
+
+    def __init__(self, digests: DigestSet, version: str = '', normalizer: str = ''):
+        self.digests = digests
+        self.version = version
+        self.normalizer = normalizer
+
+    def __len__(self):
+        return len(self.digests)
+
+    @staticmethod
+    def key(payload: str, endpoint: str = '') -> bytes:
+        return f"{endpoint}\0{template(payload)}".encode('utf-8', 'surrogatepass')
+
+    def known(self, payload: str, endpoint: str = '') -> bool:
+        return self.key(payload, endpoint) in self.digests
+
+    @classmethod
+    def learn(cls, samples: Iterable[Tuple[str, str]], engine,
+              min_count: int = DEFAULT_MIN_COUNT,
+              fp_rate: float = DEFAULT_FP_RATE) -> 'ShapeAllowlist':
+        """
+        Pelajari bentuk dari (endpoint, payload).
+
+        engine menilai setiap payload; hanya bentuk yang ALLOW, muncul
+        minimal min_count kali, dan semua wakilnya juga ALLOW yang diterima.
+        Bentuk diambil dari payload setelah engine.normalizer (sama
+        dengan saat deteksi).
+        """
+        normalizer = engine.normalizer
+        counts = Counter()
+        for endpoint, payload in samples:
+            text = normalizer.normalize(payload).text if normalizer is not None else payload
+            shape = template(text)
+            key = (endpoint, shape)
+            if counts[key] < 0:
+                continue  # bentuk ini pernah terdeteksi
+            if engine.analyze_batch([payload])[0]['detected']:
+                counts[key] = -1
+            else:
+                counts[key] += 1
+
+        shapes = [key for key, count in counts.items() if count >= min_count]
+        candidates = sorted({p for _, shape in shapes for p in representatives(shape)})
+        unsafe = {p for p, r in zip(candidates, engine.analyze_batch(candidates))
+                  if r['detected']}
+        shapes = [(e, s) for e, s in shapes if unsafe.isdisjoint(representatives(s))]
+
+        digests = DigestSet(len(shapes), fp_rate)
+        for endpoint, shape in shapes:
+            digests.add(f"{endpoint}\0{shape}".encode('utf-8', 'surrogatepass'))
+        ruleset = engine.ruleset
+        return cls(digests, ruleset.version if ruleset is not None else '',
+                   normalizer_spec(normalizer))
+
+    def save(self, path: str):
+        """Tulis atomik: header + salt + versi + digest berurutan."""
+        digests = self.digests
+        version = self.version.encode('ascii')
+        normalizer = self.normalizer.encode('ascii')
+        header = HEADER.pack(MAGIC, digests.width, len(digests), digests.fp_rate,
+                             len(digests.salt), len(version), len(normalizer))
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(header + digests.salt + version + normalizer)
+                f.write(b''.join(sorted(digests.digests)))
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> 'ShapeAllowlist':
+        """Baca file allowlist (satu read, tanpa parsing per entri)."""
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < HEADER.size:
+            raise ValueError(f"{path}: file allowlist terlalu pendek")
+        magic, width, n, fp_rate, salt_len, version_len, norm_len = HEADER.unpack_from(data)
+        if magic == b'MIDSALW1':
+            raise ValueError(f"{path}: format allowlist lama (bentuk dari payload mentah), "
+                             "bangun ulang dengan allowlist.py")
+        if magic != MAGIC:
+            raise ValueError(f"{path}: bukan file allowlist")
+        offset = HEADER.size
+        salt = data[offset:offset + salt_len]
+        offset += salt_len
+        version = data[offset:offset + version_len].decode('ascii')
+        offset += version_len
+        normalizer = data[offset:offset + norm_len].decode('ascii')
+        offset += norm_len
+        if len(data) - offset != n * width:
+            raise ValueError(f"{path}: jumlah digest tidak cocok")
+        digests = DigestSet(n, fp_rate, salt, width)
+        digests.digests = {data[i:i + width] for i in range(offset, len(data), width)}
+        return cls(digests, version, normalizer)
+
+    def stats(self) -> dict:
+        digests = self.digests
+        return {
+            'shapes': len(digests),
+            'width': digests.width,
+            'bytes': len(digests) * digests.width,
+            'fp_budget': digests.fp_rate,
+            'fp_expected': digests.expected_fp_rate(),
+            'normalizer': self.normalizer,
+        }
+
+
+def log_samples(lines: Iterable[bytes]) -> Iterable[Tuple[str, str]]:
+    """(endpoint, payload 'nama=nilai') untuk setiap parameter di access log."""
+    from logstream import extract_payloads, parse_record
+    for line in lines:
+        record = parse_record(line)
+        if record is None:
+            continue
+        target = record[1]
+        endpoint = target.partition('?')[0]
+        for payload in extract_payloads(target):
+            yield endpoint, payload
+
+
+# ============ BELAJAR ============
+if __name__ == "__main__":
+    from engine import Engine
+    from logstream import read_lines
+    from normalizer import Normalizer
+    from ruleset import RulesetError, load_ruleset
+
+    parser = argparse.ArgumentParser(description='Pelajari allowlist bentuk parameter dari access log')
+    parser.add_argument('log', help='Access log (combined / JSON lines) atau - untuk stdin')
+    parser.add_argument('-o', '--output', default='allowlist.bin')
+    parser.add_argument('-r', '--rules', help='Ruleset DSL yang sama dengan saat deteksi')
+    parser.add_argument('--fp-rate', type=float, default=DEFAULT_FP_RATE,
+                        help=f'Budget false positive per lookup (default: {DEFAULT_FP_RATE})')
+    parser.add_argument('--min-count', type=int, default=DEFAULT_MIN_COUNT,
+                        help=f'Minimal kemunculan bentuk (default: {DEFAULT_MIN_COUNT})')
+    parser.add_argument('--normalize', type=int, nargs='?', const=2, metavar='DEPTH',
+                        help='Setelan --normalize yang sama dengan saat deteksi (default: 2)')
+    args = parser.parse_args()
+    if args.normalize is not None and args.normalize < 0:
+        parser.error('--normalize: DEPTH harus >= 0')
+
+    try:
+        ruleset = load_ruleset(args.rules) if args.rules else None
+    except (OSError, RulesetError) as e:
+        print(f"❌ Gagal memuat ruleset: {e}", file=sys.stderr)
+        sys.exit(1)
+    normalizer = Normalizer(args.normalize) if args.normalize is not None else None
+    allowlist = ShapeAllowlist.learn(log_samples(read_lines(args.log)), Engine(ruleset=ruleset, normalizer=normalizer),
+                                     args.min_count, args.fp_rate)
+    allowlist.save(args.output)
+    st = allowlist.stats()
+    print(f"{st['shapes']} bentuk → {args.output} ({st['bytes']:,} byte digest, {st['width']} byte/bentuk, "
+          f"FP ≈ {st['fp_expected']:.1e}, budget {st['fp_budget']:.0e})")
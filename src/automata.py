@@ -4,9 +4,16 @@ Automata (DFA/NFA) untuk Mini-IDS (2 Pola SQL Injection)
 Simulasi DFA untuk Boolean-based dan Comment-based.
 """
 
+import copy
 import re
-from typing import Dict, List, Tuple
+import time
+from array import array
+from typing import Dict, FrozenSet, Iterator, List, Tuple
 from dataclasses import dataclass
+from dfa_trace import parse_trace
+from prefilter import LiteralPrefilter
+from regex_nfa import StreamRules, StreamScanner
+from rule_order import RuleOrder
 
 
 @dataclass
@@ -35,7 +42,6 @@ class DFA:
         self.transitions: Dict[Tuple[str, str], str] = {}
         self.start_state: str = None
         self.accepting_states: set = set()
-        self.current_state: str = None
     
     def add_state(self, name: str, is_accepting: bool = False, is_start: bool = False):
         """Tambah state ke DFA."""
@@ -44,27 +50,327 @@ class DFA:
             self.accepting_states.add(name)
         if is_start:
             self.start_state = name
-            self.current_state = name
     
     def add_transition(self, from_state: str, symbol: str, to_state: str):
         """Tambah transisi: δ(from_state, symbol) = to_state"""
         self.transitions[(from_state, symbol)] = to_state
     
+    def start(self) -> 'DFARun':
+        """Run baru dari state awal (definisi DFA tidak ikut berubah)."""
+        return DFARun(self)
+    
+    def compile(self) -> 'CompiledDFA':
+        """Ubah DFA menjadi tabel transisi integer (lihat CompiledDFA)."""
+        return CompiledDFA(self)
+
+
+class DFARun:
+    """
+    State eksekusi satu input di atas sebuah DFA.
+
+    DFA hanya definisi (Q, Σ, δ, q0, F) dan tidak diubah oleh simulasi;
+    posisi saat ini disimpan di DFARun milik pemanggil, sehingga satu
+    DFA bisa dijalankan bersamaan oleh banyak thread.
+    """
+
+    __slots__ = ('dfa', 'current_state')
+
+    def __init__(self, dfa: DFA):
+        self.dfa = dfa
+        self.current_state: str = dfa.start_state
+
     def reset(self):
         """Reset ke state awal."""
-        self.current_state = self.start_state
-    
+        self.current_state = self.dfa.start_state
+
     def step(self, symbol: str) -> bool:
         """Jalankan satu langkah transisi."""
         key = (self.current_state, symbol)
-        if key in self.transitions:
-            self.current_state = self.transitions[key]
+        transitions = self.dfa.transitions
+        if key in transitions:
+            self.current_state = transitions[key]
             return True
         return False
-    
+
     def is_accepting(self) -> bool:
         """Cek apakah di state accept."""
-        return self.current_state in self.accepting_states
+        return self.current_state in self.dfa.accepting_states
+
+
+class CompiledDFA:
+    """
+    Bentuk tabel (table-driven) dari sebuah DFA.
+    
+    Hasil kompilasi:
+    - State diberi nomor 0..n-1 sesuai urutan add_state()
+    - class_map: bytes 256 entri, byte → kelas karakter (0 = simbol lain)
+    - table: array datar, table[state * n_classes + kelas] = offset baris
+      state tujuan (sudah dikali n_classes)
+    
+    Semantik sama dengan DFARun.step() per karakter: transisi yang tidak
+    didefinisikan membuat state tetap, dan simbol multi-karakter
+    (mis. 'OR', '--') tidak pernah cocok dengan satu karakter.
+    Objek ini tidak diubah setelah dibuat; state run hanya berupa int lokal.
+    """
+    
+    def __init__(self, dfa: DFA):
+        self.name = dfa.name
+        self.state_names: List[str] = list(dfa.states)
+        index = {name: i for i, name in enumerate(self.state_names)}
+        
+        # Kelas karakter: hanya simbol satu karakter yang bisa dibaca
+        symbols = sorted({sym for (_, sym) in dfa.transitions if len(sym) == 1})
+        self.n_classes = len(symbols) + 1
+        classes = {sym: i + 1 for i, sym in enumerate(symbols)}
+        class_map = bytearray(256)
+        self.wide_classes: Dict[str, int] = {}
+        for sym, cls in classes.items():
+            if ord(sym) < 256:
+                class_map[ord(sym)] = cls
+            else:
+                self.wide_classes[sym] = cls
+        self.class_map = bytes(class_map)
+        
+        # Default: self-loop (transisi gagal → state tetap)
+        n = self.n_classes
+        table = array('I', [i * n for i in range(len(self.state_names))
+                            for _ in range(n)])
+        for (src, sym), dst in dfa.transitions.items():
+            if sym in classes:
+                table[index[src] * n + classes[sym]] = index[dst] * n
+        self.table = table
+        
+        self.start = index[dfa.start_state]
+        self.accepting = bytes(
+            1 if name in dfa.accepting_states else 0 for name in self.state_names
+        )
+    
+    def _classes(self, text):
+        """
+        Siapkan input untuk loop run.
+        
+        bytes dan teks latin-1 dibaca langsung sebagai byte (class_map
+        dipakai di loop); teks lain dipetakan ke daftar kelas dulu.
+        """
+        if isinstance(text, (bytes, bytearray)):
+            return text, self.class_map
+        if not isinstance(text, str):
+            # memoryview / mmap: iterasi sebagai byte tanpa salinan
+            return memoryview(text).cast('B'), self.class_map
+        try:
+            return text.encode('latin-1'), self.class_map
+        except UnicodeEncodeError:
+            wide = self.wide_classes
+            cmap = self.class_map
+            return [cmap[ord(ch)] if ord(ch) < 256 else wide.get(ch, 0)
+                    for ch in text], None
+    
+    def run(self, text) -> int:
+        """Jalankan DFA atas seluruh input, kembalikan nomor state akhir."""
+        data, cmap = self._classes(text)
+        table = self.table
+        s = self.start * self.n_classes
+        if cmap is None:
+            for cls in data:
+                s = table[s + cls]
+        else:
+            for b in data:
+                s = table[s + cmap[b]]
+        return s // self.n_classes
+    
+    def run_trace(self, text) -> List[int]:
+        """Seperti run(), tetapi mengembalikan nomor state setiap langkah."""
+        data, cmap = self._classes(text)
+        table = self.table
+        n = self.n_classes
+        s = self.start * n
+        trace = [self.start]
+        append = trace.append
+        if cmap is None:
+            for cls in data:
+                s = table[s + cls]
+                append(s // n)
+        else:
+            for b in data:
+                s = table[s + cmap[b]]
+                append(s // n)
+        return trace
+    
+    def changes(self, text) -> Iterator[Tuple[int, int]]:
+        """
+        (langkah, state baru) setiap kali state berubah.
+
+        Langkah ke-i = setelah membaca simbol ke-i (mulai 1); self-loop
+        tidak menghasilkan apa pun, jadi pemanggil (dfa_trace.py) hanya
+        membayar per perubahan state, bukan per karakter.
+        """
+        data, cmap = self._classes(text)
+        table = self.table
+        n = self.n_classes
+        s = prev = self.start * n
+        if cmap is None:
+            for step, cls in enumerate(data, 1):
+                s = table[s + cls]
+                if s != prev:
+                    yield step, s // n
+                    prev = s
+        else:
+            for step, b in enumerate(data, 1):
+                s = table[s + cmap[b]]
+                if s != prev:
+                    yield step, s // n
+                    prev = s
+    
+    def is_accepting(self, state: int) -> bool:
+        """Cek apakah nomor state termasuk state accept."""
+        return self.accepting[state] == 1
+
+
+def hopcroft_minimize(delta: List[List[int]], labels: List) -> List[int]:
+    """
+    Minimisasi DFA dengan algoritma Hopcroft.
+    
+    Args:
+        delta: delta[state][kelas] = state tujuan (DFA lengkap)
+        labels: label setiap state; partisi awal = state berlabel sama
+    
+    Returns:
+        block[state] = nomor state hasil minimisasi
+    """
+    n_states = len(delta)
+    n_classes = len(delta[0]) if delta else 0
+    
+    # Transisi balik: inverse[kelas][t] = state s dengan δ(s, kelas) = t
+    inverse = [[[] for _ in range(n_states)] for _ in range(n_classes)]
+    for s, row in enumerate(delta):
+        for cls, t in enumerate(row):
+            inverse[cls][t].append(s)
+    
+    # Partisi awal berdasarkan label (tag serangan)
+    initial = {}
+    for s, label in enumerate(labels):
+        initial.setdefault(label, set()).add(s)
+    partition = list(initial.values())
+    block = [0] * n_states
+    for b, states in enumerate(partition):
+        for s in states:
+            block[s] = b
+    
+    worklist = list(range(len(partition)))
+    in_worklist = set(worklist)
+    while worklist:
+        splitter = worklist.pop()
+        in_worklist.discard(splitter)
+        splitter_states = list(partition[splitter])
+        for cls in range(n_classes):
+            # X = state yang masuk ke splitter dengan kelas ini
+            touched = {}
+            for t in splitter_states:
+                for s in inverse[cls][t]:
+                    touched.setdefault(block[s], set()).add(s)
+            for b, inside in touched.items():
+                if len(inside) == len(partition[b]):
+                    continue
+                outside = partition[b] - inside
+                partition[b] = inside
+                partition.append(outside)
+                new = len(partition) - 1
+                for s in outside:
+                    block[s] = new
+                if b in in_worklist:
+                    worklist.append(new)
+                    in_worklist.add(new)
+                else:
+                    smaller = b if len(inside) <= len(outside) else new
+                    worklist.append(smaller)
+                    in_worklist.add(smaller)
+    
+    # Nomori ulang berurutan sesuai kemunculan (start tetap 0)
+    renumber = {}
+    return [renumber.setdefault(b, len(renumber)) for b in block]
+
+
+class ProductDetector:
+    """
+    Detektor gabungan: produk semua DFA deteksi dalam satu automaton.
+    
+    State produk = tuple state setiap DFA komponen, sehingga satu kali
+    pemindaian payload menjalankan semua DFA sekaligus. Hasil produk
+    diminimalkan dengan Hopcroft; setiap state diberi tag berupa tipe
+    serangan dari komponen yang sedang berada di state accept.
+    
+    Hasil detect() sama dengan menjalankan simulate_dfa() untuk setiap
+    DFA secara terpisah, tetapi jumlah pass tetap satu.
+    """
+    
+    def __init__(self, machines: List[Tuple[str, DFA]]):
+        self.attack_types = [attack_type for attack_type, _ in machines]
+        compiled = [dfa.compile() for _, dfa in machines]
+        
+        # Alfabet gabungan: simbol satu karakter dari semua komponen
+        symbols = sorted({chr(b) for c in compiled for b in range(256) if c.class_map[b]}
+                         | {sym for c in compiled for sym in c.wide_classes})
+        local_classes = [
+            [0] + [c.class_map[ord(sym)] if ord(sym) < 256 else c.wide_classes.get(sym, 0)
+                   for sym in symbols]
+            for c in compiled
+        ]
+        n_classes = len(symbols) + 1
+        
+        # Konstruksi produk (BFS dari tuple state awal)
+        start = tuple(c.start for c in compiled)
+        index = {start: 0}
+        tuples = [start]
+        delta = []
+        for current in tuples:
+            row = []
+            for cls in range(n_classes):
+                nxt = tuple(
+                    c.table[s * c.n_classes + local[cls]] // c.n_classes
+                    for c, local, s in zip(compiled, local_classes, current)
+                )
+                if nxt not in index:
+                    index[nxt] = len(tuples)
+                    tuples.append(nxt)
+                row.append(index[nxt])
+            delta.append(row)
+        self.product_size = len(tuples)
+        
+        labels = [
+            frozenset(t for t, c, s in zip(self.attack_types, compiled, current)
+                      if c.accepting[s])
+            for current in tuples
+        ]
+        
+        # Minimisasi, lalu bentuk ulang sebagai DFA dict (referensi)
+        block = hopcroft_minimize(delta, labels)
+        self.dfa = DFA("Product_DFA")
+        self.tags: Dict[str, FrozenSet[str]] = {}
+        for s in range(len(tuples)):
+            name = f"p{block[s]}"
+            if name not in self.dfa.states:
+                self.dfa.add_state(name, is_accepting=bool(labels[s]), is_start=(s == 0))
+                self.tags[name] = labels[s]
+        for s, row in enumerate(delta):
+            for cls, t in enumerate(row[1:], 1):
+                if block[t] != block[s]:
+                    self.dfa.add_transition(f"p{block[s]}", symbols[cls - 1], f"p{block[t]}")
+        
+        self.compiled = self.dfa.compile()
+        order = {t: i for i, t in enumerate(self.attack_types)}
+        self.state_tags = [
+            sorted(self.tags[name], key=order.get) for name in self.compiled.state_names
+        ]
+    
+    def detect(self, payload) -> dict:
+        """Satu pass atas payload; laporkan semua tipe serangan sekaligus."""
+        final = self.compiled.run(payload)
+        types = self.state_tags[final]
+        return {
+            'detected': bool(types),
+            'types': list(types),
+            'final_state': self.compiled.state_names[final],
+        }
 
 
 class DFASimulator:
@@ -74,6 +380,9 @@ class DFASimulator:
     Mendeteksi 2 pola:
     1. Boolean-based: ' OR '1'='1
     2. Comment-based: admin'--
+    
+    Semua simulasi memakai state run lokal per panggilan; satu-satunya
+    state yang berubah adalah statistik rule_order (lihat worker()).
     """
     
     # Pattern regex untuk deteksi (NFA behavior)
@@ -88,10 +397,60 @@ class DFASimulator:
         (r"'#", 'COMMENT_BASED', 'HIGH'),
     ]
     
-    def __init__(self):
+    # Regex terkompilasi + prefilter Aho-Corasick (dibangun sekali per kelas)
+    COMPILED_PATTERNS = [
+        (re.compile(p, re.IGNORECASE), t, s) for p, t, s in SQL_PATTERNS
+    ]
+    # Versi bytes: dipakai langsung untuk bytes/memoryview/mmap tanpa decode
+    BYTE_PATTERNS = [
+        (re.compile(p.encode('ascii'), re.IGNORECASE), t, s) for p, t, s in SQL_PATTERNS
+    ]
+    PREFILTER = LiteralPrefilter([p for p, _, _ in SQL_PATTERNS])
+    # Program NFA untuk scanning per potongan dan LazyDFA untuk mode
+    # all-matches (dibangun saat pertama dipakai)
+    _stream_rules = None
+    _automaton = None
+    
+    def __init__(self, adaptive: bool = False, trace='rle'):
         # Build DFA untuk demo
         self.boolean_dfa = self._build_boolean_dfa()
         self.comment_dfa = self._build_comment_dfa()
+        self._detector = None
+        # Urutan evaluasi mode first-match (deklarasi; adaptive=True:
+        # menurut hit dan biaya, label multi-match tidak deterministik)
+        self.rule_order = RuleOrder(len(self.SQL_PATTERNS), adaptive=adaptive)
+        # Mode trace simulate_dfa (spesifikasi string atau Tracer, lihat dfa_trace.py)
+        self.tracer = parse_trace(trace) if isinstance(trace, str) else trace
+        
+        # Bentuk tabel untuk simulasi cepat (dict tetap sebagai referensi)
+        self.compiled_dfas = {
+            'boolean': self.boolean_dfa.compile(),
+            'comment': self.comment_dfa.compile(),
+        }
+    
+    def worker(self) -> 'DFASimulator':
+        """
+        Simulator untuk satu thread: DFA, tabel terkompilasi, regex dan
+        detektor produk dipakai bersama (tidak berubah setelah dibangun);
+        hanya rule_order (hitungan adaptif) milik worker sendiri.
+        """
+        worker = copy.copy(self)
+        worker.rule_order = self.rule_order.fork()
+        return worker
+    
+    def detection_dfas(self) -> List[Tuple[str, DFA]]:
+        """Semua DFA deteksi beserta tipe serangan yang dilaporkannya."""
+        return [
+            ('BOOLEAN_BASED', self.boolean_dfa),
+            ('COMMENT_BASED', self.comment_dfa),
+        ]
+    
+    @property
+    def detector(self) -> ProductDetector:
+        """Detektor produk (dibangun saat pertama kali dipakai)."""
+        if self._detector is None:
+            self._detector = ProductDetector(self.detection_dfas())
+        return self._detector
     
     def _build_boolean_dfa(self) -> DFA:
         """
@@ -134,57 +493,175 @@ class DFASimulator:
         
         return dfa
     
-    def check_sql_injection(self, payload: str) -> dict:
+    def check_sql_injection(self, payload, all_matches: bool = False) -> dict:
         """
         Cek payload untuk SQL Injection menggunakan regex (NFA).
         
+        Prefilter Aho-Corasick memilih pattern yang anchor literalnya
+        muncul; hanya pattern tersebut yang dijalankan regex-nya, dalam
+        urutan rule_order. Bila beberapa pattern match, yang dilaporkan
+        adalah yang pertama dievaluasi: secara default urutan deklarasi
+        SQL_PATTERNS (deterministik). Dengan adaptive=True (rule yang
+        sering hit dan murah lebih dulu) type/severity/pattern untuk
+        payload seperti itu bergantung pada trafik sebelumnya dan urutan
+        milik worker, dan VerdictCache menyimpan label yang pertama kali
+        dihitung; detected tidak terpengaruh.
+        
+        all_matches=True: semua pattern kandidat diperiksa sekaligus
+        dalam satu scan LazyDFA; hasil memuat matches (semua pattern
+        yang match beserta span, urut posisi) dan field utama diisi dari
+        match paling kiri.
+        
+        payload boleh str atau bytes/memoryview/mmap; untuk bytes dipakai
+        regex bytes (semantik ASCII) dan hanya teks match yang di-decode.
+        
         Returns:
-            dict dengan detected, type, severity, pattern
+            dict dengan detected, type, severity, pattern, rule (regex),
+            span (offset match di payload) [, matches]
         """
         result = {
             'detected': False,
             'type': None,
             'severity': None,
-            'pattern': None
+            'pattern': None,
+            'rule': None,
+            'span': None
         }
         
-        for pattern, attack_type, severity in self.SQL_PATTERNS:
-            match = re.search(pattern, payload, re.IGNORECASE)
+        is_text = isinstance(payload, str)
+        compiled = self.COMPILED_PATTERNS if is_text else self.BYTE_PATTERNS
+        candidates = self.PREFILTER.candidates(payload)
+        
+        if all_matches:
+            result['matches'] = matches = []
+            if candidates:
+                # bytes → latin-1: satu karakter per byte, span tetap sama
+                text = payload if is_text else bytes(payload).decode('latin-1')
+                found = self.automaton().scan(text)
+                for i in candidates:
+                    if found >> i & 1:
+                        # Span dari regex hanya untuk pattern yang pasti match
+                        match = compiled[i][0].search(payload)
+                        if match:
+                            matches.append(self._match(i, match, is_text))
+                matches.sort(key=lambda m: m['span'])
+            if matches:
+                result.update(matches[0], detected=True)
+            return result
+        
+        order = self.rule_order
+        if order.adaptive:
+            return self._check_adaptive(payload, compiled, candidates, is_text, result)
+        
+        # Urutan deklarasi: tanpa pencatatan per regex
+        for i in candidates:
+            match = compiled[i][0].search(payload)
             if match:
-                result['detected'] = True
-                result['type'] = attack_type
-                result['severity'] = severity
-                result['pattern'] = match.group()
-                break
+                result.update(self._match(i, match, is_text), detected=True)
+                order.tally(candidates.index(i) + 1)
+                return result
+        order.tally(len(candidates))
         
         return result
     
-    def simulate_dfa(self, payload: str, dfa_type: str = 'boolean') -> dict:
+    def _check_adaptive(self, payload, compiled, candidates, is_text: bool,
+                        result: dict) -> dict:
+        """First-match dalam urutan adaptif; hanya payload sampel dicatat per regex."""
+        order = self.rule_order
+        sampled = order.start()
+        evaluated = 0
+        for i in order.arrange(candidates):
+            evaluated += 1
+            if sampled:
+                start = time.perf_counter()
+                match = compiled[i][0].search(payload)
+                order.record(i, match is not None, time.perf_counter() - start)
+            else:
+                match = compiled[i][0].search(payload)
+            if match:
+                result.update(self._match(i, match, is_text), detected=True)
+                break
+        order.tally(evaluated)
+        return result
+    
+    def _match(self, index: int, match, is_text: bool) -> dict:
+        """Field hasil untuk satu match pattern ke-index."""
+        _, attack_type, severity = self.COMPILED_PATTERNS[index]
+        return {
+            'type': attack_type,
+            'severity': severity,
+            'pattern': (match.group() if is_text else
+                        match.group().decode('utf-8', errors='replace')),
+            'rule': self.SQL_PATTERNS[index][0],
+            'span': match.span(),
+        }
+    
+    @classmethod
+    def automaton(cls):
+        """SQL_PATTERNS sebagai satu LazyDFA (dibangun sekali per kelas)."""
+        if cls._automaton is None:
+            # Import lokal: lazy_dfa sendiri mengimpor DFA dari modul ini
+            from lazy_dfa import LazyDFA
+            cls._automaton = LazyDFA([p for p, _, _ in cls.SQL_PATTERNS])
+        return cls._automaton
+    
+    @classmethod
+    def stream_rules(cls) -> StreamRules:
+        """SQL_PATTERNS sebagai StreamRules (dibangun sekali per kelas)."""
+        if cls._stream_rules is None:
+            cls._stream_rules = StreamRules([
+                (p, {'type': t, 'severity': s, 'rule': p}) for p, t, s in cls.SQL_PATTERNS
+            ])
+        return cls._stream_rules
+    
+    def stream(self) -> StreamScanner:
+        """
+        Scanner resumable: feed(chunk) per potongan, lalu finish().
+        
+        Hasil finish() berbentuk sama dengan check_sql_injection; span
+        dihitung dari awal stream. Bila beberapa pattern match, yang
+        dilaporkan adalah match yang selesai paling awal di stream.
+        """
+        return self.stream_rules().scanner()
+    
+    def simulate_dfa(self, payload: str, dfa_type: str = 'boolean', trace=None) -> dict:
         """
         Simulasi DFA step-by-step.
         
         Args:
             payload: Input string
             dfa_type: 'boolean' atau 'comment'
+            trace: mode trace untuk panggilan ini ('off', 'full', 'rle',
+                   'ring:K', 'sampled:N' atau Tracer); default self.tracer
         
         Returns:
-            dict dengan trace states
+            dict dengan dfa_name, accepted, final_state, trace, trace_mode
+            [, trace_dropped, sampled]
         """
-        dfa = self.boolean_dfa if dfa_type == 'boolean' else self.comment_dfa
-        dfa.reset()
-        
-        trace = [dfa.current_state]
+        compiled = self.compiled_dfas['boolean' if dfa_type == 'boolean' else 'comment']
+        if trace is None:
+            tracer = self.tracer
+        else:
+            tracer = parse_trace(trace) if isinstance(trace, str) else trace
         
-        for char in payload:
-            dfa.step(char)
-            trace.append(dfa.current_state)
+        final, fields = tracer.run(compiled, payload)
         
-        return {
-            'dfa_name': dfa.name,
-            'accepted': dfa.is_accepting(),
-            'final_state': dfa.current_state,
-            'trace': trace
+        result = {
+            'dfa_name': compiled.name,
+            'accepted': compiled.is_accepting(final),
+            'final_state': compiled.state_names[final],
         }
+        result.update(fields)
+        return result
+    
+    def detect_all(self, payload: str) -> dict:
+        """
+        Jalankan semua DFA deteksi dalam satu pass (automaton produk).
+        
+        Returns:
+            dict dengan detected, types (semua tipe yang accept), final_state
+        """
+        return self.detector.detect(payload)
     
     def print_dfa_definition(self):
         """Print definisi formal DFA."""
@@ -209,6 +686,10 @@ if __name__ == "__main__":
     # Print DFA definitions
     sim.print_dfa_definition()
     
+    product = sim.detector
+    print(f"\nProduct DFA: {product.product_size} state produk → "
+          f"{len(product.dfa.states)} state setelah minimisasi Hopcroft")
+    
     # Test payloads
     payloads = [
         "username=admin",
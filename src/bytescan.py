@@ -0,0 +1,283 @@
+"""
+Scanning Bytes (Zero-Copy) untuk Mini-IDS
+=========================================
+Pipeline str mendecode setiap baris lalu menjalankan tier 0/1 per
+payload. Untuk file payload besar (satu payload per baris) deteksi
+kandidat berjalan langsung di atas buffer bytes/mmap:
+
+    regex bytes per pattern (search di C atas seluruh buffer)
+        → baris kandidat → decode baris itu saja → Engine
+
+Baris tanpa match tidak pernah di-decode dan tidak membuat objek
+Python; hasil melaporkan offset byte setiap baris kandidat.
+
+Baris kandidat selalu superset dari baris yang terdeteksi Engine:
+- pattern di-compile sebagai bytes dengan IGNORECASE | MULTILINE
+  (^/$ per baris); match yang melewati batas baris hanya menambah
+  kandidat, dan pencarian selalu dilanjutkan dari baris berikutnya
+- $ ditulis ulang menjadi (?=\r*$): pipeline str membuang '\r\n' di
+  akhir baris, jadi $ juga harus cocok sebelum '\r' pada file CRLF
+- baris berisi byte non-ASCII atau \\x1c-\\x1f (spasi menurut \\s
+  Unicode, bukan menurut \\s bytes) selalu menjadi kandidat
+- pattern yang semantiknya bisa berbeda di buffer utuh (\\A, \\Z,
+  lookbehind, negative lookahead) atau tidak bisa di-encode ASCII
+  membuat setiap baris menjadi kandidat
+"""
+
+import mmap
+import re
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import re._parser as sre_parse
+    import re._compiler as sre_compile
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_compile
+
+# Byte yang semantiknya berbeda antara regex str dan regex bytes
+ESCAPE = re.compile(rb'[\x1c-\x1f\x80-\xff]')
+_PLAIN_BYTES = bytes(b for b in range(256) if not (0x1c <= b < 0x20 or b >= 0x80))
+
+# Potongan untuk cek byte ESCAPE dan hitung baris di mmap
+CHUNK = 1 << 16
+
+
+def compile_bytes(pattern: str, flags: int = re.IGNORECASE) -> Optional[Tuple]:
+    """
+    Compile pattern str sebagai pencari bytes untuk buffer utuh.
+
+    Returns:
+        (anchor, verify): anchor dicari di seluruh buffer; bila verify
+        tidak None, baris anchor baru menjadi kandidat kalau verify juga
+        cocok di baris itu. None bila pattern tidak aman (lihat modul).
+    """
+    try:
+        source = pattern.encode('ascii')
+        tree = sre_parse.parse(source, flags)
+    except (UnicodeEncodeError, re.error):
+        return None
+    if not all(_whole_buffer_safe(op, av) for op, av in _nodes(tree)):
+        return None
+    _rewrite_line_end(tree, flags)
+    full = sre_compile.compile(tree, flags | re.MULTILINE)
+
+    # Regex tanpa prefix literal (mis. diawali huruf dengan IGNORECASE)
+    # dicoba di setiap posisi. Ekor pattern yang diawali literal tanpa
+    # huruf memakai pencarian prefix cepat di C; setiap match penuh
+    # memuat match ekornya di baris yang sama.
+    items = tree.data
+    for k, (op, av) in enumerate(items):
+        if op is sre_parse.LITERAL and not chr(av).isalpha():
+            if k == 0:
+                break
+            tail = items[k:]
+            if any(op in (sre_parse.GROUPREF, sre_parse.GROUPREF_EXISTS)
+                   for op, _ in _nodes(tail)):
+                break
+            anchor = sre_compile.compile(
+                sre_parse.SubPattern(tree.state, tail), flags | re.MULTILINE)
+            return anchor, full
+    return full, None
+
+
+def _nodes(seq):
+    """Semua node (op, av) di parse tree sre, rekursif."""
+    for op, av in seq:
+        yield op, av
+        for item in (av if isinstance(av, (tuple, list)) else (av,)):
+            if isinstance(item, sre_parse.SubPattern):
+                yield from _nodes(item)
+            elif isinstance(item, list):
+                for sub in item:
+                    if isinstance(sub, sre_parse.SubPattern):
+                        yield from _nodes(sub)
+
+
+def _rewrite_line_end(pattern, flags: int):
+    """Ganti setiap $ (AT_END) di parse tree dengan (?=\r*$), di tempat."""
+    data = pattern.data
+    for i, (op, av) in enumerate(data):
+        if op is sre_parse.AT and av is sre_parse.AT_END:
+            data[i] = sre_parse.parse(rb'(?=\r*$)', flags).data[0]
+            continue
+        for item in (av if isinstance(av, (tuple, list)) else (av,)):
+            if isinstance(item, sre_parse.SubPattern):
+                _rewrite_line_end(item, flags)
+            elif isinstance(item, list):
+                for sub in item:
+                    if isinstance(sub, sre_parse.SubPattern):
+                        _rewrite_line_end(sub, flags)
+
+
+def _whole_buffer_safe(op, av) -> bool:
+    """False untuk node yang bisa cocok per baris tetapi gagal di buffer utuh."""
+    if op is sre_parse.AT:
+        return av not in (sre_parse.AT_BEGINNING_STRING, sre_parse.AT_END_STRING)
+    if op is sre_parse.ASSERT_NOT:
+        return False
+    if op is sre_parse.ASSERT:
+        return av[0] >= 0  # lookbehind bisa melihat '\n' baris sebelumnya
+    return True
+
+
+class ByteDetector:
+    """
+    Pencari baris kandidat di buffer bytes (bytes, bytearray, mmap).
+
+    Dibangun dari daftar pattern regex str (pattern bawaan + ruleset).
+    every_line True bila ada pattern yang tidak aman; setiap baris
+    menjadi kandidat dan tidak ada penghematan (tetapi tetap benar).
+    """
+
+    def __init__(self, patterns: Sequence[str], flags: int = re.IGNORECASE):
+        # Pattern yang sama (bawaan dan ruleset) cukup dicari sekali
+        compiled = [compile_bytes(p, flags) for p in dict.fromkeys(patterns)]
+        self.every_line = any(c is None for c in compiled)
+        self.searchers: List[Tuple] = [c for c in compiled if c is not None]
+
+    def candidate_lines(self, buf, start: int = 0,
+                        end: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+        """
+        (awal, akhir) setiap baris kandidat di buf[start:end], urut offset.
+
+        start harus awal baris; akhir tidak termasuk '\\n'.
+        """
+        if end is None:
+            end = len(buf)
+        if self.every_line:
+            finders = [lambda pos: pos if pos < end else -1]
+        else:
+            finders = [_regex_finder(buf, end, anchor, verify)
+                       for anchor, verify in self.searchers]
+            finders.append(_escape_finder(buf, end))
+
+        def advance(find: Callable[[int], int], pos: int) -> int:
+            """Awal baris kandidat berikutnya mulai pos (end bila habis)."""
+            hit = find(pos)
+            if hit < 0:
+                return end
+            return buf.rfind(b'\n', pos, hit) + 1 or pos
+
+        nexts = [advance(find, start) for find in finders]
+        while True:
+            line = min(nexts)
+            if line >= end:
+                return
+            stop = buf.find(b'\n', line, end)
+            if stop < 0:
+                stop = end
+            yield line, stop
+            for k, pos in enumerate(nexts):
+                if pos == line:
+                    nexts[k] = advance(finders[k], stop + 1)
+
+
+def _regex_finder(buf, end: int, anchor, verify) -> Callable[[int], int]:
+    """Posisi match anchor pertama mulai pos (-1 bila tidak ada)."""
+    search = anchor.search
+    if verify is None:
+        def find(pos: int) -> int:
+            match = search(buf, pos, end)
+            return match.start() if match else -1
+        return find
+
+    check = verify.search
+
+    def find_verified(pos: int) -> int:
+        while True:
+            match = search(buf, pos, end)
+            if match is None:
+                return -1
+            hit = match.start()
+            line = buf.rfind(b'\n', pos, hit) + 1 or pos
+            stop = buf.find(b'\n', hit, end)
+            if stop < 0:
+                stop = end
+            if check(buf, line, stop):
+                return hit
+            pos = stop + 1
+    return find_verified
+
+
+def _escape_finder(buf, end: int) -> Callable[[int], int]:
+    """
+    Posisi byte ESCAPE pertama mulai pos.
+
+    Regex kelas karakter lambat (tanpa prefix), jadi setiap potongan
+    dicek dulu dengan bytes.translate (C); regex hanya dijalankan di
+    potongan yang memang memuat byte tersebut.
+    """
+    state = {'chunk_end': 0, 'dirty': False}
+
+    def find(pos: int) -> int:
+        while pos < end:
+            if pos >= state['chunk_end']:
+                state['chunk_end'] = min(end, pos + CHUNK)
+                state['dirty'] = bool(buf[pos:state['chunk_end']].translate(None, _PLAIN_BYTES))
+            if state['dirty']:
+                match = ESCAPE.search(buf, pos, state['chunk_end'])
+                if match:
+                    return match.start()
+            pos = state['chunk_end']
+        return -1
+    return find
+
+
+def count_lines(buf, start: int, end: int) -> int:
+    """Jumlah '\\n' di buf[start:end] (mmap tidak punya count())."""
+    if not isinstance(buf, mmap.mmap):
+        return buf.count(b'\n', start, end)
+    return sum(buf[pos:min(end, pos + CHUNK)].count(b'\n')
+               for pos in range(start, end, CHUNK))
+
+
+def scan_buffer(buf, engine, stats: dict, start: int = 0,
+                end: Optional[int] = None) -> Iterator[dict]:
+    """
+    Mode payload (satu payload per baris) atas buffer bytes/mmap.
+
+    Hanya baris kandidat yang di-decode dan dianalisis Engine, sehingga
+    verdict terdeteksi sama dengan logstream.scan_payload_lines; verdict
+    ALLOW untuk baris lain tidak dihasilkan. Setiap hasil memuat line
+    dan offset (byte) baris di buffer.
+
+    `stats`: lines = semua baris, records = baris di-decode, payloads =
+    payload tidak kosong yang dianalisis, detected.
+    """
+    if end is None:
+        end = len(buf)
+    lineno = 0
+    counted = start
+    for line, stop in engine.byte_detector.candidate_lines(buf, start, end):
+        lineno += count_lines(buf, counted, line)
+        counted = line
+        stats['records'] += 1
+        payload = buf[line:stop].rstrip(b'\r\n').decode('utf-8', errors='replace')
+        if not payload:
+            continue
+        stats['payloads'] += 1
+        result = engine.analyze_batch([payload])[0]
+        if result['detected']:
+            stats['detected'] += 1
+        result['line'] = lineno + 1
+        result['offset'] = line
+        result['client'] = '-'
+        yield result
+    lineno += count_lines(buf, counted, end)
+    # Baris terakhir tanpa '\n' tetap dihitung (seperti iterasi file)
+    if end > start and buf[end - 1:end] != b'\n':
+        lineno += 1
+    stats['lines'] = lineno
+
+
+def scan_file(path: str, engine, stats: dict, start: int = 0,
+              end: Optional[int] = None) -> Iterator[dict]:
+    """scan_buffer atas mmap file (read-only); start/end untuk potongan paralel."""
+    with open(path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # file kosong tidak bisa di-mmap
+            return
+        with mapped:
+            yield from scan_buffer(mapped, engine, stats, start, end)
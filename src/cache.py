@@ -0,0 +1,112 @@
+"""
+Verdict Cache untuk Mini-IDS
+============================
+Query string yang sama (health check, paginasi, token pencarian) muncul
+berulang kali di trafik produksi. Cache ini menyimpan verdict per
+payload yang sudah dinormalisasi sehingga payload berulang tidak perlu
+dianalisis ulang.
+
+- Key: hash blake2b (128 bit) dari payload ternormalisasi (+ scope,
+  mis. endpoint bila verdict bergantung padanya); memori per entri
+  tetap kecil berapa pun panjang payload.
+- Eviction: LRU di atas OrderedDict dengan ukuran maksimum.
+- Versi: cache terikat pada versi ruleset dan dikosongkan otomatis
+  bila ruleset berganti.
+- Thread: get/put/clear di bawah satu Lock, sehingga satu cache bisa
+  dipakai bersama oleh worker thread pool (juga tanpa GIL).
+"""
+
+import threading
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Optional
+
+
+def normalize_key(payload: str, casefold: bool = True, scope: Optional[str] = None) -> bytes:
+    """
+    Payload (+ scope) → key cache.
+
+    Semua pattern dikompilasi dengan re.IGNORECASE, jadi huruf besar/kecil
+    ASCII tidak mengubah verdict. Payload non-ASCII tidak di-lowercase
+    karena case folding Unicode regex tidak identik dengan str.lower().
+    scope (mis. endpoint) ikut di-hash dengan prefix panjang, sehingga
+    payload yang sama di scope berbeda tidak berbagi entri.
+    """
+    if casefold and payload.isascii():
+        payload = payload.lower()
+    h = blake2b(digest_size=16)
+    if scope is not None:
+        data = scope.encode('utf-8', 'surrogatepass')
+        h.update(len(data).to_bytes(4, 'big') + data)
+    h.update(payload.encode('utf-8', 'surrogatepass'))
+    return h.digest()
+
+
+class VerdictCache:
+    """
+    Cache LRU berukuran tetap: key → verdict (dict tanpa field 'payload').
+
+    Statistik hits/misses/evictions/invalidations dihitung di tempat.
+    """
+
+    def __init__(self, maxsize: int = 65536, version: str = ''):
+        if maxsize <= 0:
+            raise ValueError("maxsize harus > 0")
+        self.maxsize = maxsize
+        self.version = version
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: bytes) -> Optional[dict]:
+        data = self._data
+        with self._lock:
+            value = data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            data.move_to_end(key)
+            self.hits += 1
+        return value
+
+    def put(self, key: bytes, value: dict):
+        data = self._data
+        with self._lock:
+            data[key] = value
+            data.move_to_end(key)
+            if len(data) > self.maxsize:
+                data.popitem(last=False)
+                self.evictions += 1
+
+    def validate(self, version: str):
+        """Kosongkan cache bila versi ruleset berbeda dari saat diisi."""
+        if version != self.version:
+            self.clear()
+            self.version = version
+            self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict:
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'hit_rate': self.hit_rate,
+        }
@@ -0,0 +1,196 @@
+"""
+Tracing Eksekusi DFA
+====================
+Trace lama menyimpan satu nama state per karakter: payload 1 MB menjadi
+list sejuta string, padahal hampir semua langkah adalah self-loop
+(transisi gagal → state tetap). Tracer menentukan apa yang disimpan:
+
+    off          tanpa trace: loop CompiledDFA.run() biasa, tanpa biaya
+    full         satu state per langkah (bentuk lama, O(panjang input))
+    rle[:M]      run (state, jumlah langkah), maks M run (default 4096)
+    ring[:K]     K transisi terakhir yang mengubah state (default 32):
+                 (langkah, simbol, dari, ke)
+    sampled[:N]  satu dari N payload di-trace dengan rle, sisanya off
+                 (default 100)
+
+Selain full, memori trace dibatasi berapa pun panjang payload. rle dan
+ring dibangun dari CompiledDFA.changes(), yang hanya menghasilkan
+sesuatu saat state berubah. Field hasil (digabung ke simulate_dfa):
+
+    trace          list sesuai mode (None bila tidak di-trace)
+    trace_mode     nama mode
+    trace_dropped  run / transisi yang tidak disimpan karena batas
+    sampled        (mode sampled) payload ini di-trace atau tidak
+
+Spesifikasi string (parse_trace) sama dengan opsi --trace di main.py.
+"""
+
+import itertools
+from collections import deque
+from typing import List, Tuple
+
+DEFAULT_MAX_RUNS = 4096
+DEFAULT_RING = 32
+DEFAULT_SAMPLE = 100
+
+
+class Tracer:
+    """Mode off: hanya state akhir."""
+
+    mode = 'off'
+
+    def run(self, compiled, text) -> Tuple[int, dict]:
+        """Jalankan compiled atas text → (nomor state akhir, field trace)."""
+        return compiled.run(text), {'trace': None, 'trace_mode': self.mode}
+
+
+class FullTracer(Tracer):
+    """Satu nama state per langkah (len(text) + 1 entri)."""
+
+    mode = 'full'
+
+    def run(self, compiled, text) -> Tuple[int, dict]:
+        names = compiled.state_names
+        trace = compiled.run_trace(text)
+        return trace[-1], {'trace': [names[s] for s in trace], 'trace_mode': self.mode}
+
+
+class RleTracer(Tracer):
+    """
+    Trace run-length: [(state, jumlah langkah), ...].
+
+    Jumlah seluruh hitungan = len(text) + 1, sama dengan panjang trace
+    full (lihat expand_rle). Lebih dari max_runs run: run awal disimpan,
+    sisanya hanya dihitung di trace_dropped (state akhir tetap ada di
+    final_state).
+    """
+
+    mode = 'rle'
+
+    def __init__(self, max_runs: int = DEFAULT_MAX_RUNS):
+        if max_runs < 1:
+            raise ValueError("rle: batas run harus >= 1")
+        self.max_runs = max_runs
+
+    def run(self, compiled, text) -> Tuple[int, dict]:
+        names = compiled.state_names
+        limit = self.max_runs
+        runs = []
+        dropped = 0
+        state, since = compiled.start, 0
+        for step, nxt in compiled.changes(text):
+            if len(runs) < limit:
+                runs.append((names[state], step - since))
+            else:
+                dropped += 1
+            state, since = nxt, step
+        if len(runs) < limit:
+            runs.append((names[state], len(text) + 1 - since))
+        else:
+            dropped += 1
+        return state, {'trace': runs, 'trace_mode': self.mode, 'trace_dropped': dropped}
+
+
+class RingTracer(Tracer):
+    """K transisi terakhir yang mengubah state: (langkah, simbol, dari, ke)."""
+
+    mode = 'ring'
+
+    def __init__(self, size: int = DEFAULT_RING):
+        if size < 1:
+            raise ValueError("ring: ukuran harus >= 1")
+        self.size = size
+
+    def run(self, compiled, text) -> Tuple[int, dict]:
+        names = compiled.state_names
+        ring = deque(maxlen=self.size)
+        state = compiled.start
+        total = 0
+        for step, nxt in compiled.changes(text):
+            ring.append((step, state, nxt))
+            state = nxt
+            total += 1
+        trace = []
+        for step, src, dst in ring:
+            symbol = text[step - 1]
+            if isinstance(symbol, int):  # bytes / memoryview / mmap
+                symbol = chr(symbol)
+            trace.append((step, symbol, names[src], names[dst]))
+        return state, {'trace': trace, 'trace_mode': self.mode,
+                       'trace_dropped': total - len(trace)}
+
+
+class SampledTracer(Tracer):
+    """Satu dari every payload memakai inner, sisanya off."""
+
+    mode = 'sampled'
+
+    def __init__(self, every: int = DEFAULT_SAMPLE, inner: Tracer = None):
+        if every < 1:
+            raise ValueError("sampled: N harus >= 1")
+        self.every = every
+        self.inner = inner if inner is not None else RleTracer()
+        # next() pada itertools.count atomik; urutan antar thread tidak penting
+        self._counter = itertools.count()
+
+    def run(self, compiled, text) -> Tuple[int, dict]:
+        if next(self._counter) % self.every:
+            final, fields = Tracer.run(self, compiled, text)
+            fields['sampled'] = False
+            return final, fields
+        final, fields = self.inner.run(compiled, text)
+        fields['trace_mode'] = self.mode
+        fields['sampled'] = True
+        return final, fields
+
+
+TRACERS = {
+    'off': (Tracer, None),
+    'full': (FullTracer, None),
+    'rle': (RleTracer, DEFAULT_MAX_RUNS),
+    'ring': (RingTracer, DEFAULT_RING),
+    'sampled': (SampledTracer, DEFAULT_SAMPLE),
+}
+
+
+def parse_trace(spec: str) -> Tracer:
+    """'off' | 'full' | 'rle[:M]' | 'ring[:K]' | 'sampled[:N]' → Tracer."""
+    mode, _, arg = spec.strip().lower().partition(':')
+    if mode not in TRACERS:
+        raise ValueError(f"mode trace tidak dikenal: {spec!r} "
+                         f"(pilihan: {', '.join(TRACERS)})")
+    cls, default = TRACERS[mode]
+    if default is None:
+        if arg:
+            raise ValueError(f"mode trace {mode!r} tidak menerima argumen")
+        return cls()
+    try:
+        value = int(arg) if arg else default
+    except ValueError:
+        raise ValueError(f"argumen trace bukan angka: {spec!r}") from None
+    return cls(value)
+
+
+def expand_rle(runs: List[Tuple[str, int]]) -> List[str]:
+    """Trace rle → bentuk full (untuk pemeriksaan ekuivalensi)."""
+    return [state for state, count in runs for _ in range(count)]
+
+
+def format_trace(result: dict) -> str:
+    """Satu baris trace untuk output verbose."""
+    trace = result.get('trace')
+    mode = result.get('trace_mode', 'full')
+    if trace is None:
+        return "(tidak di-trace)" if mode == 'sampled' else "(trace off)"
+    if mode == 'full':
+        text = " → ".join(trace)
+    elif trace and len(trace[0]) == 2:  # rle (juga rle di dalam sampled)
+        text = " → ".join(f"{state}×{count}" for state, count in trace)
+    else:
+        text = ", ".join(f"#{step} {symbol!r}: {src}→{dst}" for step, symbol, src, dst in trace)
+        if not trace:
+            text = "(tidak ada perubahan state)"
+    dropped = result.get('trace_dropped', 0)
+    if dropped:
+        text += f" (+{dropped} tidak disimpan)"
+    return text
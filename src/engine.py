@@ -0,0 +1,531 @@
+"""
+Engine Mini-IDS
+===============
+Objek analisis berumur panjang: Lexer pattern, DFASimulator (regex
+terkompilasi, prefilter, automata) dan ruleset DSL dibangun sekali
+lalu dipakai ulang untuk setiap payload.
+
+Analisis bertingkat: payload tanpa karakter pemicu langsung ALLOW,
+Lexer/Parser hanya dijalankan untuk payload yang terdeteksi.
+
+Opsional: VerdictCache di depan pipeline (cache_size > 0) untuk payload
+yang berulang; cache dikosongkan setiap kali ruleset diganti. Metrics
+(metrics=Metrics()) mencatat latency per tahap dan hit per rule.
+byte_detector mencari baris kandidat langsung di buffer bytes/mmap
+(lihat bytescan.py). stream() memindai satu payload panjang per
+potongan tanpa menampungnya utuh (lihat regex_nfa.py).
+
+Opsional: Normalizer (normalizer=Normalizer()) di depan tier 0, DFA dan
+Lexer: percent-decoding, komentar inline, whitespace dan case dilipat
+dalam satu pass; span hasil dipetakan kembali ke payload mentah.
+
+Opsional: all_matches=True melaporkan semua rule (bawaan + ruleset) yang
+match beserta span di result['matches'], bukan hanya yang pertama.
+Tanpa all_matches, payload yang match beberapa rule bawaan dilaporkan
+dengan type/severity rule pertama menurut urutan deklarasi; dengan
+adaptive_order=True rule bawaan dievaluasi menurut urutan adaptif (lebih
+sedikit regex per payload) sehingga label itu bergantung pada trafik
+sebelumnya (lihat rule_order.py); verdict detected tidak berubah.
+
+Opsional: FingerprintTable (fingerprints=FingerprintTable.load()) sebagai
+pendapat kedua: setiap payload yang lolos tier 0 (dan tidak dikenal
+allowlist) di-tokenisasi sekali dan bentuk tokennya dicari di tabel
+fingerprint berbahaya (lihat fingerprint.py); hasilnya di
+result['fingerprint']. Kebijakan: bila DFA dan ruleset bersih tetapi
+fingerprint dikenal, hasil menjadi detected dengan type 'FINGERPRINT'
+dan action ALERT (seperti signature DSL ber-RESPONSE ALERT), bukan
+BLOCK, karena fingerprint tanpa pattern lebih rawan false positive.
+Token yang sama dipakai ulang oleh Parser di analyze().
+
+Opsional: ShapeAllowlist (allowlist=ShapeAllowlist.load(path)) setelah
+tier 0: payload yang bentuknya dikenal bersih untuk endpoint-nya
+langsung ALLOW tanpa DFA, ruleset, Lexer maupun Parser (lihat
+allowlist.py). Bentuk diambil dari teks ternormalisasi, jadi allowlist
+harus dipelajari dengan setelan Normalizer yang sama (ValueError bila
+berbeda).
+
+Opsional: vectorize=True menjalankan VectorPrefilter (NumPy bila ada,
+loop Python bila tidak) atas seluruh batch di analyze_batch; hanya
+baris yang tidak pasti bersih yang diperiksa per payload (lihat
+vector_prefilter.py).
+
+Thread: bagian terkompilasi (regex, prefilter, automata, ruleset,
+normalizer, allowlist) tidak berubah setelah dibangun dan state run
+DFA selalu lokal per panggilan, jadi verdict satu Engine bersama tetap
+benar dari banyak thread; hanya hitungan (tier_counts, metrics) yang
+bisa kehilangan increment. worker() membuat Engine per thread dengan
+hitungan sendiri yang digabung kembali lewat merge() (lihat
+parallel.py, executor='thread').
+"""
+
+import copy
+import threading
+from typing import Iterable, List, Optional
+
+from lexer import Lexer
+from parser import Parser
+from automata import DFASimulator
+from dfa_trace import format_trace
+from ruleset import Ruleset
+from cache import VerdictCache, normalize_key
+from bytescan import ByteDetector
+from metrics import Clock, Metrics
+from normalizer import Normalizer
+from fingerprint import FingerprintTable
+from allowlist import ShapeAllowlist, normalizer_spec
+from vector_prefilter import VectorPrefilter
+from regex_nfa import StreamRules, StreamScanner
+
+# Batas baris syarat tier 0 yang dicek satu per satu
+TIER0_MAX_ROWS = 32
+# Aksi untuk payload yang hanya dikenali fingerprint (DFA/ruleset bersih)
+FINGERPRINT_ACTION = 'ALERT'
+
+
+class Engine:
+    """
+    Pipeline deteksi yang dibangun sekali.
+
+    Pipeline: Input → [Normalizer] → Tier 0 (pemicu) → [Allowlist] → Tier 1 (DFA)
+              → Tier 2 (Lexer → Parser → AST [+ Fingerprint])
+
+    tier_counts mencatat jumlah payload yang mencapai setiap tier
+    (+ 'allowlisted' bila allowlist aktif).
+    """
+
+    def __init__(self, ruleset: Optional[Ruleset] = None, cache_size: int = 0,
+                 metrics: Optional[Metrics] = None,
+                 normalizer: Optional[Normalizer] = None, all_matches: bool = False,
+                 fingerprints: Optional[FingerprintTable] = None,
+                 allowlist: Optional[ShapeAllowlist] = None, vectorize: bool = False,
+                 adaptive_order: bool = False):
+        self.simulator = DFASimulator(adaptive=adaptive_order)
+        self.normalizer = normalizer
+        self.all_matches = all_matches
+        self.fingerprints = fingerprints
+        self.cache = VerdictCache(cache_size) if cache_size > 0 else None
+        self.metrics = metrics
+        if allowlist is not None and allowlist.normalizer != normalizer_spec(normalizer):
+            raise ValueError("allowlist dipelajari dengan setelan normalizer "
+                             f"{allowlist.normalizer or 'mati'!r}, engine memakai "
+                             f"{normalizer_spec(normalizer) or 'mati'!r}")
+        self.allowlist = allowlist
+        self.vectorize = vectorize
+        self.tier_counts = {'tier0': 0, 'tier1': 0, 'tier2': 0}
+        if allowlist is not None:
+            self.tier_counts['allowlisted'] = 0
+        self._merge_lock = threading.Lock()
+        self.ruleset = ruleset
+
+    def worker(self) -> 'Engine':
+        """
+        Engine untuk satu worker thread.
+
+        Bagian terkompilasi dan VerdictCache (ber-lock) dipakai bersama;
+        tier_counts, metrics dan urutan rule adaptif milik worker sendiri,
+        sehingga jalur verdict tidak menulis ke state yang sama dengan
+        thread lain. Hitungan dikembalikan ke engine ini lewat merge().
+        """
+        if self.vectorize:
+            self.vector_prefilter  # dibangun sekali, dipakai bersama
+        worker = copy.copy(self)
+        worker.simulator = self.simulator.worker()
+        worker.tier_counts = dict.fromkeys(self.tier_counts, 0)
+        if self.metrics is not None:
+            worker.metrics = Metrics()
+        return worker
+
+    def merge(self, worker: 'Engine'):
+        """Tambahkan tier_counts, metrics dan statistik rule dari worker()."""
+        with self._merge_lock:
+            for tier, count in worker.tier_counts.items():
+                self.tier_counts[tier] += count
+            if self.metrics is not None and worker.metrics is not None:
+                self.metrics.merge(worker.metrics)
+            self.simulator.rule_order.merge(worker.simulator.rule_order)
+
+    @property
+    def ruleset(self) -> Optional[Ruleset]:
+        return self._ruleset
+
+    @ruleset.setter
+    def ruleset(self, ruleset: Optional[Ruleset]):
+        """Ganti ruleset; verdict lama di cache otomatis tidak berlaku."""
+        self._ruleset = ruleset
+        self._byte_detector = None
+        self._stream_rules = None
+        self._vector_prefilter = None
+        # Lowercase key hanya aman bila tidak ada pattern case-sensitive
+        # dan normalizer (bila ada) juga melipat case: teks ternormalisasi
+        # dan pattern di hasil harus sama untuk semua payload satu key
+        self._casefold = (ruleset is None or not any(
+            '(?-i' in sig.pattern for sig in ruleset.signatures)) and (
+            self.normalizer is None or self.normalizer.casefold)
+        # Syarat karakter tier 0: gabungan pattern bawaan dan ruleset
+        rows = self.simulator.PREFILTER.trigger_rows
+        if ruleset is not None and rows is not None:
+            extra = ruleset.prefilter.trigger_rows
+            rows = list(dict.fromkeys(rows + extra)) if extra is not None else None
+        if rows is not None and len(rows) > TIER0_MAX_ROWS:
+            # Terlalu banyak baris: satu himpunan gabungan grup paling selektif
+            rows = [(frozenset().union(*(row[0] for row in rows)),)]
+        self.trigger_rows = rows
+        if self.cache is not None:
+            self.cache.validate(ruleset.version if ruleset is not None else '')
+
+    @property
+    def byte_detector(self) -> ByteDetector:
+        """Pencari baris kandidat bytes untuk pattern bawaan + ruleset (lazy)."""
+        if self._byte_detector is None:
+            patterns = [p for p, _, _ in self.simulator.SQL_PATTERNS]
+            if self._ruleset is not None:
+                patterns += [sig.pattern for sig in self._ruleset.signatures]
+            self._byte_detector = ByteDetector(patterns)
+        return self._byte_detector
+
+    @property
+    def vector_prefilter(self) -> VectorPrefilter:
+        """Prefilter batch untuk pattern bawaan + ruleset (lazy)."""
+        if self._vector_prefilter is None:
+            patterns = [p for p, _, _ in self.simulator.SQL_PATTERNS]
+            if self._ruleset is not None:
+                patterns += [sig.pattern for sig in self._ruleset.signatures]
+            self._vector_prefilter = VectorPrefilter(patterns)
+        return self._vector_prefilter
+
+    def stream(self) -> StreamScanner:
+        """
+        Scanner resumable untuk pattern bawaan + ruleset.
+
+        feed(chunk) per potongan (str atau bytes), lalu finish() →
+        detected, type, action, pattern, span. Berbeda dari analyze(),
+        rule yang dilaporkan adalah match yang selesai paling awal di
+        stream, bukan pattern bawaan lebih dulu. Normalizer tidak
+        dipakai: stream diperiksa apa adanya.
+        """
+        if self._stream_rules is None:
+            rules = [(p, {'type': t, 'action': 'BLOCK'})
+                     for p, t, _ in self.simulator.SQL_PATTERNS]
+            if self._ruleset is not None:
+                rules += [(sig.pattern, {'type': sig.name, 'action': sig.response})
+                          for sig in self._ruleset.signatures]
+            self._stream_rules = StreamRules(rules, empty={'action': 'ALLOW'})
+        return self._stream_rules.scanner()
+
+    def tier_stats(self) -> dict:
+        """tier_counts + persentase eskalasi ke tier berikutnya."""
+        counts = self.tier_counts
+        stats = dict(counts)
+        stats['escalation_tier1'] = counts['tier1'] / counts['tier0'] if counts['tier0'] else 0.0
+        stats['escalation_tier2'] = counts['tier2'] / counts['tier1'] if counts['tier1'] else 0.0
+        if 'allowlisted' in counts:
+            # Bagian payload lolos tier 0 yang tidak perlu sampai tier 1
+            reached = counts['allowlisted'] + counts['tier1']
+            stats['allowlist_rate'] = counts['allowlisted'] / reached if reached else 0.0
+        return stats
+
+    def analyze(self, payload: str, verbose: bool = False) -> dict:
+        """
+        Analisis satu payload secara bertingkat.
+
+        Tier 0: cek karakter pemicu (payload tanpa pemicu → ALLOW)
+        Tier 1: DFA check (+ ruleset DSL) [+ fingerprint: Lexer untuk
+                setiap payload lolos tier 0]
+        Tier 2: Parser (Lexer bila belum jalan), hanya untuk payload
+                terdeteksi atau bila output verbose diminta
+        """
+        if verbose:
+            return self._analyze_verbose(payload)
+
+        metrics = self.metrics
+        clock = metrics.clock() if metrics is not None else None
+        # Token dari langkah fingerprint (bila ada) dipakai ulang oleh Parser
+        lexed = [] if self.fingerprints is not None else None
+        if self.cache is not None:
+            result = self._cached_verdict(payload, clock, lexed=lexed)
+        else:
+            result = self._verdict(payload, clock=clock, lexed=lexed)
+        if result['detected']:
+            self.tier_counts['tier2'] += 1
+            if lexed:
+                tokens = lexed[0]
+            else:
+                tokens = Lexer(result.get('normalized', payload)).tokenize()
+                if clock is not None:
+                    clock.lap('lexer')
+            result['evidence'] = self._evidence(Parser(tokens).parse())
+            if clock is not None:
+                clock.lap('parser')
+        if metrics is not None:
+            metrics.record(payload, result, clock.elapsed())
+        return result
+
+    def _analyze_verbose(self, payload: str) -> dict:
+        """Pipeline lengkap dengan output per tahap (--verbose)."""
+        self.tier_counts['tier2'] += 1
+        text = payload
+
+        if self.normalizer is not None:
+            print("\n[0] NORMALISASI")
+            print("-" * 40)
+            text = self.normalizer.normalize(payload).text
+            print(f"Normalized: {text!r}")
+
+        # 1. Lexical Analysis
+        print("\n[1] LEXICAL ANALYSIS")
+        print("-" * 40)
+
+        tokens = Lexer(text).tokenize()
+
+        print(f"Tokens: {len(tokens)}")
+        for t in tokens:
+            if t.type.name != 'EOF':
+                print(f"  {t}")
+
+        # 2. Syntax Analysis (Parsing)
+        print("\n[2] SYNTAX ANALYSIS")
+        print("-" * 40)
+
+        ast = Parser(tokens, explain=True).parse()
+
+        print("AST:")
+        ast.print_tree()
+
+        # 3. DFA Check
+        print("\n[3] DFA SIMULATION")
+        print("-" * 40)
+
+        # Mode trace dari simulator (default rle: memori terbatas untuk payload panjang)
+        for kind in ('boolean', 'comment'):
+            sim = self.simulator.simulate_dfa(text, kind)
+            status = "ACCEPT" if sim['accepted'] else "reject"
+            print(f"{sim['dfa_name']}: {status} di {sim['final_state']} | {format_trace(sim)}")
+
+        result = self._verdict(payload, verbose=True)
+        if result['detected']:
+            result['evidence'] = self._evidence(ast)
+
+        if self.fingerprints is not None:
+            print("\n[4] FINGERPRINT")
+            print("-" * 40)
+            print(f"Segmen: {self.fingerprints.segments(tokens)}")
+            print(f"Dikenal: {result.get('fingerprint')}")
+        return result
+
+    @staticmethod
+    def _evidence(ast) -> Optional[str]:
+        """Nilai node serangan pertama di AST (None bila parser tidak mengenalinya)."""
+        for child in ast.children:
+            if child.node_type == 'SQL_INJECTION':
+                return child.value
+        return None
+
+    def analyze_batch(self, payloads: Iterable[str], endpoint: str = '') -> List[dict]:
+        """
+        Analisis banyak payload, hasil urut sesuai input.
+
+        Verdict hanya bergantung pada tier 0 dan 1, jadi Lexer/Parser
+        tidak dijalankan sama sekali. endpoint (path request) memilih
+        bentuk allowlist yang berlaku.
+
+        Dengan vectorize, baris yang pasti bersih ditandai sekaligus untuk
+        seluruh batch (tanpa normalizer dan metrics: prefilter memeriksa
+        payload mentah dan tidak mengukur per payload; tanpa fingerprints:
+        baris bersih pun tetap perlu di-fingerprint).
+        """
+        verdict = self._verdict if self.cache is None else self._cached_verdict
+        if (self.vectorize and self.normalizer is None and self.metrics is None
+                and self.fingerprints is None):
+            return self._vectorized_batch(verdict, list(payloads), endpoint)
+        if self.metrics is not None:
+            return [self._measured(verdict, payload, endpoint) for payload in payloads]
+        return [verdict(payload, endpoint=endpoint) for payload in payloads]
+
+    def _vectorized_batch(self, verdict, payloads: List[str], endpoint: str) -> List[dict]:
+        """VectorPrefilter untuk seluruh batch, verdict penuh hanya untuk sisanya."""
+        clean = self.vector_prefilter.clean(payloads)
+        self.tier_counts['tier0'] += sum(clean)
+        # Baris yang lolos prefilter batch juga lolos tier 0 (sinyalnya
+        # superset karakter pemicu), jadi tier 0 tidak diulang
+        return [self._allow(payload) if ok
+                else verdict(payload, endpoint=endpoint, prefiltered=True)
+                for payload, ok in zip(payloads, clean)]
+
+    def _allow(self, payload: str) -> dict:
+        """Hasil ALLOW kosong (belum ada tier yang mendeteksi)."""
+        result = {
+            'payload': payload,
+            'detected': False,
+            'type': None,
+            'action': 'ALLOW'
+        }
+        if self.all_matches:
+            result['matches'] = []
+        return result
+
+    def _measured(self, verdict, payload: str, endpoint: str = '') -> dict:
+        """Satu verdict dengan pengukuran Metrics."""
+        clock = self.metrics.clock()
+        result = verdict(payload, clock=clock, endpoint=endpoint)
+        self.metrics.record(payload, result, clock.elapsed())
+        return result
+
+    def _cached_verdict(self, payload: str, clock: Optional[Clock] = None,
+                        endpoint: str = '', prefiltered: bool = False,
+                        lexed: Optional[list] = None) -> dict:
+        """
+        _verdict lewat VerdictCache (key = hash payload ternormalisasi,
+        + endpoint bila allowlist aktif karena bentuk dikenal per endpoint).
+        """
+        cache = self.cache
+        key = normalize_key(payload, self._casefold,
+                            endpoint if self.allowlist is not None else None)
+        cached = cache.get(key)
+        if clock is not None:
+            clock.lap('cache')
+        if cached is not None:
+            result = cached.copy()
+            result['payload'] = payload
+            if 'matches' in result:
+                # List baru per hit (pemanggil boleh mengubahnya); tanpa
+                # normalizer pattern diambil dari payload ini (key melipat case)
+                result['matches'] = [
+                    dict(m, pattern=payload[m['span'][0]:m['span'][1]])
+                    if self.normalizer is None else dict(m)
+                    for m in result['matches']
+                ]
+            return result
+        result = self._verdict(payload, clock=clock, endpoint=endpoint,
+                               prefiltered=prefiltered, lexed=lexed)
+        # Simpan salinan: pemanggil (logstream) menambah field ke hasil
+        entry = result.copy()
+        if 'matches' in entry:
+            entry['matches'] = [dict(m) for m in entry['matches']]
+        cache.put(key, entry)
+        return result
+
+    def _tier0_clean(self, payload: str) -> bool:
+        """True bila tidak ada baris syarat karakter yang terpenuhi."""
+        present = set(payload)
+        for row in self.trigger_rows:
+            for chars in row:
+                if present.isdisjoint(chars):
+                    break
+            else:
+                return False
+        return True
+
+    def _verdict(self, payload: str, verbose: bool = False,
+                 clock: Optional[Clock] = None, endpoint: str = '',
+                 prefiltered: bool = False, lexed: Optional[list] = None) -> dict:
+        """
+        Tier 0 [+ allowlist] + DFA check (+ ruleset DSL bila ada)
+        [+ fingerprint] → dict hasil.
+
+        prefiltered: payload sudah lolos VectorPrefilter, tier 0 dilewati.
+        lexed (opsional): token hasil langkah fingerprint ditambahkan ke
+        list ini agar pemanggil tidak men-tokenisasi ulang.
+
+        clock (opsional) mencatat latency setiap tahap dan rule yang match.
+        Dengan normalizer, hasil juga memuat normalized dan span (rentang
+        match di payload mentah). Dengan all_matches, hasil memuat matches
+        (type, action, pattern, span) untuk setiap rule yang match.
+        """
+        result = self._allow(payload)
+
+        normalized = None
+        text = payload
+        if self.normalizer is not None:
+            normalized = self.normalizer.normalize(payload)
+            text = result['normalized'] = normalized.text
+            result['span'] = None
+            if clock is not None:
+                clock.lap('normalize')
+
+        tiers = self.tier_counts
+        tiers['tier0'] += 1
+        clean = (not prefiltered and self.trigger_rows is not None and text.isascii()
+                 and self._tier0_clean(text))
+        if clock is not None:
+            clock.lap('tier0')
+        if clean:
+            if verbose:
+                print("Tier 0: tidak ada karakter pemicu → ALLOW")
+            return result
+
+        if self.allowlist is not None:
+            # Bentuk dari teks yang diperiksa DFA (escape sudah di-decode)
+            known = self.allowlist.known(text, endpoint)
+            if clock is not None:
+                clock.lap('allowlist')
+            if known:
+                tiers['allowlisted'] += 1
+                result['allowlisted'] = True
+                if verbose:
+                    print("Allowlist: bentuk parameter dikenal bersih → ALLOW")
+                return result
+        tiers['tier1'] += 1
+
+        all_matches = self.all_matches
+        dfa_result = self.simulator.check_sql_injection(text, all_matches)
+        if clock is not None:
+            clock.lap('dfa')
+
+        if verbose:
+            print(f"DFA Result: {dfa_result}")
+
+        # Mode all-matches: ruleset tetap diperiksa walau pattern bawaan match
+        rule_result = None
+        if self.ruleset is not None and (all_matches or not dfa_result['detected']):
+            rule_result = self.ruleset.check(text, all_matches)
+            if clock is not None:
+                clock.lap('ruleset')
+            if verbose:
+                print(f"Ruleset Result: {rule_result}")
+
+        # 4. Result
+        if dfa_result['detected']:
+            result['detected'] = True
+            result['type'] = dfa_result['type']
+            result['action'] = 'BLOCK'
+            if normalized is not None:
+                result['span'] = normalized.raw_span(*dfa_result['span'])
+            if clock is not None:
+                clock.hit(dfa_result['rule'])
+        elif rule_result is not None and rule_result['detected']:
+            if clock is not None:
+                clock.hit(f"dsl:{rule_result['signature']}")
+            result['detected'] = True
+            result['type'] = rule_result['signature']
+            result['action'] = rule_result['response']
+            if normalized is not None:
+                result['span'] = normalized.raw_span(*rule_result['span'])
+
+        if self.fingerprints is not None:
+            # Pendapat kedua juga untuk payload yang bersih menurut DFA/ruleset
+            tokens = Lexer(text).tokenize()
+            if lexed is not None:
+                lexed.append(tokens)
+            shape = result['fingerprint'] = self.fingerprints.match(tokens)
+            if clock is not None:
+                clock.lap('fingerprint')
+            if shape is not None and not result['detected']:
+                result['detected'] = True
+                result['type'] = 'FINGERPRINT'
+                result['action'] = FINGERPRINT_ACTION
+                if clock is not None:
+                    clock.hit(f"fp:{shape}")
+            if verbose:
+                print(f"Fingerprint: {shape}")
+
+        if all_matches:
+            matches = [(m['type'], 'BLOCK', m) for m in dfa_result['matches']]
+            if rule_result is not None:
+                matches += [(m['signature'], m['response'], m) for m in rule_result['matches']]
+            result['matches'] = [
+                {'type': kind, 'action': action, 'pattern': m['pattern'],
+                 'span': normalized.raw_span(*m['span']) if normalized is not None else m['span']}
+                for kind, action, m in sorted(matches, key=lambda entry: entry[2]['span'])
+            ]
+
+        return result
@@ -0,0 +1,211 @@
+"""
+Token Fingerprint (gaya libinjection)
+=====================================
+Setiap segmen parameter (dipisah '&' atau '?') diringkas menjadi
+"bentuk" token pendek lalu dicari di tabel fingerprint berbahaya:
+
+    id=1' OR '1'='1    →  segmen "1' OR '1'='1"  →  1s&s1
+
+Huruf bentuk per token:
+
+    &  OR / AND          k  keyword SQL lain     t  always-true (1=1)
+    s  quote / string    c  komentar (-- / #)     o  operator (= < > + - * / %)
+    1  angka             n  identifier            , . ( ) ;  karakter itu sendiri
+    u  karakter lain
+
+Prefiks nama parameter ("id=") dibuang, token berurutan dengan bentuk
+sama dilipat menjadi satu, komentar mengakhiri segmen (sisanya hanya
+komentar bagi SQL), dan hanya MAX_SHAPE huruf pertama yang dipakai.
+
+Tabel dibangun dari corpus serangan dikurangi fingerprint corpus
+bersih, lalu disimpan sebagai file teks (satu fingerprint per baris).
+Setelah Lexer berjalan, klasifikasi hanya butuh satu lookup set per
+segmen, berapa pun jumlah signature.
+
+Bangun tabel:
+    python fingerprint.py ../signatures/attacks.txt ../signatures/benign.txt \\
+        -o ../signatures/fingerprints.txt
+"""
+
+import argparse
+import os
+import sys
+from typing import Iterable, List, Optional
+
+from lexer import Lexer, TokenStream, TokenType
+
+MAX_SHAPE = 5
+
+DEFAULT_TABLE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'signatures', 'fingerprints.txt'
+)
+
+# Kode TokenType → huruf bentuk (None: tergantung nilai token)
+LETTERS = [None] * (len(TokenType) + 1)
+for _code, _letter in ((TokenType.ALWAYS_TRUE, 't'), (TokenType.SQL_COMMENT, 'c'),
+                       (TokenType.SQL_QUOTE, 's'), (TokenType.STRING, 's'),
+                       (TokenType.SQL_OPERATOR, 'o'), (TokenType.NUMBER, '1'),
+                       (TokenType.IDENTIFIER, 'n')):
+    LETTERS[_code.value] = _letter
+LOGIC = {'or', 'and'}
+SEPARATORS = {'&', '?'}
+PUNCTUATION = {',', '.', '(', ')', ';'}
+ARITHMETIC = {'+', '-', '*', '/', '%'}
+
+KEYWORD = TokenType.SQL_KEYWORD.value
+SPECIAL = TokenType.SPECIAL_CHAR.value
+IDENTIFIER = TokenType.IDENTIFIER.value
+OPERATOR = TokenType.SQL_OPERATOR.value
+
+
+def _shape(code: int, value: str) -> str:
+    """Huruf bentuk untuk keyword, karakter khusus dan karakter lain."""
+    if code == KEYWORD:
+        return '&' if value.lower() in LOGIC else 'k'
+    if value in PUNCTUATION:
+        return value
+    if value in ARITHMETIC:
+        return 'o'
+    return 'u'
+
+
+def _next_separator(tokens: TokenStream, index: int, count: int) -> int:
+    """Indeks token separator berikutnya mulai dari index (count bila tidak ada)."""
+    types, source, starts = tokens.types, tokens.source, tokens.starts
+    while True:
+        try:
+            index = types.index(SPECIAL, index, count)
+        except ValueError:
+            return count
+        if source[starts[index]] in SEPARATORS:
+            return index
+        index += 1
+
+
+def fingerprints(tokens: TokenStream, max_shape: int = MAX_SHAPE) -> List[str]:
+    """Fingerprint setiap segmen parameter (urut kemunculan, tanpa duplikat)."""
+    types, source, starts, ends = tokens.types, tokens.source, tokens.starts, tokens.ends
+    letters = LETTERS
+    result = []
+    count = len(types) - 1  # token terakhir selalu EOF
+    index = 0
+    while index < count:
+        if (types[index] == IDENTIFIER and index + 1 < count and types[index + 1] == OPERATOR
+                and source[starts[index + 1]] == '='):
+            # Prefiks "nama=" bukan bagian nilai parameter
+            index += 2
+        shape = []
+        last = None
+        while index < count:
+            code = types[index]
+            letter = letters[code]
+            if letter is None:
+                value = source[starts[index]:ends[index]]
+                if code == SPECIAL and value in SEPARATORS:
+                    break
+                letter = _shape(code, value)
+            if letter != last:
+                shape.append(letter)
+                last = letter
+                if letter == 'c' or len(shape) >= max_shape:
+                    # Bentuk lengkap (komentar menelan sisa segmen)
+                    index = _next_separator(tokens, index + 1, count)
+                    break
+            index += 1
+        if shape:
+            text = ''.join(shape)
+            if text not in result:
+                result.append(text)
+        index += 1  # lewati separator
+    return result
+
+
+def fingerprint_payload(payload: str, max_shape: int = MAX_SHAPE) -> List[str]:
+    """Tokenisasi + fingerprints() untuk satu payload."""
+    return fingerprints(Lexer(payload).tokenize(), max_shape)
+
+
+class FingerprintTable:
+    """
+    Himpunan fingerprint berbahaya (lookup O(1) per segmen).
+
+    File tabel: satu fingerprint per baris, baris '#' adalah komentar.
+    """
+
+    def __init__(self, shapes: Iterable[str] = (), max_shape: int = MAX_SHAPE):
+        self.shapes = frozenset(shapes)
+        self.max_shape = max_shape
+
+    def __len__(self):
+        return len(self.shapes)
+
+    def __contains__(self, shape: str) -> bool:
+        return shape in self.shapes
+
+    def segments(self, tokens: TokenStream) -> List[str]:
+        """Fingerprint setiap segmen dengan panjang bentuk tabel ini."""
+        return fingerprints(tokens, self.max_shape)
+
+    def match(self, tokens: TokenStream) -> Optional[str]:
+        """Fingerprint pertama yang ada di tabel, atau None."""
+        shapes = self.shapes
+        for shape in fingerprints(tokens, self.max_shape):
+            if shape in shapes:
+                return shape
+        return None
+
+    @classmethod
+    def build(cls, attacks: Iterable[str], benign: Iterable[str] = (),
+              max_shape: int = MAX_SHAPE) -> 'FingerprintTable':
+        """Fingerprint corpus serangan yang tidak pernah muncul di corpus bersih."""
+        malicious = {s for p in attacks for s in fingerprint_payload(p, max_shape)}
+        clean = {s for p in benign for s in fingerprint_payload(p, max_shape)}
+        return cls(malicious - clean, max_shape)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_TABLE) -> 'FingerprintTable':
+        max_shape = MAX_SHAPE
+        shapes = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.rstrip('\n')
+                if line.startswith('# max_shape='):
+                    max_shape = int(line.split('=', 1)[1])
+                elif line and not line.startswith('#'):
+                    shapes.append(line)
+        return cls(shapes, max_shape)
+
+    def save(self, path: str, comment: str = ''):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("# Mini-IDS token fingerprints (dibangun oleh fingerprint.py)\n")
+            if comment:
+                f.write(f"# {comment}\n")
+            f.write(f"# max_shape={self.max_shape}\n")
+            for shape in sorted(self.shapes):
+                f.write(shape + '\n')
+
+
+def _read_lines(path: str) -> List[str]:
+    with open(path, encoding='utf-8') as f:
+        return [line.rstrip('\n') for line in f if line.strip() and not line.startswith('#')]
+
+
+# ============ BUILD ============
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Bangun tabel fingerprint token')
+    parser.add_argument('attacks', help='File payload serangan (satu per baris)')
+    parser.add_argument('benign', nargs='?', help='File payload bersih (satu per baris)')
+    parser.add_argument('-o', '--output', default=DEFAULT_TABLE)
+    parser.add_argument('-n', '--max-shape', type=int, default=MAX_SHAPE)
+    args = parser.parse_args()
+
+    attacks = _read_lines(args.attacks)
+    benign = _read_lines(args.benign) if args.benign else []
+    table = FingerprintTable.build(attacks, benign, args.max_shape)
+    table.save(args.output, f"{len(attacks)} payload serangan, {len(benign)} payload bersih")
+
+    missed = [p for p in attacks if not any(s in table for s in fingerprint_payload(p, args.max_shape))]
+    print(f"{len(table)} fingerprint → {args.output}")
+    print(f"serangan tanpa fingerprint dikenal: {len(missed)}/{len(attacks)}", file=sys.stderr)
+    for payload in missed:
+        print(f"  {payload}", file=sys.stderr)
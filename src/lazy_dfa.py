@@ -0,0 +1,335 @@
+"""
+Lazy DFA (gaya RE2) untuk Signature DSL
+=======================================
+`re` adalah backtracking engine: pattern seperti (a*)*b atau signature
+buatan pengguna bisa dibuat eksponensial oleh payload tertentu.
+LazyDFA menjalankan semua signature sekaligus di atas Program NFA
+(regex_nfa.py) dalam waktu linear:
+
+    state DFA = himpunan pc NFA yang menunggu karakter + konteks
+                karakter sebelumnya (awal / huruf / newline / lain)
+
+State dan transisi dibangun saat pertama kali dilewati (subset
+construction lazy) lalu di-cache; setiap karakter paling banyak
+membangun satu transisi O(ukuran program). Cache dibatasi: bila
+penuh, seluruh cache dibuang (flush) dan dibangun ulang dari state
+sekarang. Bila satu payload memicu terlalu banyak flush (state
+meledak), sisa payload disimulasikan sebagai NFA tanpa cache, tetap
+O(ukuran program) per karakter. Jadi waktu terburuk per payload
+O(len(payload) × ukuran program), tanpa bergantung pada isi payload.
+
+LazyDFA adalah DFA (automata.py): state yang sudah dibangun terdaftar
+di states/transitions (nama q0, q1, ...) dan start() mengembalikan run
+yang step()/is_accepting()-nya berjalan lazy, sehingga bagian automaton
+yang terpakai bisa diperiksa seperti DFA demo lain.
+
+Satu LazyDFA aman dipakai bersama oleh banyak thread: posisi scan
+disimpan di variabel lokal (atau LazyDFARun), generasi cache yang sudah
+dibangun tidak pernah diubah kecuali menambah transisi di bawah _lock,
+dan flush membuat generasi baru alih-alih mengosongkan yang lama.
+"""
+
+import re
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from automata import DFA, DFARun
+from regex_nfa import (ASSERT, CHAR, JMP, MATCH, SPLIT, Program, UnsupportedPattern,
+                       _check, _is_word, search)
+
+# Konteks karakter sebelumnya (cukup untuk ^, \A, \b, \B, ^ MULTILINE)
+CTX_START, CTX_WORD, CTX_NEWLINE, CTX_OTHER = range(4)
+# Wakil setiap konteks untuk _check()
+CTX_CHAR = (None, 'a', '\n', ' ')
+
+# Batas cache (jumlah transisi) dan flush per payload sebelum fallback NFA
+MAX_CACHE = 10_000
+MAX_FLUSHES = 4
+
+
+def _context(ch: str) -> int:
+    if _is_word(ch):
+        return CTX_WORD
+    return CTX_NEWLINE if ch == '\n' else CTX_OTHER
+
+
+class _Cache:
+    """Satu generasi cache: key state → id, baris transisi per state."""
+
+    __slots__ = ('ids', 'keys', 'rows', 'final', 'size')
+
+    def __init__(self):
+        self.ids: Dict[Tuple[Tuple[int, ...], int], int] = {}
+        self.keys: List[Tuple[Tuple[int, ...], int]] = []
+        # rows[s][ch] = (state tujuan, bitmask pattern yang match sebelum ch)
+        self.rows: List[Dict[str, Tuple[int, int]]] = []
+        self.final: List[Optional[int]] = []
+        self.size = 0
+
+
+class LazyDFA(DFA):
+    """
+    DFA yang dibangun lazy dari Program NFA beberapa pattern.
+
+    patterns yang tidak bisa dijadikan NFA (lookaround, backreference,
+    $ tanpa MULTILINE) tidak ikut automaton; indeksnya ada di
+    unsupported dan pemanggil harus memeriksanya sendiri.
+
+    scan(text) → bitmask indeks pattern (urut input) yang match di mana
+    pun dalam text. locate(index, text) → span match pertama pattern
+    tersebut dengan semantik re.search.
+    """
+
+    def __init__(self, patterns: Sequence[str], flags: int = re.IGNORECASE,
+                 max_cache: int = MAX_CACHE, max_flushes: int = MAX_FLUSHES,
+                 name: str = "Lazy_DFA"):
+        super().__init__(name)
+        self.patterns = list(patterns)
+        self.flags = flags
+        self.max_cache = max_cache
+        self.max_flushes = max_flushes
+
+        # Setiap pattern di-parse sekali: program validasi dipakai ulang
+        # untuk locate() dan digabung (link) menjadi program automaton;
+        # CharTest yang sama dibangun sekali untuk semua pattern
+        pool = {}
+        self._single: Dict[int, Program] = {}
+        unsupported = []
+        for i, pattern in enumerate(self.patterns):
+            try:
+                self._single[i] = Program([pattern], flags, pool)
+            except UnsupportedPattern:
+                unsupported.append(i)
+        self.unsupported = frozenset(unsupported)
+        self.program = Program.link(list(self._single.values()))
+        # Indeks pattern asli → indeks di program (urut supported)
+        self._parts = {i: k for k, i in enumerate(self._single)}
+        # Bit MATCH program (urut supported) → bit indeks pattern asli
+        self._bits = [1 << i for i in self._single]
+        self._reset()
+
+    def _reset(self):
+        """Cache dan state DFA kosong (juga setelah unpickle)."""
+        self.stats = {'states': 0, 'transitions': 0, 'flushes': 0, 'nfa_fallbacks': 0}
+        self._lock = threading.Lock()
+        self._starts: Dict[Tuple[int, Optional[str]], Tuple[int, frozenset]] = {}
+        self._cache = _Cache()
+        self._intern(self._cache, ((), CTX_START))
+
+    def __getstate__(self):
+        # Program gabungan (tabel tes karakter sudah terhitung) ikut
+        # di-pickle; cache transisi tidak, dan program per pattern
+        # diambil ulang dengan part() saat locate() membutuhkannya
+        state = self.__dict__.copy()
+        for key in ('stats', '_lock', '_starts', '_cache'):
+            del state[key]
+        state.update(states={}, transitions={}, accepting_states=set(), start_state=None,
+                     _single={})
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._reset()
+
+    # --- cache ---
+
+    def _intern(self, cache: _Cache, key) -> int:
+        sid = cache.ids.get(key)
+        if sid is None:
+            sid = cache.ids[key] = len(cache.keys)
+            cache.keys.append(key)
+            cache.rows.append({})
+            cache.final.append(None)
+            cache.size += 1
+            self.stats['states'] += 1
+            self.add_state(f"q{sid}", is_start=(sid == 0))
+        return sid
+
+    def _flush(self) -> _Cache:
+        """Cache baru (generasi lama tetap utuh untuk scan yang sedang jalan)."""
+        self._cache = cache = _Cache()
+        self.states.clear()
+        self.transitions.clear()
+        self.accepting_states.clear()
+        self._intern(cache, ((), CTX_START))
+        self.stats['flushes'] += 1
+        return cache
+
+    def _add(self, cache: _Cache, sid: int, ch: str) -> Tuple[_Cache, int, int]:
+        """Bangun transisi (sid, ch); bisa memindahkan scan ke generasi cache baru."""
+        key = cache.keys[sid]
+        target, mask = self._transition(key, ch)
+        with self._lock:
+            current = self._cache
+            if current is not cache or current.size >= self.max_cache:
+                if current.size >= self.max_cache:
+                    current = self._flush()
+                sid = self._intern(current, key)
+            nid = self._intern(current, target)
+            current.rows[sid][ch] = (nid, mask)
+            current.size += 1
+            self.stats['transitions'] += 1
+            self.add_transition(f"q{sid}", ch, f"q{nid}")
+        return current, nid, mask
+
+    # --- subset construction ---
+
+    def _closure(self, pcs: Tuple[int, ...], prev: Optional[str],
+                 nxt: Optional[str]) -> Tuple[int, List[int]]:
+        """Closure epsilon dari pcs → (mask MATCH, pc CHAR)."""
+        ops, arg1, arg2 = self.program.ops, self.program.arg1, self.program.arg2
+        bits = self._bits
+        if not bits:
+            return 0, []
+        seen = set()
+        chars = []
+        mask = 0
+        stack = list(pcs)
+        while stack:
+            pc = stack.pop()
+            if pc in seen:
+                continue
+            seen.add(pc)
+            op = ops[pc]
+            if op == CHAR:
+                chars.append(pc)
+            elif op == SPLIT:
+                stack.append(arg2[pc])
+                stack.append(arg1[pc])
+            elif op == JMP:
+                stack.append(arg1[pc])
+            elif op == ASSERT:
+                if _check(arg1[pc], prev, nxt):
+                    stack.append(arg2[pc])
+            elif op == MATCH:
+                mask |= bits[arg1[pc]]
+        return mask, chars
+
+    def _start_step(self, ctx: int, ch: Optional[str]) -> Tuple[int, frozenset]:
+        """
+        Langkah dari pc 0 (awal match baru, ada di setiap state) untuk
+        karakter ch (None = akhir input) → (mask MATCH, pc sesudah ch).
+        Closure pc 0 mencakup seluruh rantai pattern, jadi hasilnya
+        di-cache per (konteks, ch) untuk ch Latin-1 (paling banyak
+        4 × 257 entri) agar transisi baru hanya sebanding pcs state.
+        """
+        key = (ctx, ch)
+        hit = self._starts.get(key)
+        if hit is not None:
+            return hit
+        mask, chars = self._closure((0,), CTX_CHAR[ctx], ch)
+        if ch is None:
+            step = frozenset()
+        else:
+            tests, arg1, arg2 = self.program.tests, self.program.arg1, self.program.arg2
+            step = frozenset(arg2[pc] for pc in chars if tests[arg1[pc]](ch))
+        hit = (mask, step)
+        if ch is None or ord(ch) < 256:
+            self._starts[key] = hit
+        return hit
+
+    def _transition(self, key, ch: str) -> Tuple[Tuple[Tuple[int, ...], int], int]:
+        pcs, ctx = key
+        mask, chars = self._closure(pcs, CTX_CHAR[ctx], ch)
+        start_mask, nxt = self._start_step(ctx, ch)
+        tests, arg1, arg2 = self.program.tests, self.program.arg1, self.program.arg2
+        nxt = nxt.union(arg2[pc] for pc in chars if tests[arg1[pc]](ch))
+        return (tuple(sorted(nxt)), _context(ch)), mask | start_mask
+
+    def _final_mask(self, cache: _Cache, sid: int) -> int:
+        mask = cache.final[sid]
+        if mask is None:
+            pcs, ctx = cache.keys[sid]
+            mask = self._closure(pcs, CTX_CHAR[ctx], None)[0] | self._start_step(ctx, None)[0]
+            cache.final[sid] = mask
+            if mask:
+                with self._lock:
+                    if cache is self._cache:
+                        self.accepting_states.add(f"q{sid}")
+        return mask
+
+    # --- simulasi ---
+
+    def scan(self, text: str) -> int:
+        """Bitmask indeks pattern (yang didukung) yang match di text."""
+        if not self._bits:
+            return 0
+        cache = self._cache
+        rows = cache.rows
+        matched = 0
+        flushes = 0
+        s = 0
+        for i, ch in enumerate(text):
+            hit = rows[s].get(ch)
+            if hit is None:
+                previous = cache
+                cache, s, mask = self._add(cache, s, ch)
+                rows = cache.rows
+                # Generasi berganti (flush oleh scan ini atau thread lain)
+                if cache is not previous:
+                    flushes += 1
+                    if flushes > self.max_flushes:
+                        with self._lock:
+                            self.stats['nfa_fallbacks'] += 1
+                        return matched | mask | self._scan_nfa(text, i + 1, cache.keys[s])
+            else:
+                s, mask = hit
+            if mask:
+                matched |= mask
+        return matched | self._final_mask(cache, s)
+
+    def _scan_nfa(self, text: str, start: int, key) -> int:
+        """Simulasi NFA tanpa cache untuk sisa text (fallback state meledak)."""
+        matched = 0
+        for i in range(start, len(text)):
+            key, mask = self._transition(key, text[i])
+            matched |= mask
+        pcs, ctx = key
+        return (matched | self._closure(pcs, CTX_CHAR[ctx], None)[0]
+                | self._start_step(ctx, None)[0])
+
+    def locate(self, index: int, text: str) -> Optional[Tuple[int, int]]:
+        """Span match pertama pattern ke-index (semantik re.search, linear)."""
+        program = self._single.get(index)
+        if program is None:
+            program = self._single[index] = self.program.part(self._parts[index])
+        match = search(program, text)
+        return match[1:] if match else None
+
+    # --- antarmuka DFA ---
+
+    def start(self) -> 'LazyDFARun':
+        return LazyDFARun(self)
+
+
+class LazyDFARun(DFARun):
+    """Run step-by-step di atas LazyDFA (transisi dibangun bila belum ada)."""
+
+    __slots__ = ('_state', 'matched')
+
+    def __init__(self, dfa: LazyDFA):
+        super().__init__(dfa)
+        self.reset()
+
+    def reset(self):
+        super().reset()
+        self._state = (self.dfa._cache, 0)
+        self.matched = 0
+
+    def step(self, symbol: str) -> bool:
+        """Satu karakter (transisi dibangun bila belum ada)."""
+        cache, s = self._state
+        hit = cache.rows[s].get(symbol)
+        if hit is None:
+            cache, s, mask = self.dfa._add(cache, s, symbol)
+        else:
+            s, mask = hit
+        self.matched |= mask
+        self._state = (cache, s)
+        self.current_state = f"q{s}"
+        return True
+
+    def is_accepting(self) -> bool:
+        """Ada pattern yang match pada input sejauh ini (termasuk akhir input)."""
+        cache, s = self._state
+        return bool(self.matched | self.dfa._final_mask(cache, s))
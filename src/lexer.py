@@ -5,9 +5,10 @@ DFA-based tokenizer untuk Boolean-based dan Comment-based SQL Injection.
 """
 
 import re
+from array import array
 from dataclasses import dataclass
 from enum import Enum, auto
-from typing import List, Optional
+from typing import Iterator, List, Optional, Pattern
 
 
 class TokenType(Enum):
@@ -40,6 +41,88 @@ class Token:
         return f"Token({self.type.name}, '{self.value}')"
 
 
+# Kode TokenType (nilai enum, 1..n) → TokenType
+TYPE_BY_CODE = [None] + list(TokenType)
+
+
+class TokenStream:
+    """
+    Token stream ringkas: tipe dan offset disimpan di array paralel.
+
+    types[i] adalah kode TokenType (array 'B'), starts[i]/ends[i] offset
+    token di source (array 'I'). Nilai token di-slice dari source hanya
+    saat dibutuhkan. Indexing/iterasi menghasilkan objek Token biasa,
+    sehingga stream bisa dipakai di tempat List[Token].
+    """
+
+    __slots__ = ('source', 'types', 'starts', 'ends')
+
+    def __init__(self, source: str, types: array, starts: array, ends: array):
+        self.source = source
+        self.types = types
+        self.starts = starts
+        self.ends = ends
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.types)))]
+        start = self.starts[index]
+        return Token(TYPE_BY_CODE[self.types[index]],
+                     self.source[start:self.ends[index]], start)
+
+    def __iter__(self) -> Iterator[Token]:
+        source = self.source
+        for code, start, end in zip(self.types, self.starts, self.ends):
+            yield Token(TYPE_BY_CODE[code], source[start:end], start)
+
+    def type_at(self, index: int) -> TokenType:
+        return TYPE_BY_CODE[self.types[index]]
+
+    def value_at(self, index: int) -> str:
+        return self.source[self.starts[index]:self.ends[index]]
+
+    def find(self, token_type: TokenType, start: int = 0) -> int:
+        """Indeks token pertama bertipe token_type mulai dari start, atau -1."""
+        try:
+            return self.types.index(token_type.value, start)
+        except ValueError:
+            return -1
+
+    @property
+    def nbytes(self) -> int:
+        """Ukuran data array (tanpa source)."""
+        return sum(a.itemsize * len(a) for a in (self.types, self.starts, self.ends))
+
+
+def _build_master_pattern(token_patterns) -> Pattern:
+    r"""
+    Gabungkan semua TOKEN_PATTERNS menjadi satu alternation bernama.
+
+    Alternation regex mencoba cabang dari kiri ke kanan, sama seperti
+    loop lama yang mencoba pattern satu per satu, sehingga urutan
+    prioritas token tetap sama. Grup ke-i diberi nama ``T{i}``.
+
+    Lexer lama mencocokkan pada ``input[position:]``, sehingga ``\b``
+    di awal pattern selalu bernilai benar (awal string). Pada pencocokan
+    in-place ``pattern.match(text, pos)`` karakter sebelum ``pos`` ikut
+    dilihat, jadi ``\b`` di awal pattern dibuang agar hasilnya identik.
+    """
+    branches = []
+    for i, (_, pattern) in enumerate(token_patterns):
+        if pattern.startswith(r'\b'):
+            pattern = pattern[2:]
+        branches.append(f'(?P<T{i}>{pattern})')
+    return re.compile('|'.join(branches), re.IGNORECASE)
+
+
+def _group_codes(master: Pattern, group_types: dict) -> dict:
+    """Nomor grup bernama T{i} → kode TokenType (untuk match.lastindex)."""
+    return {master.groupindex[name]: tt.value for name, tt in group_types.items()}
+
+
 class Lexer:
     """
     DFA-based Lexical Analyzer untuk SQL Injection.
@@ -78,67 +161,74 @@ class Lexer:
         (TokenType.SPECIAL_CHAR, r'[&?+\-*/%,.]'),
     ]
     
+    # Scanner single-pass: satu regex untuk semua token
+    MASTER_PATTERN = _build_master_pattern(TOKEN_PATTERNS)
+    GROUP_TYPES = {f'T{i}': tt for i, (tt, _) in enumerate(TOKEN_PATTERNS)}
+    # match.lastindex (grup bernama terluar) → kode TokenType
+    INDEX_CODES = _group_codes(MASTER_PATTERN, GROUP_TYPES)
+    
     def __init__(self, input_text: str):
         """Inisialisasi lexer dengan input text."""
         self.input = input_text
         self.position = 0
-        self.tokens: List[Token] = []
-        
-        # Compile regex patterns
-        self.compiled_patterns = [
-            (tt, re.compile(p, re.IGNORECASE)) 
-            for tt, p in self.TOKEN_PATTERNS
-        ]
+        self.tokens: Optional[TokenStream] = None
     
-    def tokenize(self) -> List[Token]:
+    def tokenize(self) -> TokenStream:
         """
         Proses tokenisasi menggunakan DFA.
         
+        Satu finditer atas master pattern; karakter di celah antar match
+        tidak cocok dengan pattern mana pun dan menjadi token UNKNOWN.
+        
         Returns:
-            List of Token
+            TokenStream (urutan Token, diakhiri EOF)
         """
-        self.tokens = []
-        self.position = 0
+        text = self.input
+        index_codes = self.INDEX_CODES
+        whitespace = TokenType.WHITESPACE.value
+        unknown = TokenType.UNKNOWN.value
+        types = array('B')
+        starts = array('I')
+        ends = array('I')
+        add_type, add_start, add_end = types.append, starts.append, ends.append
+        pos = 0
+        
+        for match in self.MASTER_PATTERN.finditer(text):
+            start, end = match.span()
+            # Unknown character
+            while pos < start:
+                add_type(unknown)
+                add_start(pos)
+                pos += 1
+                add_end(pos)
+            code = index_codes[match.lastindex]
+            # Skip whitespace
+            if code != whitespace:
+                add_type(code)
+                add_start(start)
+                add_end(end)
+            pos = end
         
-        while self.position < len(self.input):
-            token = self._match_token()
-            
-            if token:
-                # Skip whitespace
-                if token.type != TokenType.WHITESPACE:
-                    self.tokens.append(token)
-            else:
-                # Unknown character
-                self.tokens.append(Token(
-                    TokenType.UNKNOWN, 
-                    self.input[self.position], 
-                    self.position
-                ))
-                self.position += 1
+        length = len(text)
+        while pos < length:
+            add_type(unknown)
+            add_start(pos)
+            pos += 1
+            add_end(pos)
         
         # Add EOF
-        self.tokens.append(Token(TokenType.EOF, '', self.position))
+        add_type(TokenType.EOF.value)
+        add_start(pos)
+        add_end(pos)
+        self.position = pos
+        self.tokens = TokenStream(text, types, starts, ends)
         return self.tokens
     
-    def _match_token(self) -> Optional[Token]:
-        """Match satu token dari posisi saat ini."""
-        remaining = self.input[self.position:]
-        
-        for token_type, pattern in self.compiled_patterns:
-            match = pattern.match(remaining)
-            if match:
-                value = match.group(0)
-                token = Token(token_type, value, self.position)
-                self.position += len(value)
-                return token
-        
-        return None
-    
     def get_token_summary(self) -> dict:
         """Ringkasan token yang ditemukan."""
         summary = {}
-        for token in self.tokens:
-            name = token.type.name
+        for code in (self.tokens.types if self.tokens is not None else ()):
+            name = TYPE_BY_CODE[code].name
             summary[name] = summary.get(name, 0) + 1
         return summary
 
@@ -0,0 +1,202 @@
+"""
+Streaming Log Ingestion untuk Mini-IDS
+======================================
+Memindai access log web server (combined log format atau JSON lines)
+sebagai pipeline generator:
+
+    baca baris → parse request line → URL-decode query → analisis → verdict
+
+Setiap tahap hanya memegang satu baris, sehingga memori tetap konstan
+untuk file berukuran berapa pun. Mode 'bytes' (satu payload per baris)
+memindai file lewat mmap dan hanya mendecode baris kandidat
+(bytescan.py).
+"""
+
+import json
+import re
+import sys
+import time
+from typing import Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from bytescan import scan_file
+
+# Buffer baca besar: lebih sedikit syscall untuk file multi-GB
+BUFFER_SIZE = 1 << 20
+# Baris per blok analyze_batch di mode batch dengan prefilter vektor
+VECTOR_BATCH = 4096
+
+# host ident user [waktu] "request" status bytes ["referer" "user-agent"]
+COMBINED_LOG = re.compile(
+    rb'^(\S+) \S+ \S+ \[[^\]]*\] "((?:[^"\\]|\\.)*)" (\d{3}|-) (\S+)'
+)
+
+# Field JSON yang biasa berisi request line / target
+JSON_REQUEST_KEYS = ('request', 'request_line')
+JSON_TARGET_KEYS = ('uri', 'url', 'request_uri', 'path')
+
+
+def read_lines(source: str, buffer_size: int = BUFFER_SIZE) -> Iterator[bytes]:
+    """Baca baris mentah dari file atau stdin ('-')."""
+    if source == '-':
+        yield from sys.stdin.buffer
+        return
+    with open(source, 'rb', buffering=buffer_size) as f:
+        yield from f
+
+
+def parse_record(line: bytes) -> Optional[Tuple[str, str]]:
+    """
+    Ambil (client, request target) dari satu baris log.
+
+    Returns:
+        None bila baris tidak dikenali.
+    """
+    line = line.strip()
+    if not line:
+        return None
+
+    if line.startswith(b'{'):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(record, dict):
+            return None
+        client = str(record.get('remote_addr') or record.get('client') or '-')
+        for key in JSON_REQUEST_KEYS:
+            if isinstance(record.get(key), str):
+                return client, _request_target(record[key])
+        for key in JSON_TARGET_KEYS:
+            if isinstance(record.get(key), str):
+                return client, record[key]
+        return None
+
+    match = COMBINED_LOG.match(line)
+    if not match:
+        return None
+    request = match.group(2).decode('utf-8', errors='replace')
+    return match.group(1).decode('ascii', errors='replace'), _request_target(request)
+
+
+def _request_target(request: str) -> str:
+    """'GET /a?b=1 HTTP/1.1' → '/a?b=1'."""
+    parts = request.split(' ')
+    return parts[1] if len(parts) >= 2 else parts[0]
+
+
+def extract_payloads(target: str) -> List[str]:
+    """URL-decode query string menjadi payload 'nama=nilai' per parameter."""
+    _, sep, query = target.partition('?')
+    if not sep or not query:
+        return []
+    return [f"{name}={value}" for name, value in
+            parse_qsl(query, keep_blank_values=True, errors='replace')]
+
+
+def scan_lines(lines: Iterable[bytes], engine, stats: dict) -> Iterator[dict]:
+    """
+    Pipeline generator: satu verdict per parameter yang dianalisis.
+
+    `stats` diperbarui di tempat (lines, records, payloads, detected).
+    """
+    for lineno, line in enumerate(lines, 1):
+        stats['lines'] = lineno
+        record = parse_record(line)
+        if record is None:
+            continue
+        stats['records'] += 1
+        client, target = record
+        payloads = extract_payloads(target)
+        if not payloads:
+            continue
+        stats['payloads'] += len(payloads)
+        for result in engine.analyze_batch(payloads, target.partition('?')[0]):
+            if result['detected']:
+                stats['detected'] += 1
+            result['line'] = lineno
+            result['client'] = client
+            yield result
+
+
+def scan_payload_lines(lines: Iterable[bytes], engine, stats: dict) -> Iterator[dict]:
+    """
+    Mode batch: setiap baris adalah satu payload mentah.
+
+    Dengan engine.vectorize, payload dianalisis per blok VECTOR_BATCH
+    baris agar prefilter batch bekerja atas banyak baris sekaligus.
+    """
+    size = VECTOR_BATCH if engine.vectorize else 1
+    block = []
+    for lineno, line in enumerate(lines, 1):
+        stats['lines'] = lineno
+        payload = line.rstrip(b'\r\n').decode('utf-8', errors='replace')
+        if not payload:
+            continue
+        stats['records'] += 1
+        stats['payloads'] += 1
+        block.append((lineno, payload))
+        if len(block) >= size:
+            yield from _analyze_block(block, engine, stats)
+            block = []
+    if block:
+        yield from _analyze_block(block, engine, stats)
+
+
+def _analyze_block(block: List[Tuple[int, str]], engine, stats: dict) -> Iterator[dict]:
+    results = engine.analyze_batch([payload for _, payload in block])
+    for (lineno, _), result in zip(block, results):
+        if result['detected']:
+            stats['detected'] += 1
+        result['line'] = lineno
+        result['client'] = '-'
+        yield result
+
+
+SCANNERS = {'log': scan_lines, 'payload': scan_payload_lines}
+
+
+def new_stats() -> dict:
+    return {'lines': 0, 'records': 0, 'payloads': 0, 'detected': 0}
+
+
+def verdict_fields(result: dict) -> tuple:
+    """Field output: (line, client, action, type, payload)."""
+    return (result['line'], result['client'], result['action'],
+            result['type'] or '-', result['payload'])
+
+
+def format_fields(fields: tuple) -> str:
+    """Satu baris output (TSV): line, client, action, type, payload."""
+    line, client, action, attack_type, payload = fields
+    return f"{line}\t{client}\t{action}\t{attack_type}\t{payload!r}"
+
+
+def format_verdict(result: dict) -> str:
+    return format_fields(verdict_fields(result))
+
+
+def run_stream(source: str, engine, show_all: bool = False, out=sys.stdout,
+               err=sys.stderr, mode: str = 'log') -> dict:
+    """Pindai log, tulis verdict, lalu cetak ringkasan + lines/s ke stderr."""
+    stats = new_stats()
+    start = time.perf_counter()
+
+    if mode == 'bytes':
+        results = scan_file(source, engine, stats)
+    else:
+        results = SCANNERS[mode](read_lines(source), engine, stats)
+    for result in results:
+        if show_all or result['detected']:
+            out.write(format_verdict(result) + '\n')
+
+    print_summary(stats, time.perf_counter() - start, err)
+    return stats
+
+
+def print_summary(stats: dict, elapsed: float, err=sys.stderr):
+    """Ringkasan akhir scan (ke stderr)."""
+    rate = stats['lines'] / elapsed if elapsed > 0 else 0.0
+    err.write(f"[stream] {stats['lines']} baris, {stats['records']} request, "
+              f"{stats['payloads']} parameter, {stats['detected']} terdeteksi "
+              f"dalam {elapsed:.2f} s ({rate:,.0f} baris/s)\n")
@@ -12,10 +12,32 @@ Komponen:
 - Interpreter: DSL interpreter
 """
 
-from lexer import Lexer
-from parser import Parser
-from automata import DFASimulator
+from engine import Engine
+from metrics import Metrics
+from normalizer import Normalizer
+from fingerprint import DEFAULT_TABLE, FingerprintTable
+from allowlist import ShapeAllowlist, normalizer_spec
+from dfa_trace import parse_trace
+from vector_prefilter import HAS_NUMPY
+from logstream import run_stream
+from parallel import run_parallel_stream
+from server import parse_address, serve
+import asyncio
+from ruleset import load_ruleset, RulesetError
 import argparse
+import json
+import sys
+
+# Engine dibangun sekali dan dipakai ulang oleh analyze()
+_engine = None
+
+
+def get_engine() -> Engine:
+    """Engine default (dibangun saat pertama kali dipakai)."""
+    global _engine
+    if _engine is None:
+        _engine = Engine()
+    return _engine
 
 
 def print_banner():
@@ -35,57 +57,33 @@ def analyze(payload: str, verbose: bool = False) -> dict:
     
     Pipeline: Input → Lexer → Parser → AST → Semantic → Result
     """
-    result = {
-        'payload': payload,
-        'detected': False,
-        'type': None,
-        'action': 'ALLOW'
-    }
-    
-    # 1. Lexical Analysis
-    if verbose:
-        print("\n[1] LEXICAL ANALYSIS")
-        print("-" * 40)
-    
-    lexer = Lexer(payload)
-    tokens = lexer.tokenize()
-    
-    if verbose:
-        print(f"Tokens: {len(tokens)}")
-        for t in tokens:
-            if t.type.name != 'EOF':
-                print(f"  {t}")
-    
-    # 2. Syntax Analysis (Parsing)
-    if verbose:
-        print("\n[2] SYNTAX ANALYSIS")
-        print("-" * 40)
-    
-    parser = Parser(tokens)
-    ast = parser.parse()
-    
-    if verbose:
-        print("AST:")
-        ast.print_tree()
-    
-    # 3. DFA Check
-    if verbose:
-        print("\n[3] DFA SIMULATION")
-        print("-" * 40)
-    
-    dfa = DFASimulator()
-    dfa_result = dfa.check_sql_injection(payload)
-    
-    if verbose:
-        print(f"DFA Result: {dfa_result}")
-    
-    # 4. Result
-    if dfa_result['detected']:
-        result['detected'] = True
-        result['type'] = dfa_result['type']
-        result['action'] = 'BLOCK'
-    
-    return result
+    return get_engine().analyze(payload, verbose)
+
+
+def print_engine_stats(engine: Engine, out=sys.stderr):
+    """Ringkasan tier analisis dan VerdictCache (bila aktif)."""
+    tiers = engine.tier_stats()
+    print(f"[tier] tier0 {tiers['tier0']}, tier1 {tiers['tier1']} "
+          f"({tiers['escalation_tier1']:.1%}), tier2 {tiers['tier2']}", file=out)
+    if 'allowlist_rate' in tiers:
+        print(f"[allowlist] {tiers['allowlisted']} payload dilewati "
+              f"({tiers['allowlist_rate']:.1%} dari payload lolos tier 0)", file=out)
+    rules = engine.simulator.rule_order.stats()
+    print(f"[rules] {rules['avg_evaluated']:.2f} rule dievaluasi per payload tier 1, "
+          f"urutan {rules['order']}", file=out)
+    if engine.cache is None:
+        return
+    st = engine.cache.stats()
+    print(f"[cache] {st['hits']} hit, {st['misses']} miss, {st['evictions']} evict "
+          f"({st['hit_rate']:.1%} hit rate, {st['size']}/{st['maxsize']} entri)", file=out)
+
+
+def print_metrics(engine: Engine, fmt: str, out=sys.stderr):
+    """Snapshot metrics (JSON atau Prometheus text)."""
+    if fmt == 'prometheus':
+        out.write(engine.metrics.prometheus(engine))
+    else:
+        out.write(json.dumps(engine.metrics.snapshot(engine), indent=2) + '\n')
 
 
 def print_result(result: dict):
@@ -94,12 +92,24 @@ def print_result(result: dict):
     print("HASIL ANALISIS")
     print("=" * 50)
     print(f"Payload: {result['payload']}")
+    if result.get('normalized') not in (None, result['payload']):
+        print(f"Normalized: {result['normalized']}")
     print("-" * 50)
     
     if result['detected']:
         print("⚠️  STATUS: BERBAHAYA")
         print(f"🔍 TIPE: {result['type']}")
         print(f"🚨 AKSI: {result['action']}")
+        if result.get('evidence'):
+            print(f"🧩 BUKTI: {result['evidence']}")
+        if result.get('span'):
+            start, end = result['span']
+            print(f"📍 RAW: {result['payload'][start:end]!r} [{start}:{end}]")
+        if 'fingerprint' in result:
+            print(f"🧬 FINGERPRINT: {result['fingerprint'] or '- (tidak dikenal)'}")
+        for match in result.get('matches', []):
+            start, end = match['span']
+            print(f"   • {match['type']} ({match['action']}): {match['pattern']!r} [{start}:{end}]")
     else:
         print("✅ STATUS: AMAN")
         print("✅ AKSI: ALLOW")
@@ -172,12 +182,150 @@ def main():
                        help='Analisis satu payload')
     parser.add_argument('-v', '--verbose', action='store_true',
                        help='Output detail')
+    parser.add_argument('-r', '--rules', type=str,
+                       help='File signature DSL tambahan (mis. signatures/rules.dsl)')
+    parser.add_argument('-s', '--stream', type=str, metavar='FILE|-',
+                       help='Pindai access log (combined / JSON lines)')
+    parser.add_argument('-b', '--batch', type=str, metavar='FILE|-',
+                       help='Analisis file berisi satu payload per baris')
+    parser.add_argument('--all', action='store_true',
+                       help='Mode stream/batch: tampilkan juga verdict ALLOW')
+    parser.add_argument('--mmap', action='store_true',
+                       help='Mode --batch: pindai file lewat mmap, hanya baris '
+                            'kandidat yang di-decode')
+    parser.add_argument('--vectorize', action='store_true',
+                       help='Mode --batch: prefilter per blok baris (NumPy bila '
+                            'terpasang, loop Python bila tidak)')
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                       help='Jumlah proses/thread untuk --stream/--batch, '
+                            'atau thread/proses executor untuk --serve (default: 1)')
+    parser.add_argument('--serve', type=str, metavar='[HOST:]PORT',
+                       help='Jalankan HTTP inspection service (POST /analyze)')
+    parser.add_argument('--executor', choices=['thread', 'process'],
+                       help='Executor analisis: --serve (default: thread), '
+                            '--stream/--batch dengan -w > 1 (default: process)')
+    parser.add_argument('--concurrency', type=int, default=64,
+                       help='Mode --serve: batas analisis bersamaan (default: 64)')
+    parser.add_argument('--cache', type=int, default=0, metavar='N',
+                       help='Cache verdict LRU untuk N payload (default: 0 = mati)')
+    parser.add_argument('--stats', choices=['json', 'prometheus'],
+                       help='Aktifkan metrics dan cetak snapshot ke stderr di akhir')
+    parser.add_argument('--normalize', type=int, nargs='?', const=2, metavar='DEPTH',
+                       help='Normalisasi payload sebelum deteksi: URL-decode DEPTH kali '
+                            '(default: 2), komentar /**/, whitespace, case')
+    parser.add_argument('--fingerprints', type=str, nargs='?', const=DEFAULT_TABLE,
+                       metavar='FILE',
+                       help='Cocokkan fingerprint token dengan tabel (default: '
+                            'signatures/fingerprints.txt) sebagai pendapat kedua')
+    parser.add_argument('--allowlist', type=str, metavar='FILE',
+                       help='Allowlist bentuk parameter bersih (dari allowlist.py); '
+                            'bentuk dikenal langsung ALLOW')
+    parser.add_argument('--trace', type=str, default='rle', metavar='MODE',
+                       help='Trace DFA untuk --verbose: off, full, rle[:M], ring[:K], '
+                            'sampled[:N] (default: rle)')
+    parser.add_argument('--matches', action='store_true',
+                       help='Laporkan semua rule yang match beserta span (-p/-i, --serve)')
+    parser.add_argument('--adaptive-rules', action='store_true',
+                       help='Urutkan rule bawaan menurut hit dan biaya (lebih sedikit '
+                            'regex per payload; label multi-match ikut trafik)')
     
     args = parser.parse_args()
+    if args.normalize is not None and args.normalize < 0:
+        parser.error('--normalize: DEPTH harus >= 0')
+    try:
+        tracer = parse_trace(args.trace)
+    except ValueError as e:
+        parser.error(f'--trace: {e}')
+    if args.serve:
+        try:
+            address = parse_address(args.serve)
+        except ValueError as e:
+            parser.error(f'--serve: {e}')
+    scan_source = args.stream or args.batch
+    
+    # Output stream berupa TSV; banner tidak dicetak agar bisa di-pipe
+    if not scan_source and not args.serve:
+        print_banner()
     
-    print_banner()
+    global _engine
+    ruleset = None
+    if args.rules:
+        try:
+            ruleset = load_ruleset(args.rules)
+        except (OSError, RulesetError) as e:
+            print(f"❌ Gagal memuat ruleset: {e}")
+            sys.exit(1)
+    # Service selalu mengukur (endpoint /metrics); CLI hanya dengan --stats
+    metrics = Metrics() if args.stats or args.serve else None
+    normalizer = Normalizer(args.normalize) if args.normalize is not None else None
+    fingerprints = None
+    if args.fingerprints:
+        try:
+            fingerprints = FingerprintTable.load(args.fingerprints)
+        except (OSError, ValueError) as e:
+            print(f"❌ Gagal memuat tabel fingerprint: {e}")
+            sys.exit(1)
+    allowlist = None
+    if args.allowlist:
+        try:
+            allowlist = ShapeAllowlist.load(args.allowlist)
+        except (OSError, ValueError) as e:
+            print(f"❌ Gagal memuat allowlist: {e}")
+            sys.exit(1)
+        version = ruleset.version if ruleset is not None else ''
+        if allowlist.version != version:
+            # Bentuk dipelajari dengan ruleset lain: bisa meloloskan signature baru
+            print("⚠️  Allowlist dibangun untuk ruleset lain, diabaikan "
+                  "(bangun ulang dengan allowlist.py)", file=sys.stderr)
+            allowlist = None
+        elif allowlist.normalizer != normalizer_spec(normalizer):
+            # Bentuk dihitung dari teks ternormalisasi: setelan harus sama
+            print("⚠️  Allowlist dibangun dengan setelan --normalize lain, diabaikan "
+                  "(bangun ulang dengan allowlist.py --normalize)", file=sys.stderr)
+            allowlist = None
+    _engine = Engine(ruleset=ruleset, cache_size=args.cache, metrics=metrics,
+                     normalizer=normalizer, all_matches=args.matches,
+                     fingerprints=fingerprints, allowlist=allowlist,
+                     vectorize=args.vectorize, adaptive_order=args.adaptive_rules)
+    _engine.simulator.tracer = tracer
+    if args.vectorize and not HAS_NUMPY:
+        print("[batch] NumPy tidak terpasang; prefilter batch memakai loop Python",
+              file=sys.stderr)
     
-    if args.test:
+    if args.serve:
+        host, port = address
+        try:
+            asyncio.run(serve(host, port, get_engine(), args.concurrency,
+                              args.executor or 'thread', args.workers, args.rules))
+        except KeyboardInterrupt:
+            pass
+    elif scan_source:
+        mode = 'log' if args.stream else 'payload'
+        if args.mmap and mode == 'payload':
+            if (scan_source == '-' or args.all or normalizer is not None
+                    or fingerprints is not None):
+                # mmap butuh file biasa; --all butuh verdict setiap baris;
+                # baris kandidat dicari di bytes mentah (belum dinormalisasi);
+                # fingerprint bisa ALERT untuk baris tanpa kandidat
+                print("[stream] --mmap diabaikan untuk stdin / --all / --normalize "
+                      "/ --fingerprints", file=sys.stderr)
+            else:
+                mode = 'bytes'
+        if args.workers > 1 and scan_source == '-':
+            print("[stream] stdin tidak bisa dibagi per offset; memakai 1 proses",
+                  file=sys.stderr)
+        try:
+            if args.workers > 1 and scan_source != '-':
+                run_parallel_stream(scan_source, args.workers, rules_path=args.rules,
+                                    show_all=args.all, mode=mode, engine=get_engine(),
+                                    executor=args.executor or 'process')
+            else:
+                run_stream(scan_source, get_engine(), show_all=args.all, mode=mode)
+            print_engine_stats(get_engine())
+        except OSError as e:
+            print(f"❌ Gagal membaca input: {e}", file=sys.stderr)
+            sys.exit(1)
+    elif args.test:
         run_tests()
     elif args.interactive:
         interactive_mode()
@@ -187,6 +335,9 @@ def main():
     else:
         run_tests()
 
+    if args.stats and not args.serve:
+        print_metrics(get_engine(), args.stats)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,194 @@
+"""
+Metrics untuk Mini-IDS
+======================
+Instrumentasi hot path: histogram latency per tahap (cache, tier0, dfa,
+ruleset, lexer, parser, total), hit per rule dan per tipe serangan,
+jumlah verdict, serta distribusi ukuran payload.
+
+Engine hanya mengukur bila diberi objek Metrics (Engine(metrics=...));
+tanpa itu hot path hanya menambah satu cek ``is None`` per tahap.
+
+Export:
+    Metrics.snapshot()    dict (JSON)
+    Metrics.prometheus()  Prometheus text exposition format 0.0.4
+"""
+
+import time
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Optional, Sequence
+
+# Batas bucket (detik) untuk latency per tahap dan (byte) untuk ukuran payload
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4,
+                   5e-4, 1e-3, 2.5e-3, 1e-2, 1e-1)
+SIZE_BUCKETS = (16, 64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+PREFIX = 'miniids'
+
+
+class Histogram:
+    """Histogram bucket tetap (semantik 'le' Prometheus)."""
+
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # + bucket +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other: 'Histogram'):
+        for i, c in enumerate(other.counts):
+            self.counts[i] += c
+        self.sum += other.sum
+        self.count += other.count
+
+    def cumulative(self):
+        """Pasangan (le, jumlah kumulatif), diakhiri '+Inf'."""
+        total = 0
+        for bound, c in zip(self.bounds + ('+Inf',), self.counts):
+            total += c
+            yield bound, total
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Perkiraan kuantil (batas atas bucket)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return bound if bound != '+Inf' else self.bounds[-1]
+        return self.bounds[-1]
+
+    def to_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'buckets': {str(le): n for le, n in self.cumulative()},
+            'p50': self.quantile(0.5),
+            'p99': self.quantile(0.99),
+        }
+
+
+class Clock:
+    """Stopwatch per payload: lap(stage) mencatat waktu sejak lap sebelumnya."""
+
+    __slots__ = ('metrics', 'start', 'last')
+
+    def __init__(self, metrics: 'Metrics'):
+        self.metrics = metrics
+        self.start = self.last = time.perf_counter()
+
+    def lap(self, stage: str):
+        now = time.perf_counter()
+        self.metrics.observe(stage, now - self.last)
+        self.last = now
+
+    def hit(self, rule: str):
+        self.metrics.rule_hits[rule] += 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+
+class Metrics:
+    """Kumpulan metrik satu Engine (bisa di-merge antar proses worker)."""
+
+    def __init__(self):
+        self.stages: Dict[str, Histogram] = {}
+        self.payload_size = Histogram(SIZE_BUCKETS)
+        self.rule_hits: Counter = Counter()
+        self.attack_types: Counter = Counter()
+        self.verdicts: Counter = Counter()
+
+    def clock(self) -> Clock:
+        return Clock(self)
+
+    def observe(self, stage: str, seconds: float):
+        hist = self.stages.get(stage)
+        if hist is None:
+            hist = self.stages[stage] = Histogram(LATENCY_BUCKETS)
+        hist.observe(seconds)
+
+    def record(self, payload: str, result: dict, seconds: Optional[float] = None):
+        """Catat satu verdict: ukuran payload, aksi, tipe, dan latency total."""
+        self.payload_size.observe(len(payload))
+        self.verdicts[result['action']] += 1
+        if result['detected']:
+            self.attack_types[result['type']] += 1
+        if seconds is not None:
+            self.observe('total', seconds)
+
+    def merge(self, other: 'Metrics'):
+        for stage, hist in other.stages.items():
+            if stage not in self.stages:
+                self.stages[stage] = Histogram(hist.bounds)
+            self.stages[stage].merge(hist)
+        self.payload_size.merge(other.payload_size)
+        self.rule_hits.update(other.rule_hits)
+        self.attack_types.update(other.attack_types)
+        self.verdicts.update(other.verdicts)
+
+    def snapshot(self, engine=None) -> dict:
+        """Snapshot JSON; engine opsional menambah tier dan statistik cache."""
+        data = {
+            'stages': {stage: hist.to_dict() for stage, hist in sorted(self.stages.items())},
+            'payload_size_bytes': self.payload_size.to_dict(),
+            'rule_hits': dict(self.rule_hits.most_common()),
+            'attack_types': dict(self.attack_types.most_common()),
+            'verdicts': dict(self.verdicts),
+        }
+        if engine is not None:
+            data['tiers'] = engine.tier_stats()
+            if engine.cache is not None:
+                data['cache'] = engine.cache.stats()
+        return data
+
+    def prometheus(self, engine=None) -> str:
+        """Prometheus text exposition format."""
+        lines = []
+
+        def histogram(name: str, help_text: str, hists: Dict[str, Histogram], label: str):
+            lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}_{name} histogram")
+            for key, hist in hists.items():
+                base = f'{label}="{_escape(key)}",' if label else ''
+                for le, n in hist.cumulative():
+                    lines.append(f'{PREFIX}_{name}_bucket{{{base}le="{le}"}} {n}')
+                suffix = f'{{{base[:-1]}}}' if base else ''
+                lines.append(f"{PREFIX}_{name}_sum{suffix} {hist.sum!r}")
+                lines.append(f"{PREFIX}_{name}_count{suffix} {hist.count}")
+
+        def counter(name: str, help_text: str, values: dict, label: str):
+            lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {PREFIX}_{name} counter")
+            for key, n in values.items():
+                lines.append(f'{PREFIX}_{name}{{{label}="{_escape(str(key))}"}} {n}')
+
+        histogram('stage_latency_seconds', 'Latency per tahap analisis',
+                  dict(sorted(self.stages.items())), 'stage')
+        histogram('payload_size_bytes', 'Ukuran payload yang dianalisis',
+                  {'': self.payload_size}, '')
+        counter('rule_hits_total', 'Match per rule (pattern bawaan atau signature DSL)',
+                self.rule_hits, 'rule')
+        counter('attack_type_total', 'Payload terdeteksi per tipe serangan',
+                self.attack_types, 'type')
+        counter('verdicts_total', 'Verdict per aksi', self.verdicts, 'action')
+        if engine is not None:
+            counter('tier_total', 'Payload yang mencapai setiap tier',
+                    engine.tier_counts, 'tier')
+            if engine.cache is not None:
+                st = engine.cache.stats()
+                counter('cache_events_total', 'Event verdict cache',
+                        {k: st[k] for k in ('hits', 'misses', 'evictions', 'invalidations')},
+                        'event')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -0,0 +1,437 @@
+"""
+Normalisasi Payload (Transducer Satu Pass) untuk Mini-IDS
+=========================================================
+Penyerang melewati SQL_PATTERNS dengan URL encoding (juga ganda),
+/**/ sebagai spasi, huruf campuran dan '+' sebagai spasi. Normalizer
+mengubah payload menjadi bentuk kanonik dalam satu pass streaming:
+
+    %XX × depth (+ → spasi) → komentar inline → whitespace → casefold
+
+Setiap karakter mengalir melalui `depth` tahap decode lalu tahap
+komentar/whitespace tanpa string antara per tahap. Selama tahap decode
+netral, potongan tanpa % dan + diteruskan utuh ke tahap berikutnya,
+yang juga meneruskan potongan tanpa / * dan whitespace ganda utuh;
+deretan %XX ASCII di-decode sekaligus. Biaya per byte di luar karakter
+khusus hanya regex search + casefold di C.
+
+Setiap potongan output mencatat rentang raw asalnya (offset map),
+sehingga span match di teks ternormalisasi bisa dipetakan kembali ke
+payload mentah (Normalized.raw_span).
+
+Hasilnya sama dengan rantai decoder naif (bench/bench_normalizer.py):
+
+    unquote_plus, lalu unquote × (depth - 1)
+    re.sub(r'/\\*!\\d*|/\\*.*?\\*/|\\*/', ' ', flags=re.S)
+    re.sub(r'\\s+', ' ')
+    casefold()
+
+Komentar /*! ... */ (versioned, MySQL) dieksekusi, jadi hanya
+pembatasnya yang menjadi spasi. Komentar /* tanpa penutup bukan
+komentar (teksnya tetap diperiksa).
+"""
+
+import codecs
+import re
+from bisect import bisect_right
+from typing import List, Optional, Tuple
+
+HEX_DIGITS = frozenset('0123456789abcdefABCDEF')
+
+# Karakter yang berarti bagi tahap decode / tahap komentar+whitespace.
+# Satu spasi di antara karakter biasa tidak berubah, jadi ikut potongan utuh.
+DECODE_SPECIAL = re.compile(r'[%+]')
+FINAL_SPECIAL = re.compile(r'[/*]|(?! [^\s/*])\s+')
+WHITESPACE = re.compile(r'\s+')
+# Payload tanpa karakter khusus untuk tahap mana pun: cukup casefold
+ANY_SPECIAL = re.compile(r'[%+/*]|(?! [^\s%+/*])\s')
+# Deretan escape %XX (di-decode sekaligus bila semuanya ASCII)
+ESCAPES = re.compile(r'(?:%[0-9A-Fa-f]{2})+')
+PLUSES = re.compile(r'\++')
+UTF8_DECODER = codecs.getincrementaldecoder('utf-8')
+
+# State tahap komentar/whitespace
+NORMAL, SLASH, STAR, OPEN, COMMENT, COMMENT_STAR, BANG = range(7)
+
+
+class Normalized:
+    """
+    Teks ternormalisasi + offset map ke payload mentah.
+
+    Map berupa potongan (awal di text, rentang raw). Bila rentang raw
+    kelipatan panjang potongan, karakter ke-i dipetakan ke langkah ke-i
+    (teks biasa: 1 karakter, deretan %XX: 3 karakter); selain itu
+    (mis. ß → ss) setiap karakter dipetakan ke seluruh rentang.
+    """
+
+    __slots__ = ('text', 'raw', '_norm', '_start', '_end')
+
+    def __init__(self, text: str, raw: str, norm: List[int], start: List[int],
+                 end: List[int]):
+        self.text = text
+        self.raw = raw
+        self._norm = norm
+        self._start = start
+        self._end = end
+
+    def _piece(self, index: int) -> Tuple[int, int]:
+        """(indeks potongan, langkah raw per karakter; 0 = seluruh rentang)."""
+        k = bisect_right(self._norm, index) - 1
+        next_norm = self._norm[k + 1] if k + 1 < len(self._norm) else len(self.text)
+        return k, _stride(next_norm - self._norm[k], self._end[k] - self._start[k])
+
+    def raw_offset(self, index: int) -> int:
+        """Offset raw awal karakter text[index]."""
+        if index >= len(self.text):
+            return len(self.raw)
+        k, stride = self._piece(index)
+        return self._start[k] + (index - self._norm[k]) * stride
+
+    def raw_span(self, start: int, end: int) -> Tuple[int, int]:
+        """Rentang raw [a, b) yang menghasilkan text[start:end]."""
+        if end <= start:
+            offset = self.raw_offset(start)
+            return offset, offset
+        k, stride = self._piece(end - 1)
+        raw_end = self._start[k] + (end - self._norm[k]) * stride if stride else self._end[k]
+        return self.raw_offset(start), raw_end
+
+
+def _stride(length: int, span: int) -> int:
+    return span // length if length and span % length == 0 else 0
+
+
+class Transducer:
+    """
+    State normalisasi untuk satu payload (atau satu stream).
+
+    feed(text) mengembalikan teks ternormalisasi yang sudah final;
+    karakter yang masih ambigu (escape belum lengkap, '/', komentar
+    terbuka) ditahan sampai potongan berikutnya atau finish().
+    """
+
+    def __init__(self, depth: int = 2, plus: bool = True, casefold: bool = True):
+        self.depth = depth
+        self.plus = plus
+        self.casefold = casefold
+        self.offset = 0
+        # Tahap decode: escape tertunda [(ch, rs, re)], byte UTF-8 tertunda
+        self._pending: List[list] = [[] for _ in range(depth)]
+        self._decoders: List[Optional[codecs.IncrementalDecoder]] = [None] * depth
+        self._bytes: List[Optional[list]] = [None] * depth
+        # Tahap komentar/whitespace
+        self._state = NORMAL
+        self._held: list = []
+        self._space: Optional[Tuple[int, int]] = None
+        self._no_comment = False
+        # Output + offset map
+        self._out: List[str] = []
+        self._norm: List[int] = []
+        self._start: List[int] = []
+        self._end: List[int] = []
+        self._length = 0
+        self._stride = 0
+
+    def feed(self, text: str) -> str:
+        mark = len(self._out)
+        base = self.offset
+        self.offset += len(text)
+        if not self.depth:
+            self._final_text(text, base, 1)
+            return ''.join(self._out[mark:])
+        pos, n = 0, len(text)
+        while pos < n:
+            if not any(self._pending) and not any(self._bytes):
+                match = DECODE_SPECIAL.search(text, pos)
+                stop = match.start() if match else n
+                if stop > pos:
+                    self._final_text(text[pos:stop] if pos or stop < n else text,
+                                     base + pos, 1)
+                if match is None:
+                    break
+                pos = stop
+                if text[stop] == '%':
+                    escapes = ESCAPES.match(text, stop)
+                    if escapes is not None and self._escapes(escapes.group(), base + stop):
+                        pos = escapes.end()
+                        continue
+                elif self.plus:
+                    end = PLUSES.match(text, stop).end()
+                    self._final_text(' ' * (end - stop), base + stop, 1)
+                    pos = end
+                    continue
+            self._decode(0, text[pos], base + pos, base + pos + 1)
+            pos += 1
+        return ''.join(self._out[mark:])
+
+    def finish(self) -> str:
+        """Akhir input: lepaskan semua karakter yang masih ditahan."""
+        mark = len(self._out)
+        for level in range(self.depth):
+            pending = self._pending[level]
+            if pending:
+                self._cancel(level)
+            if self._bytes[level] is not None:
+                self._flush_bytes(level)
+        if self._state in (COMMENT, COMMENT_STAR):
+            # /* tanpa penutup: bukan komentar, proses ulang isinya
+            held, self._held, self._state = self._held, [], NORMAL
+            self._no_comment = True
+            for item in held:
+                self._final(*item)
+            self._no_comment = False
+        if self._state in (SLASH, STAR, OPEN):
+            self._release()
+        self._state = NORMAL
+        if self._space is not None:
+            self._append(' ', *self._space)
+            self._space = None
+        return ''.join(self._out[mark:])
+
+    def result(self, raw: str) -> Normalized:
+        return Normalized(''.join(self._out), raw, self._norm, self._start, self._end)
+
+    def _escapes(self, run: str, rs: int) -> bool:
+        """
+        Jalur cepat deretan %XX di tahap decode pertama (tahap decode netral).
+
+        False bila ada byte non-ASCII (diproses per karakter lewat decoder
+        UTF-8). Hasil decode tanpa '%' tidak berubah di tahap decode
+        berikutnya, jadi langsung masuk tahap komentar/whitespace.
+        """
+        data = bytes.fromhex(run.replace('%', ''))
+        if not data.isascii():
+            return False
+        decoded = data.decode('ascii')
+        if self.depth > 1 and '%' in decoded:
+            for i, ch in enumerate(decoded):
+                self._decode(1, ch, rs + 3 * i, rs + 3 * i + 3)
+        else:
+            self._final_text(decoded, rs, 3)
+        return True
+
+    # --- tahap decode (%XX) ---
+
+    def _decode(self, level: int, ch: str, rs: int, re_: int):
+        if level == self.depth:
+            self._final(ch, rs, re_)
+            return
+        pending = self._pending[level]
+        if pending:
+            if ch in HEX_DIGITS:
+                if len(pending) == 1:
+                    pending.append((ch, rs, re_))
+                    return
+                start = pending[0][1]
+                byte = int(pending[1][0] + ch, 16)
+                pending.clear()
+                self._byte(level, byte, start, re_)
+                return
+            self._cancel(level)
+        if ch == '%':
+            pending.append((ch, rs, re_))
+            return
+        if ch == '+' and level == 0 and self.plus:
+            ch = ' '
+        self._literal(level, ch, rs, re_)
+
+    def _cancel(self, level: int):
+        """Escape tidak lengkap: '%' literal, karakter sesudahnya diproses ulang."""
+        held = self._pending[level][:]
+        self._pending[level].clear()
+        self._literal(level, *held[0])
+        for item in held[1:]:
+            self._decode(level, *item)
+
+    def _literal(self, level: int, ch: str, rs: int, re_: int):
+        if self._bytes[level] is not None:
+            self._flush_bytes(level)
+        self._decode(level + 1, ch, rs, re_)
+
+    def _byte(self, level: int, byte: int, rs: int, re_: int):
+        span = self._bytes[level]
+        if span is None:
+            if byte < 0x80:
+                self._decode(level + 1, chr(byte), rs, re_)
+                return
+            span = self._bytes[level] = [rs, re_]
+        decoder = self._decoders[level]
+        if decoder is None:
+            decoder = self._decoders[level] = UTF8_DECODER('replace')
+        out = decoder.decode(bytes((byte,)))
+        if not out:
+            span[1] = re_
+            return
+        if decoder.getstate()[0]:
+            # Byte ini awal sekuens baru; output milik byte sebelumnya
+            self._bytes[level] = [rs, re_]
+            end = rs
+        else:
+            self._bytes[level] = None
+            end = re_
+        for c in out:
+            self._decode(level + 1, c, span[0], end)
+
+    def _flush_bytes(self, level: int):
+        """Sekuens UTF-8 terputus → U+FFFD (seperti unquote errors='replace')."""
+        start, end = self._bytes[level]
+        self._bytes[level] = None
+        out = self._decoders[level].decode(b'', final=True)
+        self._decoders[level].reset()
+        for c in out:
+            self._decode(level + 1, c, start, end)
+
+    # --- tahap komentar inline + whitespace ---
+
+    def _final_text(self, text: str, rs: int, step: int):
+        """
+        Potongan teks ke tahap komentar/whitespace; karakter ke-i berasal
+        dari raw [rs + i*step, rs + (i+1)*step).
+        """
+        pos, n = 0, len(text)
+        while pos < n:
+            if self._state == NORMAL:
+                if self._space is not None and text[pos].isspace():
+                    match = WHITESPACE.match(text, pos)
+                else:
+                    match = FINAL_SPECIAL.search(text, pos)
+                stop = match.start() if match else n
+                if stop > pos:
+                    self._emit(text[pos:stop] if pos or stop < n else text,
+                               rs + pos * step, rs + stop * step)
+                if match is None:
+                    break
+                if text[stop].isspace():
+                    self._whitespace(rs + stop * step, rs + match.end() * step)
+                    pos = match.end()
+                    continue
+                pos = stop
+            self._final(text[pos], rs + pos * step, rs + (pos + 1) * step)
+            pos += 1
+
+    def _final(self, ch: str, rs: int, re_: int):
+        state = self._state
+        held = self._held
+        if state == NORMAL:
+            if ch.isspace():
+                self._whitespace(rs, re_)
+            elif ch == '/' or ch == '*':
+                held.append((ch, rs, re_))
+                self._state = SLASH if ch == '/' else STAR
+            else:
+                self._emit(ch, rs, re_)
+        elif state == SLASH:
+            if ch == '*':
+                held.append((ch, rs, re_))
+                self._state = OPEN
+            else:
+                self._release()
+                self._final(ch, rs, re_)
+        elif state == STAR:
+            if ch == '/':
+                self._whitespace(held[0][1], re_)
+                held.clear()
+                self._state = NORMAL
+            else:
+                self._release()
+                self._final(ch, rs, re_)
+        elif state == OPEN:
+            if ch == '!':
+                self._whitespace(held[0][1], re_)
+                held.clear()
+                self._state = BANG
+            elif self._no_comment:
+                slash, star = held
+                held.clear()
+                self._state = NORMAL
+                self._emit(*slash)
+                self._final(*star)
+                self._final(ch, rs, re_)
+            else:
+                self._state = COMMENT
+                self._final(ch, rs, re_)
+        elif state == BANG:
+            if ch.isdecimal():
+                self._whitespace(rs, re_)
+            else:
+                self._state = NORMAL
+                self._final(ch, rs, re_)
+        else:
+            held.append((ch, rs, re_))
+            if ch == '/' and state == COMMENT_STAR:
+                self._whitespace(held[0][1], re_)
+                held.clear()
+                self._state = NORMAL
+            else:
+                self._state = COMMENT_STAR if ch == '*' else COMMENT
+
+    def _release(self):
+        """Karakter '/' / '*' yang ditahan ternyata literal."""
+        held = self._held[:]
+        self._held.clear()
+        self._state = NORMAL
+        for ch, rs, re_ in held:
+            self._emit(ch, rs, re_)
+
+    def _whitespace(self, rs: int, re_: int):
+        space = self._space
+        self._space = (space[0] if space is not None else rs, re_)
+
+    def _emit(self, text: str, rs: int, re_: int):
+        if self._space is not None:
+            self._append(' ', *self._space)
+            self._space = None
+        if not self.casefold:
+            self._append(text, rs, re_)
+            return
+        folded = text.casefold()
+        if len(folded) == len(text):
+            self._append(folded, rs, re_)
+        elif _stride(len(text), re_ - rs):
+            # Casefold mengubah panjang (mis. ß → ss): map per karakter
+            step = (re_ - rs) // len(text)
+            for i, c in enumerate(text):
+                self._append(c.casefold(), rs + i * step, rs + (i + 1) * step)
+        else:
+            self._append(folded, rs, re_)
+
+    def _append(self, text: str, rs: int, re_: int):
+        self._out.append(text)
+        stride = _stride(len(text), re_ - rs)
+        if stride and stride == self._stride and self._end[-1] == rs:
+            self._end[-1] = re_
+        else:
+            self._norm.append(self._length)
+            self._start.append(rs)
+            self._end.append(re_)
+            self._stride = stride
+        self._length += len(text)
+
+
+class Normalizer:
+    """
+    Konfigurasi normalisasi (dibangun sekali, dipakai bersama).
+
+    depth: berapa kali percent-decoding diulang (2 = double encoding);
+    0 mematikan decoding termasuk '+'. casefold=False mempertahankan
+    huruf asli (untuk ruleset dengan pattern case-sensitive).
+    """
+
+    def __init__(self, depth: int = 2, plus: bool = True, casefold: bool = True):
+        if depth < 0:
+            raise ValueError("depth harus >= 0")
+        self.depth = depth
+        self.plus = plus
+        self.casefold = casefold
+
+    def transducer(self) -> Transducer:
+        return Transducer(self.depth, self.plus, self.casefold)
+
+    def normalize(self, payload: str) -> Normalized:
+        if ANY_SPECIAL.search(payload) is None:
+            text = payload.casefold() if self.casefold else payload
+            if len(text) == len(payload):
+                return Normalized(text, payload, [0], [0], [len(payload)])
+        transducer = self.transducer()
+        transducer.feed(payload)
+        transducer.finish()
+        return transducer.result(payload)
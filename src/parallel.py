@@ -0,0 +1,240 @@
+"""
+Scanning Paralel (Multi-core) untuk Mini-IDS
+============================================
+Analisis murni CPU-bound, sehingga satu proses hanya memakai satu core.
+File dibagi menjadi potongan pada offset byte yang disejajarkan ke batas
+baris, lalu setiap potongan dikerjakan oleh process pool.
+
+Engine dibangun sekali di proses induk; dengan start method 'fork'
+worker mewarisinya secara copy-on-write. Pada platform tanpa fork,
+initializer membangun Engine sekali per worker. Hasil dikembalikan
+lewat imap sehingga urutan baris asli tetap terjaga.
+
+executor='thread': potongan yang sama dikerjakan ThreadPoolExecutor di
+satu proses. Setiap potongan memakai Engine.worker() (tabel terkompilasi
+dan cache bersama, hitungan sendiri) lalu digabung dengan merge(); hasil
+tidak perlu di-pickle. Di CPython ber-GIL mode ini tetap benar tetapi
+tidak lebih cepat dari satu thread; di build free-threaded (3.13t)
+potongan berjalan paralel.
+"""
+
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+from allowlist import ShapeAllowlist
+from bytescan import scan_file
+from engine import Engine
+from fingerprint import FingerprintTable
+from logstream import SCANNERS, format_fields, new_stats, print_summary, verdict_fields
+from metrics import Metrics
+from normalizer import Normalizer
+from rule_order import RuleOrder
+from ruleset import load_ruleset
+
+# Potongan per worker: lebih dari satu agar beban tetap seimbang
+CHUNKS_PER_WORKER = 4
+MAX_CHUNK_BYTES = 64 << 20
+
+# Engine milik worker (diwarisi lewat fork atau dibangun initializer)
+_worker_engine: Optional[Engine] = None
+
+
+def _context():
+    """Pakai fork bila tersedia (Engine diwarisi copy-on-write)."""
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context('spawn')
+
+
+def _init_worker(rules_path: Optional[str], with_metrics: bool = False,
+                 normalizer: Optional[Normalizer] = None,
+                 allowlist: Optional[ShapeAllowlist] = None, vectorize: bool = False,
+                 fingerprints: Optional[FingerprintTable] = None,
+                 all_matches: bool = False, cache_size: int = 0,
+                 adaptive_order: bool = False):
+    global _worker_engine
+    if _worker_engine is None:
+        ruleset = load_ruleset(rules_path) if rules_path else None
+        _worker_engine = Engine(ruleset=ruleset, cache_size=cache_size,
+                                metrics=Metrics() if with_metrics else None,
+                                normalizer=normalizer, all_matches=all_matches,
+                                fingerprints=fingerprints, allowlist=allowlist,
+                                vectorize=vectorize, adaptive_order=adaptive_order)
+
+
+def _initargs(rules_path: Optional[str], engine: Engine, with_metrics: bool) -> tuple:
+    """Argumen _init_worker agar Engine hasil spawn sama dengan engine induk."""
+    return (rules_path, with_metrics, engine.normalizer, engine.allowlist,
+            engine.vectorize, engine.fingerprints, engine.all_matches,
+            engine.cache.maxsize if engine.cache is not None else 0,
+            engine.simulator.rule_order.adaptive)
+
+
+def split_offsets(path: str, n_chunks: int) -> List[Tuple[int, int]]:
+    """
+    Bagi file menjadi n_chunks potongan [start, end) pada batas baris.
+
+    Setiap batas digeser ke awal baris berikutnya, sehingga tidak ada
+    baris yang terpotong di dua worker.
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    bounds = [0]
+    with open(path, 'rb') as f:
+        for k in range(1, n_chunks):
+            target = size * k // n_chunks
+            if target <= bounds[-1]:
+                continue
+            f.seek(target - 1)
+            f.readline()  # habiskan sisa baris yang terpotong
+            pos = f.tell()
+            if bounds[-1] < pos < size:
+                bounds.append(pos)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _read_region(path: str, start: int, end: int):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        pos = start
+        while pos < end:
+            line = f.readline()
+            if not line:
+                break
+            pos += len(line)
+            yield line
+
+
+def _scan_region(engine: Engine, task) -> Tuple[List[tuple], dict]:
+    """Pindai satu potongan → field output dan statistik."""
+    path, start, end, mode, show_all = task
+    stats = new_stats()
+    rows = []
+    if mode == 'bytes':
+        results = scan_file(path, engine, stats, start, end)
+    else:
+        results = SCANNERS[mode](_read_region(path, start, end), engine, stats)
+    for result in results:
+        if show_all or result['detected']:
+            # Tuple kecil lebih murah di-pickle daripada dict hasil
+            rows.append(verdict_fields(result))
+    return rows, stats
+
+
+def _scan_chunk(task) -> Tuple[List[tuple], dict, dict, Optional[Metrics], RuleOrder]:
+    """
+    Worker proses: pindai satu potongan → field output, statistik, tier,
+    metrics dan statistik urutan rule.
+    """
+    engine = _worker_engine
+    # Tier, metrics dan statistik rule per potongan, digabung di proses induk
+    engine.tier_counts = dict.fromkeys(engine.tier_counts, 0)
+    if engine.metrics is not None:
+        engine.metrics = Metrics()
+    simulator = engine.simulator
+    simulator.rule_order = simulator.rule_order.fork()
+    rows, stats = _scan_region(engine, task)
+    return rows, stats, engine.tier_counts, engine.metrics, simulator.rule_order
+
+
+def _scan_chunk_thread(engine: Engine, task) -> Tuple[List[tuple], dict, dict, None, None]:
+    """Worker thread: Engine.worker() per potongan, hitungan langsung di-merge."""
+    worker = engine.worker()
+    rows, stats = _scan_region(worker, task)
+    engine.merge(worker)
+    return rows, stats, {}, None, None
+
+
+def run_parallel_stream(path: str, workers: int, rules_path: Optional[str] = None,
+                        show_all: bool = False, out=sys.stdout, err=sys.stderr,
+                        mode: str = 'log', engine: Optional[Engine] = None,
+                        executor: str = 'process') -> dict:
+    """
+    Pindai file dengan process pool (atau thread pool, executor='thread');
+    output tetap urut sesuai baris.
+
+    Nomor baris dari worker relatif terhadap potongannya; proses induk
+    menambahkan offset kumulatif karena imap/map mengembalikan hasil urut.
+    """
+    global _worker_engine
+    size = os.path.getsize(path)
+    n_chunks = max(workers * CHUNKS_PER_WORKER, -(-size // MAX_CHUNK_BYTES))
+    chunks = split_offsets(path, n_chunks)
+
+    if engine is None:
+        engine = Engine(ruleset=load_ruleset(rules_path) if rules_path else None)
+    _worker_engine = engine  # diwarisi worker saat fork
+
+    stats = new_stats()
+    start = time.perf_counter()
+    tasks = [(path, s, e, mode, show_all) for s, e in chunks]
+
+    def collect(parts):
+        for rows, chunk_stats, chunk_tiers, chunk_metrics, chunk_order in parts:
+            offset = stats['lines']
+            for row in rows:
+                out.write(format_fields((row[0] + offset,) + row[1:]) + '\n')
+            for key in stats:
+                stats[key] += chunk_stats[key]
+            for tier, count in chunk_tiers.items():
+                engine.tier_counts[tier] += count
+            if chunk_metrics is not None:
+                engine.metrics.merge(chunk_metrics)
+            if chunk_order is not None:
+                engine.simulator.rule_order.merge(chunk_order)
+
+    if executor == 'thread':
+        if mode == 'bytes':
+            engine.byte_detector  # dibangun sekali, dipakai bersama semua thread
+        with ThreadPoolExecutor(workers) as pool:
+            collect(pool.map(lambda task: _scan_chunk_thread(engine, task), tasks))
+    else:
+        initargs = _initargs(rules_path, engine, engine.metrics is not None)
+        with _context().Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+            collect(pool.imap(_scan_chunk, tasks))
+
+    print_summary(stats, time.perf_counter() - start, err)
+    return stats
+
+
+def _analyze_slice(payloads: Sequence[str]) -> List[dict]:
+    return _worker_engine.analyze_batch(payloads)
+
+
+def _analyze_slice_thread(engine: Engine, payloads: Sequence[str]) -> List[dict]:
+    worker = engine.worker()
+    results = worker.analyze_batch(payloads)
+    engine.merge(worker)
+    return results
+
+
+def analyze_batch_parallel(payloads: Sequence[str], workers: int,
+                           engine: Optional[Engine] = None,
+                           rules_path: Optional[str] = None,
+                           executor: str = 'process') -> List[dict]:
+    """Engine.analyze_batch di process pool (atau thread pool); hasil urut sesuai input."""
+    global _worker_engine
+    _worker_engine = engine or Engine(ruleset=load_ruleset(rules_path) if rules_path else None)
+    if workers <= 1:
+        return _worker_engine.analyze_batch(payloads)
+
+    size = max(1, -(-len(payloads) // (workers * CHUNKS_PER_WORKER)))
+    slices = [payloads[i:i + size] for i in range(0, len(payloads), size)]
+    results = []
+    if executor == 'thread':
+        shared = _worker_engine
+        with ThreadPoolExecutor(workers) as pool:
+            for part in pool.map(lambda part: _analyze_slice_thread(shared, part), slices):
+                results.extend(part)
+        return results
+    initargs = _initargs(rules_path, _worker_engine, False)
+    with _context().Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+        for part in pool.imap(_analyze_slice, slices):
+            results.extend(part)
+    return results
@@ -1,19 +1,26 @@
 """
 Parser untuk Mini-IDS (2 Pola SQL Injection)
 =============================================
-Recursive Descent Parser untuk Boolean-based dan Comment-based.
+Predictive (LL) parser satu lintasan untuk Boolean-based dan Comment-based.
 
 CFG:
     SQLInjection  → SQLPattern | ε
     SQLPattern    → BooleanAttack | CommentAttack
     BooleanAttack → QUOTE (OR | AND) AlwaysTrue
     CommentAttack → Payload SQL_COMMENT
-    AlwaysTrue    → QUOTE NUMBER EQUALS QUOTE NUMBER | NUMBER EQUALS NUMBER
+    AlwaysTrue    → ALWAYS_TRUE
+                  | Operand EQUALS Operand      (kedua Atom sama)
+    Operand       → [QUOTE] Atom [QUOTE]
+    Atom          → NUMBER | IDENTIFIER
+
+ALWAYS_TRUE adalah token gabungan dari lexer ('1'='1' atau 1=1);
+bentuk terpisah seperti '1'='1 (tanpa quote penutup) ditangani Operand.
+Setiap node menyimpan span (start, end) offset di payload.
 """
 
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 from dataclasses import dataclass, field
-from lexer import Token, TokenType
+from lexer import Token, TokenStream, TokenType
 
 
 @dataclass
@@ -23,13 +30,15 @@ class ASTNode:
     value: str = ""
     children: List['ASTNode'] = field(default_factory=list)
     metadata: dict = field(default_factory=dict)
-    
+    span: Optional[Tuple[int, int]] = None
+
     def add_child(self, child: 'ASTNode'):
         self.children.append(child)
-    
+
     def print_tree(self, indent: int = 0):
         prefix = "  " * indent
-        print(f"{prefix}├── {self.node_type}: {self.value}")
+        span = f" [{self.span[0]}:{self.span[1]}]" if self.span else ""
+        print(f"{prefix}├── {self.node_type}: {self.value}{span}")
         for child in self.children:
             child.print_tree(indent + 1)
 
@@ -57,132 +66,195 @@ class SafeNode(ASTNode):
         super().__init__("SAFE", "Input aman, tidak ada serangan")
 
 
+# Kode tipe token (nilai enum) untuk perbandingan integer di loop parser
+QUOTE = TokenType.SQL_QUOTE.value
+KEYWORD = TokenType.SQL_KEYWORD.value
+COMMENT = TokenType.SQL_COMMENT.value
+OPERATOR = TokenType.SQL_OPERATOR.value
+ALWAYS_TRUE = TokenType.ALWAYS_TRUE.value
+NUMBER = TokenType.NUMBER.value
+IDENTIFIER = TokenType.IDENTIFIER.value
+EOF = TokenType.EOF.value
+
+
 class Parser:
     """
-    Recursive Descent Parser untuk SQL Injection.
-    
-    Menerapkan CFG untuk mendeteksi:
-    1. Boolean-based: ' OR '1'='1
-    2. Comment-based: admin'--
+    Predictive Parser untuk SQL Injection.
+
+    Token dibaca sekali dari kiri ke kanan. Token QUOTE memprediksi
+    BooleanAttack (lookahead terbatas, paling banyak 9 token) dan
+    SQL_COMMENT menutup CommentAttack, sehingga waktu parsing linear
+    terhadap jumlah token.
+
+    Tanpa explain parser berhenti pada serangan pertama; dengan
+    explain=True semua serangan dikumpulkan di AST.
     """
-    
-    def __init__(self, tokens: List[Token]):
+
+    def __init__(self, tokens: Sequence[Token], explain: bool = False):
         self.tokens = tokens
+        self.explain = explain
         self.pos = 0
-    
+
+        if isinstance(tokens, TokenStream):
+            self.types = tokens.types
+            self.starts = tokens.starts
+            self.ends = tokens.ends
+            self._source = tokens.source
+        else:
+            self.types = [t.type.value for t in tokens]
+            self.starts = [t.position for t in tokens]
+            self.ends = [t.position + len(t.value) for t in tokens]
+            self._source = None
+
+        # Lookahead mengandalkan EOF sebagai sentinel
+        if not self.types or self.types[-1] != EOF:
+            end = self.ends[-1] if self.ends else 0
+            self.types = list(self.types) + [EOF]
+            self.starts = list(self.starts) + [end]
+            self.ends = list(self.ends) + [end]
+
     def parse(self) -> ASTNode:
         """
         Entry point parsing.
-        
+
         CFG: SQLInjection → SQLPattern | ε
         """
         root = PayloadNode()
-        
-        # Coba parse SQL Injection pattern
-        sql_node = self._parse_sql_injection()
-        
-        if sql_node:
-            root.add_child(sql_node)
-            root.is_malicious = True
-            root.attack_type = sql_node.injection_type
-        else:
+        types = self.types
+        n = len(types)
+        payload_start = 0
+        i = 0
+
+        while i < n:
+            code = types[i]
+            node = None
+            if code == QUOTE:
+                node, end = self._parse_boolean_attack(i)
+            elif code == COMMENT:
+                node, end = self._parse_comment_attack(payload_start, i)
+
+            if node is None:
+                i += 1
+                continue
+
+            root.add_child(node)
+            if not root.is_malicious:
+                root.is_malicious = True
+                root.attack_type = node.injection_type
+            if not self.explain:
+                break
+            i = payload_start = end
+
+        self.pos = i
+        if not root.is_malicious:
             root.add_child(SafeNode())
-        
         return root
-    
-    def _parse_sql_injection(self) -> Optional[SQLInjectionNode]:
-        """
-        CFG: SQLPattern → BooleanAttack | CommentAttack
-        """
-        # Cek Boolean-based: OR/AND dengan always true
-        if self._is_boolean_attack():
-            return self._parse_boolean_attack()
-        
-        # Cek Comment-based: ada -- atau #
-        if self._is_comment_attack():
-            return self._parse_comment_attack()
-        
-        return None
-    
-    def _is_boolean_attack(self) -> bool:
-        """Cek apakah ada pattern Boolean-based."""
-        has_or_and = any(
-            t.type == TokenType.SQL_KEYWORD and t.value.upper() in ['OR', 'AND']
-            for t in self.tokens
-        )
-        has_always_true = any(
-            t.type == TokenType.ALWAYS_TRUE for t in self.tokens
-        )
-        return has_or_and and has_always_true
-    
-    def _is_comment_attack(self) -> bool:
-        """Cek apakah ada pattern Comment-based."""
-        return any(t.type == TokenType.SQL_COMMENT for t in self.tokens)
-    
-    def _parse_boolean_attack(self) -> SQLInjectionNode:
+
+    def _value(self, i: int) -> str:
+        if self._source is not None:
+            return self._source[self.starts[i]:self.ends[i]]
+        return self.tokens[i].value
+
+    def _text(self, first: int, last: int) -> str:
+        """Teks sumber dari token first sampai last (inklusif)."""
+        if self._source is not None:
+            return self._source[self.starts[first]:self.ends[last]]
+        return ' '.join(self.tokens[k].value for k in range(first, last + 1))
+
+    def _leaf(self, node_type: str, first: int, last: int) -> ASTNode:
+        return ASTNode(node_type, self._text(first, last),
+                       span=(self.starts[first], self.ends[last]))
+
+    def _parse_boolean_attack(self, i: int) -> Tuple[Optional[SQLInjectionNode], int]:
         """
         CFG: BooleanAttack → QUOTE (OR | AND) AlwaysTrue
-        
+
         Contoh: ' OR '1'='1
         """
-        node = SQLInjectionNode('BOOLEAN_BASED')
-        
-        # Kumpulkan token yang relevan
-        parts = []
-        for t in self.tokens:
-            if t.type in [TokenType.SQL_QUOTE, TokenType.SQL_KEYWORD, 
-                          TokenType.ALWAYS_TRUE, TokenType.SQL_OPERATOR,
-                          TokenType.NUMBER]:
-                parts.append(t.value)
-        
-        node.value = ' '.join(parts)
-        
-        # Tambah child nodes untuk AST
-        node.add_child(ASTNode("QUOTE", "'"))
-        node.add_child(ASTNode("KEYWORD", "OR"))
-        node.add_child(ASTNode("ALWAYS_TRUE", "'1'='1'"))
-        
-        return node
-    
-    def _parse_comment_attack(self) -> SQLInjectionNode:
+        if self.types[i + 1] != KEYWORD or self._value(i + 1).upper() not in ('OR', 'AND'):
+            return None, i + 1
+        end = self._parse_always_true(i + 2)
+        if end is None:
+            return None, i + 1
+
+        node = SQLInjectionNode('BOOLEAN_BASED', self._text(i, end - 1))
+        node.span = (self.starts[i], self.ends[end - 1])
+        node.add_child(self._leaf("QUOTE", i, i))
+        node.add_child(self._leaf("KEYWORD", i + 1, i + 1))
+        node.add_child(self._leaf("ALWAYS_TRUE", i + 2, end - 1))
+        return node, end
+
+    def _parse_always_true(self, i: int) -> Optional[int]:
+        """
+        CFG: AlwaysTrue → ALWAYS_TRUE | Operand EQUALS Operand
+
+        Returns:
+            indeks token sesudah AlwaysTrue, atau None
+        """
+        types = self.types
+        if types[i] == ALWAYS_TRUE:
+            return i + 1
+        left = self._parse_operand(i)
+        if left is None:
+            return None
+        left_atom, j = left
+        if types[j] != OPERATOR or self._value(j) != '=':
+            return None
+        right = self._parse_operand(j + 1)
+        if right is None:
+            return None
+        right_atom, end = right
+        if self._value(left_atom).lower() != self._value(right_atom).lower():
+            return None
+        return end
+
+    def _parse_operand(self, i: int) -> Optional[Tuple[int, int]]:
+        """CFG: Operand → [QUOTE] Atom [QUOTE]; hasil (indeks Atom, indeks sesudahnya)."""
+        types = self.types
+        if types[i] == QUOTE:
+            i += 1
+        if types[i] != NUMBER and types[i] != IDENTIFIER:
+            return None
+        atom = i
+        i += 1
+        if types[i] == QUOTE:
+            i += 1
+        return atom, i
+
+    def _parse_comment_attack(self, payload_start: int,
+                              i: int) -> Tuple[SQLInjectionNode, int]:
         """
         CFG: CommentAttack → Payload SQL_COMMENT
-        
+
         Contoh: admin'--
         """
-        node = SQLInjectionNode('COMMENT_BASED')
-        
-        # Cari comment token
-        for t in self.tokens:
-            if t.type == TokenType.SQL_COMMENT:
-                node.value = t.value
-                break
-        
-        # Tambah child nodes
-        node.add_child(ASTNode("PAYLOAD", "admin'"))
-        node.add_child(ASTNode("SQL_COMMENT", node.value))
-        
-        return node
+        first = min(payload_start, i)
+        node = SQLInjectionNode('COMMENT_BASED', self._text(first, i))
+        node.span = (self.starts[first], self.ends[i])
+        if first < i:
+            node.add_child(self._leaf("PAYLOAD", first, i - 1))
+        node.add_child(self._leaf("SQL_COMMENT", i, i))
+        return node, i + 1
 
 
 # ============ TEST ============
 if __name__ == "__main__":
     from lexer import Lexer
-    
+
     test_inputs = [
         "username=admin",
         "id=1' OR '1'='1",
         "admin'--",
     ]
-    
+
     print("=" * 50)
     print("PARSER TEST (2 Pola)")
     print("=" * 50)
-    
+
     for inp in test_inputs:
         print(f"\nInput: {inp}")
         tokens = Lexer(inp).tokenize()
-        ast = Parser(tokens).parse()
+        ast = Parser(tokens, explain=True).parse()
         print("AST:")
         ast.print_tree()
         print(f"Malicious: {ast.is_malicious}")
@@ -0,0 +1,279 @@
+"""
+Prefilter Literal (Aho-Corasick) untuk Mini-IDS
+===============================================
+Sebelum regex dijalankan, payload dipindai satu kali oleh automaton
+Aho-Corasick yang berisi literal wajib (anchor) dari setiap pattern,
+mis. ', --, #, OR, AND, =. Hanya pattern yang semua anchor-nya muncul
+yang perlu dijalankan regex-nya.
+"""
+
+import re
+from array import array
+from collections import deque
+from typing import FrozenSet, List, Optional, Sequence, Tuple
+
+try:
+    import re._parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+
+def required_literals(pattern: str, flags: int = 0) -> List[FrozenSet[str]]:
+    """
+    Ambil literal wajib dari sebuah regex.
+
+    Hasilnya daftar grup (AND dari OR): setiap match pattern pasti
+    memuat paling sedikit satu literal dari setiap grup. Literal sudah
+    di-lowercase. Daftar kosong artinya pattern tidak punya anchor.
+
+    Contoh: (OR|AND)\\s+1\\s*=\\s*1 → [{or, and}, {1}, {=}, {1}]
+    """
+    groups = _required(sre_parse.parse(pattern, flags))
+    # Hanya literal ASCII; case folding non-ASCII tidak dijamin sama
+    return [g for g in groups if all(lit.isascii() for lit in g)]
+
+
+def _required(seq) -> List[FrozenSet[str]]:
+    """Telusuri parse tree sre dan kumpulkan grup literal wajib."""
+    groups = []
+    run = []
+
+    def flush():
+        if run:
+            groups.append(frozenset([''.join(run).lower()]))
+            run.clear()
+
+    for op, av in seq:
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        flush()
+
+        if op is sre_parse.SUBPATTERN:
+            groups.extend(_required(av[-1]))
+        elif op is sre_parse.BRANCH:
+            # Satu literal terbaik dari setiap cabang → satu grup OR
+            alternatives = set()
+            for branch in av[1]:
+                branch_groups = _required(branch)
+                if not branch_groups:
+                    break
+                alternatives |= max(branch_groups,
+                                    key=lambda g: min(len(lit) for lit in g))
+            else:
+                groups.append(frozenset(alternatives))
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            min_count, _, item = av
+            if min_count >= 1:
+                groups.extend(_required(item))
+        elif op is sre_parse.IN:
+            # Kelas karakter yang berisi literal saja, mis. ['"]
+            if av and all(item_op is sre_parse.LITERAL for item_op, _ in av):
+                groups.append(frozenset(chr(c).lower() for _, c in av))
+
+    flush()
+    return groups
+
+
+def _trigger_rows(literals: List[str], pattern_groups,
+                  max_groups: int = 3) -> Optional[List[Tuple[FrozenSet[str], ...]]]:
+    """
+    Syarat karakter per pattern untuk cek tier 0.
+
+    Setiap match memuat salah satu literal dari setiap grup, jadi juga
+    karakter pertamanya. Satu baris = himpunan karakter awal per grup
+    (paling selektif dulu: non-alfanumerik, lalu yang terkecil);
+    payload ASCII yang tidak memenuhi semua grup di baris mana pun
+    dijamin tidak cocok. None bila ada pattern tanpa literal wajib.
+    """
+    rows = set()
+    for groups in pattern_groups:
+        if not groups:
+            return None
+        firsts = {frozenset(c for j in ids for c in (literals[j][0], literals[j][0].upper()))
+                  for ids in groups}
+        ranked = sorted(firsts, key=lambda fs: (sum(c.isalnum() for c in fs), len(fs), sorted(fs)))
+        rows.add(tuple(ranked[:max_groups]))
+    # Baris yang memuat semua grup baris lain tidak menambah informasi
+    # (kuadratik, jadi hanya untuk daftar kecil)
+    if len(rows) <= 256:
+        rows = [row for row in rows
+                if not any(other != row and set(other) <= set(row) for other in rows)]
+    return sorted(rows, key=lambda row: [sorted(g) for g in row])
+
+
+class AhoCorasick:
+    """
+    Automaton Aho-Corasick case-insensitive untuk literal ASCII.
+
+    Trie + failure link dikompilasi menjadi DFA penuh dengan tabel datar
+    (seperti CompiledDFA): class_map byte → kelas, dan
+    table[offset + kelas] = offset state berikutnya.
+    outputs[offset] = bitmask id literal yang selesai di state tersebut.
+    """
+
+    def __init__(self, literals: Sequence[str]):
+        self.literals = [lit.lower() for lit in literals]
+
+        # 1. Trie
+        goto = [{}]
+        output = [0]
+        for i, lit in enumerate(self.literals):
+            s = 0
+            for b in lit.encode('ascii'):
+                if b not in goto[s]:
+                    goto.append({})
+                    output.append(0)
+                    goto[s][b] = len(goto) - 1
+                s = goto[s][b]
+            output[s] |= 1 << i
+
+        # 2. Kelas karakter (huruf besar/kecil satu kelas)
+        alphabet = sorted({b for lit in self.literals for b in lit.encode('ascii')})
+        self.n_classes = n = len(alphabet) + 1
+        class_map = bytearray(256)
+        for cls, b in enumerate(alphabet, 1):
+            class_map[b] = cls
+            class_map[ord(chr(b).upper())] = cls
+        self.class_map = bytes(class_map)
+
+        # 3. Failure link (BFS) → tabel DFA penuh
+        delta = [[0] * n for _ in goto]
+        fail = [0] * len(goto)
+        queue = deque()
+        for cls, b in enumerate(alphabet, 1):
+            if b in goto[0]:
+                delta[0][cls] = goto[0][b]
+                queue.append(goto[0][b])
+        while queue:
+            s = queue.popleft()
+            output[s] |= output[fail[s]]
+            for cls, b in enumerate(alphabet, 1):
+                if b in goto[s]:
+                    t = goto[s][b]
+                    fail[t] = delta[fail[s]][cls]
+                    delta[s][cls] = t
+                    queue.append(t)
+                else:
+                    delta[s][cls] = delta[fail[s]][cls]
+
+        self.table = array('I', [t * n for row in delta for t in row])
+        self.outputs = [0] * (len(goto) * n)
+        for s, mask in enumerate(output):
+            self.outputs[s * n] = mask
+        self.all_mask = (1 << len(self.literals)) - 1
+
+    def scan(self, data) -> int:
+        """Pindai bytes satu kali, kembalikan bitmask literal yang ditemukan."""
+        table = self.table
+        cmap = self.class_map
+        outputs = self.outputs
+        all_mask = self.all_mask
+        found = 0
+        s = 0
+        for b in data:
+            s = table[s + cmap[b]]
+            if outputs[s]:
+                found |= outputs[s]
+                if found == all_mask:
+                    break
+        return found
+
+
+class LiteralPrefilter:
+    """
+    Prefilter untuk daftar regex.
+
+    candidates() mengembalikan indeks pattern (urut sesuai input) yang
+    mungkin cocok. Pattern yang tidak terpilih dijamin tidak cocok.
+
+    Loop Aho-Corasick berjalan di Python (±150 ns/byte), sedangkan
+    ``lit in text`` berjalan di C. Untuk himpunan literal kecil
+    (<= direct_limit) pencarian substring langsung lebih cepat; untuk
+    ribuan signature automaton AC yang dipakai (biaya tetap per byte).
+
+    Dengan pattern sedikit (< min_patterns) menjalankan semua regex
+    terkompilasi lebih murah daripada prefilter, sehingga prefilter
+    nonaktif dan candidates() mengembalikan semua indeks.
+    """
+
+    def __init__(self, patterns: Sequence[str], flags: int = re.IGNORECASE,
+                 direct_limit: int = 48, min_patterns: int = 16):
+        self.patterns = list(patterns)
+        literal_ids = {}
+        self.group_masks: List[List[int]] = []
+        pattern_groups = []
+
+        for pattern in self.patterns:
+            groups = [[literal_ids.setdefault(lit, len(literal_ids)) for lit in sorted(group)]
+                      for group in required_literals(pattern, flags)]
+            pattern_groups.append(groups)
+            self.group_masks.append([sum(1 << i for i in ids) for ids in groups])
+
+        self.literals = sorted(literal_ids, key=literal_ids.get)
+        
+        # Indeks pemicu: setiap pattern didaftarkan pada literal dari grup
+        # paling selektif, sehingga hanya literal yang ditemukan yang
+        # perlu ditelusuri (bukan seluruh daftar pattern)
+        self.always: List[int] = []
+        self.by_literal: List[List[int]] = [[] for _ in self.literals]
+        for i, groups in enumerate(pattern_groups):
+            if not groups:
+                self.always.append(i)
+                continue
+            trigger = max(groups, key=lambda ids: min(len(self.literals[j]) for j in ids))
+            for j in trigger:
+                self.by_literal[j].append(i)
+        self.trigger_rows = _trigger_rows(self.literals, pattern_groups)
+        self.automaton = AhoCorasick(self.literals)
+        self.use_automaton = len(self.literals) > direct_limit
+        self._direct = [(lit, 1 << i) for i, lit in enumerate(self.literals)]
+        self._direct_bytes = [(lit.encode('ascii'), bit) for lit, bit in self._direct]
+        self.all_candidates = list(range(len(self.patterns)))
+        self.enabled = len(self.patterns) >= min_patterns
+
+    def scan(self, text) -> int:
+        """Bitmask literal yang muncul di text (str ASCII atau bytes/memoryview/mmap)."""
+        if self.use_automaton:
+            if isinstance(text, str):
+                text = text.encode('ascii')
+            elif not isinstance(text, (bytes, bytearray)):
+                text = memoryview(text).cast('B')
+            return self.automaton.scan(text)
+        if isinstance(text, str):
+            literals = self._direct
+        else:
+            literals = self._direct_bytes
+            if not isinstance(text, (bytes, bytearray)):
+                text = bytes(text)  # memoryview/mmap tidak punya lower()
+        text = text.lower()
+        found = 0
+        for lit, bit in literals:
+            if lit in text:
+                found |= bit
+        return found
+
+    def candidates(self, text) -> List[int]:
+        """Indeks pattern yang anchor-nya semua muncul di text."""
+        if not self.enabled:
+            return self.all_candidates
+        if isinstance(text, str) and not text.isascii():
+            # Case folding Unicode (mis. 'ſ' ~ 's') tidak ditangani
+            return self.all_candidates
+        found = self.scan(text)
+        triggered = set(self.always)
+        rest = found
+        while rest:
+            low = rest & -rest
+            triggered.update(self.by_literal[low.bit_length() - 1])
+            rest ^= low
+        
+        group_masks = self.group_masks
+        result = []
+        for i in sorted(triggered):
+            for mask in group_masks[i]:
+                if not found & mask:
+                    break
+            else:
+                result.append(i)
+        return result
@@ -0,0 +1,726 @@
+"""
+NFA (Thompson) + Pike VM untuk scanning resumable
+=================================================
+Regex `re` butuh seluruh payload sebagai satu string. Modul ini
+meng-compile pattern (parse tree sre) menjadi program NFA dan
+menjalankannya sebagai Pike VM: state simulasi hanya daftar thread
+(pc, offset awal) yang masih hidup, paling banyak satu per instruksi.
+Memori tetap O(ukuran program) berapa pun panjang input, dan input
+bisa diberikan per potongan (feed) dengan match yang melewati batas
+potongan tetap terdeteksi.
+
+Instruksi program:
+    CHAR   (tes karakter, next)    konsumsi satu karakter
+    SPLIT  (x, y)                  cabang epsilon (prioritas x)
+    JMP    (x, loop)               loop: None / (SPLIT repeat, keluar)
+    ASSERT (jenis, next)           ^ $ \\A \\Z \\b \\B
+    MATCH  (indeks pattern)
+
+Tes satu karakter di-compile dari node sre aslinya (LITERAL, IN, ANY,
+...) dengan flag efektif, sehingga IGNORECASE, \\s, \\w dsb. sama
+persis dengan `re`. Lookaround, backreference, possessive/atomic dan
+$ non-MULTILINE tidak didukung (UnsupportedPattern).
+"""
+
+import codecs
+import re
+from typing import List, Optional, Sequence, Tuple
+
+try:
+    import re._parser as sre_parse
+    import re._compiler as sre_compile
+    import re._constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_compile
+    import sre_constants
+
+CHAR, SPLIT, JMP, ASSERT, MATCH = range(5)
+
+# Jenis ASSERT
+AT_START, AT_LINE_START, AT_END, AT_LINE_END, AT_WORD, AT_NOT_WORD = range(6)
+
+# Batas ukuran program per pattern (repeat {m,n} diekspansi)
+MAX_PROGRAM = 4096
+
+_LOCAL_FLAGS = re.IGNORECASE | re.MULTILINE | re.DOTALL
+
+
+class UnsupportedPattern(ValueError):
+    """Konstruksi regex yang tidak bisa dijalankan sebagai NFA murni."""
+
+
+# Nama opcode sre → konstanta (node dibekukan sebagai tuple nama + int)
+_CONSTANTS = {c.name: c for c in vars(sre_constants).values()
+              if isinstance(c, sre_constants._NamedIntConstant)}
+
+
+def _freeze(value):
+    """Node sre → tuple hashable dan bisa di-pickle (opcode jadi nama)."""
+    name = getattr(value, 'name', None)
+    if name is not None:
+        return name
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value):
+    """Kebalikan _freeze."""
+    if isinstance(value, str):
+        return _CONSTANTS[value]
+    if isinstance(value, tuple):
+        items = [_thaw(v) for v in value]
+        # av IN berupa list di parse tree sre
+        return items if value and isinstance(value[0], tuple) else tuple(items)
+    return value
+
+
+class CharTest:
+    """
+    Tes satu karakter (node sre + flag efektif).
+
+    Hasil untuk Latin-1 (ord < 256) dihitung sekali saat dibangun dan
+    disimpan di tabel 256 slot; hanya karakter lain yang memakai regex
+    (di-compile saat pertama dibutuhkan). Memori tetap terbatas walau
+    payload membawa banyak karakter Unicode berbeda, dan CharTest yang
+    di-pickle (artifact ruleset) tidak perlu di-compile ulang.
+    """
+
+    __slots__ = ('key', 'flags', 'table', '_regex')
+
+    def __init__(self, node, flags: int):
+        self.key = _freeze(node)
+        self.flags = flags
+        regex = self._regex = sre_compile.compile(_subpattern([node]), flags)
+        self.table = [regex.fullmatch(chr(code)) is not None for code in range(256)]
+
+    @property
+    def node(self):
+        return _thaw(self.key)
+
+    @property
+    def regex(self) -> re.Pattern:
+        if self._regex is None:
+            self._regex = sre_compile.compile(_subpattern([self.node]), self.flags)
+        return self._regex
+
+    def __getstate__(self):
+        return self.key, self.flags, self.table
+
+    def __setstate__(self, state):
+        self.key, self.flags, self.table = state
+        self._regex = None
+
+    def __call__(self, ch: str) -> bool:
+        code = ord(ch)
+        if code < 256:
+            return self.table[code]
+        return self.regex.fullmatch(ch) is not None
+
+
+def _subpattern(data) -> 'sre_parse.SubPattern':
+    return sre_parse.SubPattern(sre_parse.State(), data)
+
+
+class Program:
+    """
+    Program NFA gabungan untuk beberapa pattern.
+
+    Thread mulai di pc 0 (SPLIT berantai ke awal setiap pattern);
+    MATCH membawa indeks pattern. ops/arg1/arg2 adalah list paralel.
+
+    pool (dict) dipakai bersama beberapa Program agar CharTest untuk
+    node yang sama (mis. \\s pada ribuan signature) hanya dibangun
+    sekali. link() menggabungkan program yang sudah jadi (mis. hasil
+    validasi per pattern) dan part(k) mengambil kembali program satu
+    pattern, keduanya tanpa parse dan compile ulang.
+    """
+
+    def __init__(self, patterns: Sequence[str], flags: int = 0,
+                 pool: Optional[dict] = None):
+        self.patterns = list(patterns)
+        self.ops: List[int] = []
+        self.arg1: List = []
+        self.arg2: List = []
+        self.tests: List[CharTest] = []
+        self._test_ids = {}
+        self._pool = pool if pool is not None else {}
+
+        # Rantai SPLIT di awal: pattern ke-k dicoba sebelum ke-k+1
+        starts = []
+        for k in range(len(self.patterns) - 1):
+            starts.append(self._emit(SPLIT, None, None))
+        # spans[k] = rentang pc kode pattern ke-k (untuk part())
+        self.spans: List[Tuple[int, int]] = []
+        for k, pattern in enumerate(self.patterns):
+            size = len(self.ops)
+            try:
+                tree = sre_parse.parse(pattern, flags)
+            except re.error as e:
+                raise UnsupportedPattern(f"{pattern!r}: {e}") from None
+            self._seq(tree.data, tree.state.flags)
+            self._emit(MATCH, k, None)
+            if len(self.ops) - size > MAX_PROGRAM:
+                raise UnsupportedPattern(f"{pattern!r}: program NFA terlalu besar")
+            self.spans.append((size, len(self.ops)))
+        self._chain(starts, [begin for begin, _ in self.spans])
+
+    @classmethod
+    def _empty(cls, patterns: List[str], pool: dict) -> 'Program':
+        program = cls.__new__(cls)
+        program.patterns = patterns
+        program.ops, program.arg1, program.arg2 = [], [], []
+        program.tests = []
+        program._test_ids = {}
+        program._pool = pool
+        program.spans = []
+        return program
+
+    @classmethod
+    def link(cls, programs: Sequence['Program']) -> 'Program':
+        """Satu Program dari beberapa Program (urutan pattern dipertahankan)."""
+        linked = cls._empty([p for program in programs for p in program.patterns],
+                            programs[0]._pool if programs else {})
+        starts = [linked._emit(SPLIT, None, None) for _ in programs[1:]]
+        entries = []
+        base = 0
+        for program in programs:
+            offset = len(linked.ops)
+            entries.append(offset)
+            ids = [linked._test_id(test) for test in program.tests]
+            linked._copy(program, 0, len(program.ops), offset, ids, base)
+            linked.spans += [(begin + offset, end + offset) for begin, end in program.spans]
+            base += len(program.patterns)
+        linked._chain(starts, entries)
+        return linked
+
+    def part(self, k: int) -> 'Program':
+        """Program untuk pattern ke-k saja (potongan kode, tanpa compile ulang)."""
+        begin, end = self.spans[k]
+        program = self._empty([self.patterns[k]], self._pool)
+        program.tests = self.tests
+        program._test_ids = self._test_ids
+        program._copy(self, begin, end, -begin, None, -k)
+        program.spans = [(0, len(program.ops))]
+        program._chain([], [0])
+        return program
+
+    def _copy(self, program: 'Program', begin: int, end: int, offset: int,
+              ids: Optional[List[int]], base: int):
+        """Salin kode program[begin:end]: pc + offset, tes lewat ids, MATCH + base."""
+        ops, arg1, arg2 = program.ops, program.arg1, program.arg2
+        for pc in range(begin, end):
+            op, a, b = ops[pc], arg1[pc], arg2[pc]
+            if op == CHAR:
+                a, b = (ids[a] if ids is not None else a), b + offset
+            elif op == SPLIT:
+                a, b = a + offset, b + offset
+            elif op == JMP:
+                a += offset
+                if b is not None:
+                    b = (b[0] + offset, b[1] + offset)
+            elif op == ASSERT:
+                b += offset
+            else:
+                a += base
+            self._emit(op, a, b)
+
+    def _chain(self, starts: List[int], entries: List[int]):
+        """Isi rantai SPLIT awal: entri ke-k dicoba sebelum ke-k+1."""
+        for k, pc in enumerate(starts):
+            self.arg1[pc] = entries[k]
+            self.arg2[pc] = starts[k + 1] if k + 1 < len(starts) else entries[k + 1]
+        # SPLIT repeat opsional (badan di pc + 1), lihat search()
+        self.loops = frozenset(loop[0] for op, loop in zip(self.ops, self.arg2)
+                               if op == JMP and loop is not None)
+        self._skip = False
+
+    @property
+    def skip(self) -> Optional[re.Pattern]:
+        """Regex lompat (_skip_regex), di-compile saat pertama dipakai."""
+        if self._skip is False:
+            self._skip = self._skip_regex() if self.ops else None
+        return self._skip
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Regex hasil sre_compile dari parse tree tidak bisa di-pickle
+        state['_skip'] = False
+        state['_pool'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._pool = {}
+
+    def _test_id(self, test: CharTest) -> int:
+        """Indeks test di program ini (CharTest yang sama dipakai sekali)."""
+        key = (test.key, test.flags)
+        tid = self._test_ids.get(key)
+        if tid is None:
+            tid = self._test_ids[key] = len(self.tests)
+            self.tests.append(test)
+        return tid
+
+    def _emit(self, op: int, a, b) -> int:
+        self.ops.append(op)
+        self.arg1.append(a)
+        self.arg2.append(b)
+        return len(self.ops) - 1
+
+    def _seq(self, seq, flags: int):
+        for op, av in seq:
+            self._node(op, av, flags)
+
+    def _node(self, op, av, flags: int):
+        if op in (sre_parse.LITERAL, sre_parse.NOT_LITERAL, sre_parse.IN, sre_parse.ANY):
+            key = (_freeze((op, av)), flags)
+            test = self._pool.get(key)
+            if test is None:
+                test = self._pool[key] = CharTest((op, av), flags)
+            pc = len(self.ops)
+            self._emit(CHAR, self._test_id(test), pc + 1)
+        elif op is sre_parse.SUBPATTERN:
+            _, add_flags, del_flags, body = av
+            self._seq(body, (flags | add_flags) & ~del_flags)
+        elif op is sre_parse.BRANCH:
+            alternatives = av[1]
+            jumps = []
+            for k, alt in enumerate(alternatives):
+                if k < len(alternatives) - 1:
+                    split = self._emit(SPLIT, len(self.ops) + 1, None)
+                    self._seq(alt, flags)
+                    jumps.append(self._emit(JMP, None, None))
+                    self.arg2[split] = len(self.ops)
+                else:
+                    self._seq(alt, flags)
+            for pc in jumps:
+                self.arg1[pc] = len(self.ops)
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            # Greedy dan lazy mengenali bahasa yang sama; bedanya hanya
+            # prioritas SPLIT (lazy memilih keluar lebih dulu), yang
+            # dipakai search() untuk teks match yang sama dengan `re`.
+            # JMP di akhir iterasi opsional membawa (SPLIT, keluar):
+            # search() keluar dari repeat setelah iterasi kosong (sre)
+            low, high, item = av
+            if (high if high != sre_parse.MAXREPEAT else low) > MAX_PROGRAM:
+                raise UnsupportedPattern(f"repeat {{{low},{high}}} terlalu besar")
+            for _ in range(low):
+                self._seq(item, flags)
+            splits = []
+            jumps = []
+            if high == sre_parse.MAXREPEAT:
+                loop = self._emit(SPLIT, len(self.ops) + 1, None)
+                self._seq(item, flags)
+                jumps.append(self._emit(JMP, loop, loop))
+                splits.append(loop)
+            else:
+                for _ in range(high - low):
+                    split = self._emit(SPLIT, len(self.ops) + 1, None)
+                    self._seq(item, flags)
+                    jumps.append(self._emit(JMP, len(self.ops) + 1, split))
+                    splits.append(split)
+            end = len(self.ops)
+            for pc in splits:
+                self.arg2[pc] = end
+            for pc in jumps:
+                self.arg2[pc] = (self.arg2[pc], end)
+            if op is sre_parse.MIN_REPEAT:
+                for pc in splits:
+                    self.arg1[pc], self.arg2[pc] = self.arg2[pc], self.arg1[pc]
+        elif op is sre_parse.AT:
+            self._emit(ASSERT, _assertion(av, flags), len(self.ops) + 1)
+        else:
+            raise UnsupportedPattern(f"konstruksi {op} tidak didukung")
+
+    def closure_chars(self) -> Tuple[List[int], bool]:
+        """
+        Tes karakter yang bisa dicapai dari pc 0 lewat epsilon (ASSERT
+        dianggap lolos), dan apakah MATCH bisa dicapai tanpa karakter.
+        """
+        seen = set()
+        stack = [0]
+        tests = []
+        empty = False
+        while stack:
+            pc = stack.pop()
+            if pc in seen:
+                continue
+            seen.add(pc)
+            op = self.ops[pc]
+            if op == CHAR:
+                tests.append(self.arg1[pc])
+            elif op == MATCH:
+                empty = True
+            elif op == SPLIT:
+                stack += (self.arg2[pc], self.arg1[pc])
+            elif op == JMP:
+                stack.append(self.arg1[pc])
+            else:
+                stack.append(self.arg2[pc])
+        return tests, empty
+
+    def _skip_regex(self) -> Optional[re.Pattern]:
+        """
+        Regex (C) untuk melompat ke posisi berikutnya yang bisa memulai
+        match: gabungan tes karakter pertama setiap pattern. None bila
+        ada pattern yang bisa match tanpa karakter.
+        """
+        tests, empty = self.closure_chars()
+        if empty or not tests:
+            return None
+        branches = []
+        for i in dict.fromkeys(tests):
+            test = self.tests[i]
+            local = test.flags & _LOCAL_FLAGS
+            branches.append(_subpattern([(sre_parse.SUBPATTERN, (
+                None, local, _LOCAL_FLAGS & ~local, _subpattern([test.node])))]))
+        flags = self.tests[tests[0]].flags & ~_LOCAL_FLAGS
+        return sre_compile.compile(_subpattern([(sre_parse.BRANCH, (None, branches))]), flags)
+
+
+def _assertion(av, flags: int) -> int:
+    multiline = flags & re.MULTILINE
+    if av is sre_parse.AT_BEGINNING:
+        return AT_LINE_START if multiline else AT_START
+    if av is sre_parse.AT_BEGINNING_STRING:
+        return AT_START
+    if av is sre_parse.AT_END and multiline:
+        return AT_LINE_END
+    if av is sre_parse.AT_END_STRING:
+        return AT_END
+    if av is sre_parse.AT_BOUNDARY:
+        return AT_WORD
+    if av is sre_parse.AT_NON_BOUNDARY:
+        return AT_NOT_WORD
+    # $ tanpa MULTILINE juga cocok sebelum '\n' terakhir; pada stream
+    # belum diketahui apakah '\n' itu memang karakter terakhir
+    raise UnsupportedPattern(f"assertion {av} tidak didukung")
+
+
+def _is_word(ch: Optional[str]) -> bool:
+    return ch is not None and (ch.isalnum() or ch == '_')
+
+
+def _check(kind: int, prev: Optional[str], nxt: Optional[str]) -> bool:
+    """Evaluasi ASSERT di antara karakter prev dan nxt (None = batas input)."""
+    if kind == AT_START:
+        return prev is None
+    if kind == AT_LINE_START:
+        return prev is None or prev == '\n'
+    if kind == AT_END:
+        return nxt is None
+    if kind == AT_LINE_END:
+        return nxt is None or nxt == '\n'
+    if prev is None and nxt is None:
+        return False  # input kosong: \b dan \B sama-sama gagal (seperti sre)
+    boundary = _is_word(prev) != _is_word(nxt)
+    return boundary if kind == AT_WORD else not boundary
+
+
+_NO_LOOPS = frozenset()
+
+
+def search(program: Program, text: str, pos: int = 0) -> Optional[Tuple[int, int, int]]:
+    """
+    Match pertama dengan semantik `re.search` (leftmost-first), waktu
+    O(len(text) × ukuran program) tanpa backtracking.
+
+    Thread diurutkan menurut prioritas; begitu MATCH tercapai, thread
+    berprioritas lebih rendah dibuang dan sisanya berjalan sampai habis,
+    sehingga teks match sama dengan `re` (greedy/lazy, alternatif kiri
+    dulu). Seperti sre, iterasi repeat yang selesai tanpa mengonsumsi
+    karakter tidak diulang lagi: closure mencatat SPLIT repeat yang
+    dimasuki di posisi ini (entered) dan JMP akhir iterasinya langsung
+    keluar. Closure di-dedup per (pc, entered); entered hanya memuat
+    repeat yang membungkus pc, jadi faktor tambahannya dibatasi
+    kedalaman repeat opsional bersarang.
+    Returns (indeks pattern, start, end) atau None.
+    """
+    ops, tests, arg1, arg2 = program.ops, program.tests, program.arg1, program.arg2
+    skip, loops = program.skip, program.loops
+    threads: List[Tuple[int, int]] = []
+    match = None
+    n = len(text)
+    i = pos - 1
+    while i < n:
+        i += 1
+        if skip is not None and not threads and match is None:
+            # Belum ada thread: lompat ke posisi yang bisa memulai match
+            found = skip.search(text, i)
+            if found is None:
+                return None
+            i = found.start()
+        prev = text[i - 1] if i > 0 else None
+        nxt = text[i] if i < n else None
+        if match is None:
+            threads.append((0, i))
+        seen = set()
+        chars = set()
+        out = []
+        stack = [(pc, start, _NO_LOOPS) for pc, start in reversed(threads)]
+        while stack:
+            pc, start, entered = stack.pop()
+            key = (pc, entered) if entered else pc
+            if key in seen:
+                continue
+            seen.add(key)
+            op = ops[pc]
+            if op == CHAR:
+                # Setelah karakter dikonsumsi entered tidak lagi berarti
+                if pc not in chars:
+                    chars.add(pc)
+                    out.append((pc, start))
+            elif op == SPLIT:
+                if pc in loops:
+                    inside = entered | {pc}
+                    x, y = arg1[pc], arg2[pc]
+                    stack.append((y, start, inside if y == pc + 1 else entered))
+                    stack.append((x, start, inside if x == pc + 1 else entered))
+                else:
+                    stack.append((arg2[pc], start, entered))
+                    stack.append((arg1[pc], start, entered))
+            elif op == JMP:
+                loop = arg2[pc]
+                if loop is not None and loop[0] in entered:
+                    # Iterasi kosong: keluar dari repeat (tidak diulang lagi)
+                    stack.append((loop[1], start, entered - {loop[0]}))
+                else:
+                    stack.append((arg1[pc], start, entered))
+            elif op == ASSERT:
+                if _check(arg1[pc], prev, nxt):
+                    stack.append((arg2[pc], start, entered))
+            else:
+                match = (arg1[pc], start, i)
+                break  # sisa stack berprioritas lebih rendah
+        if nxt is None:
+            break
+        threads = [(arg2[pc], start) for pc, start in out if tests[arg1[pc]](nxt)]
+        if match is not None and not threads:
+            break
+    return match
+
+
+class PikeVM:
+    """
+    Simulasi Program secara resumable.
+
+    feed(text) memproses potongan berikutnya dan mengembalikan match
+    pertama (pattern, start, end) dengan offset absolut sejak awal
+    stream, atau None. finish() menandai akhir input (untuk $ dan \\b
+    di posisi terakhir). Setelah match, VM berhenti (verdict final).
+    """
+
+    def __init__(self, program: Program):
+        self.program = program
+        self.pending: List[Tuple[int, int]] = []  # (pc, start) sebelum closure
+        self.prev: Optional[str] = None
+        self.offset = 0
+        self.match: Optional[Tuple[int, int, int]] = None
+
+    def _closure(self, threads, prev, nxt) -> List[Tuple[int, int]]:
+        """Closure epsilon (urut prioritas); MATCH dicatat ke self.match."""
+        ops, arg1, arg2 = self.program.ops, self.program.arg1, self.program.arg2
+        seen = set()
+        out = []
+        stack = list(reversed(threads))
+        while stack:
+            pc, start = stack.pop()
+            if pc in seen:
+                continue
+            seen.add(pc)
+            op = ops[pc]
+            if op == CHAR:
+                out.append((pc, start))
+            elif op == SPLIT:
+                stack.append((arg2[pc], start))
+                stack.append((arg1[pc], start))
+            elif op == JMP:
+                stack.append((arg1[pc], start))
+            elif op == ASSERT:
+                if _check(arg1[pc], prev, nxt):
+                    stack.append((arg2[pc], start))
+            elif self.match is None or start < self.match[1]:
+                self.match = (arg1[pc], start, self.offset)
+        return out
+
+    def feed(self, text: str) -> Optional[Tuple[int, int, int]]:
+        if self.match is not None:
+            return self.match
+        program = self.program
+        tests, arg1, arg2 = program.tests, program.arg1, program.arg2
+        skip = program.skip
+        pending, prev = self.pending, self.prev
+        i, n = 0, len(text)
+        base = self.offset
+        while i < n:
+            if not pending and skip is not None:
+                # Tidak ada thread hidup: lompat ke calon awal match berikutnya
+                found = skip.search(text, i)
+                j = found.start() if found else n
+                if j > i:
+                    prev = text[j - 1]
+                    i = j
+                    self.offset = base + i
+                    if i == n:
+                        break
+            ch = text[i]
+            threads = self._closure(pending + [(0, self.offset)], prev, ch)
+            if self.match is not None:
+                self.pending, self.prev = [], prev
+                return self.match
+            pending = [(arg2[pc], start) for pc, start in threads if tests[arg1[pc]](ch)]
+            prev = ch
+            i += 1
+            self.offset = base + i
+        self.pending, self.prev = pending, prev
+        return None
+
+    def finish(self) -> Optional[Tuple[int, int, int]]:
+        """Akhir input: closure terakhir dengan nxt=None."""
+        if self.match is None:
+            self._closure(self.pending + [(0, self.offset)], self.prev, None)
+            self.pending = []
+        return self.match
+
+    def live_threads(self) -> int:
+        """Jumlah thread yang menunggu karakter berikutnya (ukuran state)."""
+        return len(self.pending)
+
+
+class StreamRules:
+    """
+    Kumpulan rule untuk scanning stream (dibangun sekali, dipakai bersama).
+
+    rules: list of (pattern, info); info (dict) disalin ke hasil saat
+    pattern tersebut match. empty: field hasil bila tidak ada match
+    (default None untuk setiap key info). Pattern yang tidak didukung NFA dicek
+    dengan `re` di jendela geser `window` karakter terakhir (tepat
+    untuk match yang lebih pendek dari jendela dan konteks sesudah
+    match yang tidak lebih dari HOLD karakter).
+    """
+
+    HOLD = 64
+
+    def __init__(self, rules: Sequence[Tuple[str, dict]], flags: int = re.IGNORECASE,
+                 window: int = 4096, empty: Optional[dict] = None):
+        programs, fallback = [], []
+        pool = {}
+        self.infos = []
+        for pattern, info in rules:
+            try:
+                programs.append(Program([pattern], flags, pool))
+            except UnsupportedPattern:
+                fallback.append((re.compile(pattern, flags), info))
+            else:
+                self.infos.append(info)
+        self.program = Program.link(programs) if programs else None
+        self.fallback = fallback
+        self.window = window
+        self.empty = {key: None for _, info in rules for key in info}
+        if empty is not None:
+            self.empty.update(empty)
+
+    def scanner(self) -> 'StreamScanner':
+        return StreamScanner(self)
+
+
+class StreamScanner:
+    """
+    Scanner resumable: feed(chunk) berkali-kali, lalu finish().
+
+    feed() mengembalikan dict hasil begitu ada match (verdict final,
+    chunk berikutnya diabaikan), selain itu None. chunk boleh str atau
+    bytes (UTF-8 di-decode bertahap; karakter multi-byte boleh terpotong
+    di antara chunk). Memori terbatas: state Pike VM + ekor teks
+    (jendela fallback / bukti match).
+
+    Hasil: detected, field info rule, pattern (teks match bila masih di
+    ekor), span (offset karakter sejak awal stream).
+    """
+
+    EVIDENCE = 256
+
+    def __init__(self, rules: StreamRules):
+        self.rules = rules
+        self.vm = PikeVM(rules.program) if rules.program is not None else None
+        self.result: Optional[dict] = None
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        self._tail = ''
+        self._keep = max(self.EVIDENCE,
+                         rules.window + rules.HOLD + 1 if rules.fallback else 0)
+        self._checked = 0
+        self.offset = 0
+
+    def feed(self, chunk) -> Optional[dict]:
+        if self.result is not None:
+            return self.result
+        if not isinstance(chunk, str):
+            chunk = self._decoder.decode(chunk)
+        return self._scan(chunk)
+
+    def finish(self) -> dict:
+        """Akhir stream; kembalikan hasil akhir (detected False bila bersih)."""
+        if self.result is None:
+            rest = self._decoder.decode(b'', final=True)
+            if rest:
+                self._scan(rest)
+        if self.result is None and self.vm is not None and self.vm.finish():
+            self._found(self.rules.infos, *self.vm.match)
+        if self.result is None and self.rules.fallback:
+            self._fallback(self._tail, self.offset - len(self._tail), final=True)
+        if self.result is None:
+            self.result = {'detected': False, **self.rules.empty,
+                           'pattern': None, 'span': None}
+        return self.result
+
+    def _scan(self, text: str) -> Optional[dict]:
+        tail_start = self.offset - len(self._tail)
+        window = self._tail + text
+        self.offset += len(text)
+
+        if self.vm is not None and self.vm.feed(text):
+            self._found(self.rules.infos, *self.vm.match, window, tail_start)
+        if self.result is None and self.rules.fallback:
+            self._fallback(window, tail_start, final=False)
+        self._tail = window[-self._keep:]
+        return self.result
+
+    def _fallback(self, window: str, window_start: int, final: bool):
+        """
+        Cek pattern fallback dengan `re` di jendela.
+
+        Sebelum akhir stream, match harus berakhir paling sedikit HOLD
+        karakter sebelum ujung jendela ($, \\b, lookahead belum tahu
+        teks sesudahnya); sisanya dicek ulang di chunk berikutnya atau
+        di finish(). Bila awal jendela sudah bergeser, karakter pertama
+        hanya menjadi konteks (^ dan lookbehind tidak salah match).
+        """
+        rules = self.rules
+        limit = len(window) if final else len(window) - rules.HOLD
+        checked = self._checked - window_start
+        if limit <= checked:
+            return
+        # Match yang berakhir sesudah `checked` dimulai paling jauh
+        # `window` karakter sebelumnya
+        begin = max(checked - rules.window, 1 if window_start > 0 else 0)
+        self._checked = window_start + limit
+        for regex, info in rules.fallback:
+            match = regex.search(window, begin)
+            if match and match.end() <= limit:
+                self.result = self._result(info, match.group(),
+                                           (window_start + match.start(),
+                                            window_start + match.end()))
+                return
+
+    def _found(self, infos, index: int, start: int, end: int,
+               window: Optional[str] = None, window_start: int = 0):
+        if window is None:
+            window, window_start = self._tail, self.offset - len(self._tail)
+        text = window[start - window_start:end - window_start] if start >= window_start else None
+        self.result = self._result(infos[index], text, (start, end))
+
+    @staticmethod
+    def _result(info: dict, text: Optional[str], span: Tuple[int, int]) -> dict:
+        return {'detected': True, **info, 'pattern': text, 'span': span}
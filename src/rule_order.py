@@ -0,0 +1,125 @@
+"""
+Urutan Evaluasi Rule Adaptif
+============================
+Mode first-match berhenti pada rule pertama yang match, jadi urutan
+evaluasi menentukan berapa regex yang dijalankan per payload. Untuk
+rule dengan peluang hit p (bila dievaluasi) dan biaya c, ekspektasi
+biaya terkecil dicapai dengan mengurutkan p / c menurun.
+
+RuleOrder mencatat evaluasi, hit dan biaya per rule hanya untuk satu
+dari `sample` payload; payload lain hanya dijalankan dalam urutan saat
+ini (tanpa pencatatan per regex). Setiap `interval` payload urutan
+dihitung ulang dan hitungan lama diperkecil (decay) agar urutan
+mengikuti perubahan trafik.
+
+Catatan: dengan urutan adaptif, rule yang dilaporkan untuk payload yang
+match beberapa rule bergantung pada trafik sebelumnya (dan berbeda per
+worker). DFASimulator karena itu memakai urutan deklarasi sebagai default.
+"""
+
+from typing import List, Sequence
+
+
+class RuleOrder:
+    """
+    Urutan evaluasi n rule + statistik evaluasi.
+
+    adaptive=False mempertahankan urutan deklarasi; yang dihitung hanya
+    jumlah payload dan evaluasi (tally).
+    """
+
+    def __init__(self, n: int, adaptive: bool = True, interval: int = 1024,
+                 sample: int = 16, decay: float = 0.5):
+        self.adaptive = adaptive
+        self.interval = interval
+        self.sample = sample
+        self.decay = decay
+        self.order: List[int] = list(range(n))
+        self.rank: List[int] = list(range(n))
+        self.hits = [0.0] * n
+        self.evals = [0.0] * n
+        self.cost = [0.0] * n
+        self.timed = [0.0] * n
+        self.payloads = 0
+        self.evaluated = 0
+        self.reorders = 0
+
+    def fork(self) -> 'RuleOrder':
+        """
+        Salinan untuk satu worker: urutan dan hitungan belajar ikut,
+        statistik (payloads, evaluated, reorders) mulai dari nol agar
+        merge() tidak menghitung dua kali.
+        """
+        other = RuleOrder(len(self.order), self.adaptive, self.interval,
+                          self.sample, self.decay)
+        other.order, other.rank = self.order, self.rank
+        other.hits, other.evals = list(self.hits), list(self.evals)
+        other.cost, other.timed = list(self.cost), list(self.timed)
+        return other
+
+    def merge(self, other: 'RuleOrder'):
+        """Tambahkan statistik worker (urutan milik worker tidak diambil)."""
+        self.payloads += other.payloads
+        self.evaluated += other.evaluated
+        self.reorders += other.reorders
+
+    def arrange(self, candidates: Sequence[int]) -> Sequence[int]:
+        """Kandidat (urut deklarasi) dalam urutan evaluasi saat ini."""
+        if len(candidates) < 2 or not self.adaptive:
+            return candidates
+        rank = self.rank
+        return sorted(candidates, key=rank.__getitem__)
+
+    def start(self) -> bool:
+        """
+        Awal satu payload (mode adaptif); True bila payload ini sampel:
+        setiap evaluasinya dicatat lewat record() beserta biayanya.
+        """
+        n = self.payloads + 1
+        if n % self.interval == 0:
+            self._reorder()
+        return n % self.sample == 0
+
+    def record(self, index: int, hit: bool, elapsed: float):
+        """Satu evaluasi rule index pada payload sampel."""
+        self.evals[index] += 1
+        if hit:
+            self.hits[index] += 1
+        self.cost[index] += elapsed
+        self.timed[index] += 1
+
+    def tally(self, evaluated: int):
+        """Akhir satu payload: jumlah rule yang dievaluasi (semua payload)."""
+        self.payloads += 1
+        self.evaluated += evaluated
+
+    def _reorder(self):
+        n = len(self.order)
+        costs = [self.cost[i] / self.timed[i] for i in range(n) if self.timed[i]]
+        default = sum(costs) / len(costs) if costs else 1.0
+        scores = []
+        for i in range(n):
+            # Laplace smoothing: rule yang jarang dievaluasi tidak ekstrem
+            p = (self.hits[i] + 1) / (self.evals[i] + 2)
+            c = self.cost[i] / self.timed[i] if self.timed[i] else default
+            scores.append(p / c if c > 0 else p)
+        order = sorted(range(n), key=lambda i: (-scores[i], i))
+        rank = [0] * n
+        for position, i in enumerate(order):
+            rank[i] = position
+        # List baru (bukan diubah di tempat): arrange() yang sedang jalan tetap konsisten
+        self.order, self.rank = order, rank
+        self.reorders += 1
+        for counts in (self.hits, self.evals, self.cost, self.timed):
+            for i in range(n):
+                counts[i] *= self.decay
+
+    def stats(self) -> dict:
+        """Jumlah payload, evaluasi, rata-rata rule dievaluasi per payload, urutan."""
+        return {
+            'payloads': self.payloads,
+            'evaluated': self.evaluated,
+            'avg_evaluated': self.evaluated / self.payloads if self.payloads else 0.0,
+            'reorders': self.reorders,
+            'order': list(self.order),
+        }
@@ -0,0 +1,332 @@
+"""
+Ruleset DSL untuk Mini-IDS
+==========================
+Loader dan compiler untuk signatures/rules.dsl.
+
+Format:
+    SIGNATURE <nama>
+        PATTERN: "<regex>"
+        SEVERITY: CRITICAL | HIGH | MEDIUM | LOW
+        RESPONSE: BLOCK | ALERT | LOG
+        MESSAGE: "<pesan>"
+
+Hasil kompilasi (signature tervalidasi + prefilter + program NFA
+LazyDFA beserta tabel tes karakternya) disimpan sebagai artifact pickle
+dengan nama berisi hash konten file DSL. Proses berikutnya cukup
+unpickle artifact tersebut; payload pertama yang sampai ke automaton
+tidak meng-compile ulang signature. Regex `re` per signature (fallback
+dan pembanding) baru di-compile saat pertama kali dibutuhkan.
+"""
+
+import hashlib
+import os
+import pickle
+import re
+import sys
+import tempfile
+from dataclasses import dataclass
+from typing import List, Optional
+
+from lazy_dfa import LazyDFA
+from prefilter import LiteralPrefilter
+
+# Naikkan jika format artifact berubah
+ARTIFACT_VERSION = 3
+
+DEFAULT_RULES = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', 'signatures', 'rules.dsl'
+)
+
+SEVERITIES = ('CRITICAL', 'HIGH', 'MEDIUM', 'LOW')
+RESPONSES = ('BLOCK', 'ALERT', 'LOG')
+FIELDS = ('PATTERN', 'SEVERITY', 'RESPONSE', 'MESSAGE')
+
+
+class RulesetError(ValueError):
+    """Kesalahan sintaks atau validasi pada file DSL."""
+
+    def __init__(self, message: str, source: str = '<dsl>', line: int = 0):
+        super().__init__(f"{source}:{line}: {message}")
+        self.source = source
+        self.line = line
+
+
+@dataclass
+class Signature:
+    """Satu signature dari file DSL."""
+    name: str
+    pattern: str
+    severity: str
+    response: str
+    message: str
+    line: int = 0
+
+
+def _unquote(value: str) -> str:
+    """Buang tanda kutip luar; isi pattern boleh memuat tanda kutip."""
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1]
+    return value
+
+
+def parse_dsl(text: str, source: str = '<dsl>') -> List[Signature]:
+    """
+    Parse teks DSL menjadi daftar Signature yang sudah divalidasi.
+
+    Raises:
+        RulesetError: sintaks salah, field hilang/duplikat, enum tidak
+            dikenal, regex tidak valid, atau nama signature duplikat.
+    """
+    signatures = []
+    names = set()
+    current = None
+
+    def finish():
+        if current is None:
+            return
+        name, line, fields = current
+        missing = [f for f in FIELDS if f not in fields]
+        if missing:
+            raise RulesetError(
+                f"signature '{name}' tidak punya field {', '.join(missing)}", source, line
+            )
+        signatures.append(Signature(name, fields['PATTERN'], fields['SEVERITY'],
+                                    fields['RESPONSE'], fields['MESSAGE'], line))
+
+    for lineno, raw in enumerate(text.splitlines(), 1):
+        line = raw.strip()
+        if not line or line.startswith('#'):
+            continue
+
+        if line.startswith('SIGNATURE'):
+            finish()
+            parts = line.split()
+            if len(parts) != 2 or not re.fullmatch(r'[A-Za-z_][A-Za-z0-9_]*', parts[1]):
+                raise RulesetError("format: SIGNATURE <nama>", source, lineno)
+            if parts[1] in names:
+                raise RulesetError(f"signature '{parts[1]}' duplikat", source, lineno)
+            names.add(parts[1])
+            current = (parts[1], lineno, {})
+            continue
+
+        key, sep, value = line.partition(':')
+        key = key.strip().upper()
+        if not sep or key not in FIELDS:
+            raise RulesetError(f"baris tidak dikenal: {line}", source, lineno)
+        if current is None:
+            raise RulesetError(f"{key} di luar blok SIGNATURE", source, lineno)
+        fields = current[2]
+        if key in fields:
+            raise RulesetError(f"field {key} duplikat", source, lineno)
+
+        value = value.strip()
+        if key in ('PATTERN', 'MESSAGE'):
+            value = _unquote(value)
+        else:
+            value = value.upper()
+
+        if key == 'PATTERN':
+            try:
+                re.compile(value, re.IGNORECASE)
+            except re.error as e:
+                raise RulesetError(f"regex tidak valid: {e}", source, lineno) from None
+        elif key == 'SEVERITY' and value not in SEVERITIES:
+            raise RulesetError(f"SEVERITY harus salah satu {SEVERITIES}", source, lineno)
+        elif key == 'RESPONSE' and value not in RESPONSES:
+            raise RulesetError(f"RESPONSE harus salah satu {RESPONSES}", source, lineno)
+        fields[key] = value
+
+    finish()
+    return signatures
+
+
+class Ruleset:
+    """
+    Ruleset terkompilasi: signature + prefilter literal.
+
+    Signature dicocokkan bersama oleh satu LazyDFA (waktu linear, tanpa
+    backtracking); hanya signature yang tidak bisa dijadikan NFA
+    (lookaround, backreference) yang memakai `re`. Automaton dibangun
+    saat pertama dipakai (load_ruleset membangunnya sebelum menulis
+    artifact, jadi ikut tersimpan); regex `re` selalu lazy.
+    """
+
+    def __init__(self, signatures: List[Signature], version: str = ''):
+        self.signatures = signatures
+        self.version = version
+        self.prefilter = LiteralPrefilter([s.pattern for s in signatures])
+        self._compiled: List[Optional[re.Pattern]] = [None] * len(signatures)
+        self._automaton: Optional[LazyDFA] = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Objek regex tidak disimpan di artifact (dibangun ulang lazily);
+        # automaton disimpan tanpa cache transisi (lihat LazyDFA.__getstate__)
+        state['_compiled'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._compiled = [None] * len(self.signatures)
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def regex(self, index: int) -> re.Pattern:
+        """Regex terkompilasi untuk signature ke-index."""
+        regex = self._compiled[index]
+        if regex is None:
+            regex = re.compile(self.signatures[index].pattern, re.IGNORECASE)
+            self._compiled[index] = regex
+        return regex
+
+    @property
+    def automaton(self) -> LazyDFA:
+        """LazyDFA untuk semua signature (dibangun saat pertama kali dipakai)."""
+        if self._automaton is None:
+            self._automaton = LazyDFA([s.pattern for s in self.signatures], re.IGNORECASE)
+        return self._automaton
+
+    def check(self, payload: str, all_matches: bool = False) -> dict:
+        """
+        Cek payload terhadap signature (urutan deklarasi, match pertama).
+
+        all_matches=True: semua signature diperiksa; hasil memuat
+        matches (setiap signature yang match beserta span, urut posisi)
+        dan field utama diisi dari match paling kiri.
+
+        Returns:
+            dict dengan detected, type, severity, pattern, signature,
+            response, message, span [, matches]
+        """
+        result = {
+            'detected': False,
+            'type': None,
+            'severity': None,
+            'pattern': None,
+            'signature': None,
+            'response': None,
+            'message': None,
+            'span': None,
+        }
+        if all_matches:
+            result['matches'] = matches = []
+
+        matched = None
+        for i in self.prefilter.candidates(payload):
+            automaton = self.automaton
+            if i in automaton.unsupported:
+                match = self.regex(i).search(payload)
+                span = match.span() if match else None
+            else:
+                if matched is None:
+                    # Satu pass untuk semua signature, hanya bila ada kandidat
+                    matched = automaton.scan(payload)
+                span = automaton.locate(i, payload) if matched >> i & 1 else None
+            if span is not None:
+                if not all_matches:
+                    result.update(self._match(i, payload, span), detected=True)
+                    break
+                matches.append(self._match(i, payload, span))
+
+        if all_matches and matches:
+            matches.sort(key=lambda m: m['span'])
+            result.update(matches[0], detected=True)
+        return result
+
+    def _match(self, index: int, payload: str, span: tuple) -> dict:
+        """Field hasil untuk signature ke-index yang match di span."""
+        sig = self.signatures[index]
+        return {
+            'type': sig.name,
+            'severity': sig.severity,
+            'pattern': payload[span[0]:span[1]],
+            'signature': sig.name,
+            'response': sig.response,
+            'message': sig.message,
+            'span': span,
+        }
+
+
+def compile_ruleset(text: str, source: str = '<dsl>') -> Ruleset:
+    """Parse + validasi + bangun struktur matching dari teks DSL."""
+    return Ruleset(parse_dsl(text, source), ruleset_version(text.encode('utf-8')))
+
+
+def ruleset_version(data: bytes) -> str:
+    """Hash konten DSL + versi artifact + versi Python (format regex)."""
+    h = hashlib.sha256()
+    h.update(f"{ARTIFACT_VERSION}:{sys.version_info[:2]}:".encode())
+    h.update(data)
+    return h.hexdigest()
+
+
+def load_ruleset(path: str = DEFAULT_RULES, cache_dir: Optional[str] = None,
+                 use_cache: bool = True) -> Ruleset:
+    """
+    Muat ruleset, memakai artifact cache bila hash konten cocok.
+
+    Artifact disimpan di ``cache_dir`` (default: ``__rulecache__`` di
+    samping file DSL) dengan nama ``<nama>-<hash>.pickle``. Artifact
+    yang rusak atau tidak cocok dikompilasi ulang dan ditimpa.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    version = ruleset_version(data)
+
+    if not use_cache:
+        return Ruleset(parse_dsl(data.decode('utf-8'), path), version)
+
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(path)), '__rulecache__')
+    stem = os.path.splitext(os.path.basename(path))[0]
+    artifact = os.path.join(cache_dir, f"{stem}-{version[:16]}.pickle")
+
+    try:
+        with open(artifact, 'rb') as f:
+            ruleset = pickle.load(f)
+        if isinstance(ruleset, Ruleset) and ruleset.version == version:
+            return ruleset
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        pass
+
+    ruleset = Ruleset(parse_dsl(data.decode('utf-8'), path), version)
+    ruleset.automaton  # dibangun sekarang agar ikut tersimpan di artifact
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Tulis atomik agar proses paralel tidak membaca artifact setengah jadi
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(ruleset, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, artifact)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        pass  # Cache hanya optimasi; direktori read-only tetap jalan
+    return ruleset
+
+
+# ============ TEST ============
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_RULES
+
+    print("=" * 50)
+    print("RULESET DSL")
+    print("=" * 50)
+
+    try:
+        rules = load_ruleset(path)
+    except RulesetError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print(f"Versi: {rules.version[:16]}  ({len(rules)} signature)")
+    for sig in rules.signatures:
+        print(f"  {sig.name:<20} {sig.severity:<9} {sig.response:<6} {sig.pattern}")
+
+    for payload in ["username=admin", "1 UNION SELECT pass", "x; DROP TABLE users"]:
+        result = rules.check(payload)
+        status = f"🚨 {result['signature']}" if result['detected'] else "✅ CLEAN"
+        print(f"\n{payload}\n  {status}")
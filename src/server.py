@@ -0,0 +1,291 @@
+"""
+HTTP Inspection Service untuk Mini-IDS
+======================================
+Server HTTP/1.1 berbasis asyncio (stdlib saja) yang memakai satu Engine
+bersama untuk semua request.
+
+Endpoint:
+    POST /analyze   Content-Type application/json: {"payload": "..."} atau
+                    {"payloads": [...]}; content type lain: seluruh body
+                    adalah satu payload
+    GET  /health    {"status": "ok", "tiers": ...} (+ statistik cache bila aktif)
+    GET  /metrics   Prometheus text format; ?format=json untuk snapshot JSON
+
+Fitur:
+- Keep-alive dan pipelining: request dibaca berurutan dari stream yang
+  sama, sehingga respons selalu keluar sesuai urutan request.
+- Konkurensi dibatasi semaphore; analisis (CPU-bound) dijalankan di
+  executor agar event loop tidak pernah tertahan.
+- Metrics: dengan executor thread Engine mencatat latency per tahap dan
+  hit per rule; dengan executor process worker tidak berbagi memori,
+  jadi proses induk hanya mencatat ukuran payload, verdict dan tipe.
+  Latency per request ('request') selalu dicatat di proses induk.
+"""
+
+import asyncio
+import json
+import signal
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from engine import Engine
+from metrics import Metrics
+from normalizer import Normalizer
+
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 1 << 20
+MAX_BATCH = 10_000
+
+REASONS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    411: 'Length Required', 413: 'Payload Too Large',
+    431: 'Request Header Fields Too Large', 500: 'Internal Server Error',
+}
+
+# Engine milik proses worker (mode executor 'process')
+_process_engine: Optional[Engine] = None
+
+
+def _init_process(rules_path: Optional[str], normalizer: Optional[Normalizer] = None,
+                  all_matches: bool = False, allowlist=None, fingerprints=None,
+                  adaptive_order: bool = False):
+    global _process_engine
+    if _process_engine is None:
+        from ruleset import load_ruleset
+        _process_engine = Engine(ruleset=load_ruleset(rules_path) if rules_path else None,
+                                 normalizer=normalizer, all_matches=all_matches,
+                                 fingerprints=fingerprints, allowlist=allowlist,
+                                 adaptive_order=adaptive_order)
+
+
+def _process_analyze(payloads: List[str]) -> List[dict]:
+    return _process_engine.analyze_batch(payloads)
+
+
+class HTTPError(Exception):
+    """Error yang langsung dikirim sebagai respons HTTP."""
+
+    def __init__(self, status: int, message: str = ''):
+        super().__init__(message or REASONS.get(status, ''))
+        self.status = status
+
+
+class InspectionServer:
+    """Server asyncio dengan engine bersama dan konkurensi terbatas."""
+
+    def __init__(self, engine: Engine, max_concurrency: int = 64,
+                 executor: Optional[Executor] = None, process_mode: bool = False):
+        self.engine = engine
+        if engine.metrics is None:
+            engine.metrics = Metrics()
+        self.metrics = engine.metrics
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.executor = executor
+        self.process_mode = process_mode
+        self.requests = 0
+
+    async def analyze(self, payloads: List[str]) -> List[dict]:
+        """Jalankan analisis di executor (dibatasi semaphore)."""
+        loop = asyncio.get_running_loop()
+        func = _process_analyze if self.process_mode else self.engine.analyze_batch
+        async with self.semaphore:
+            start = time.perf_counter()
+            results = await loop.run_in_executor(self.executor, func, payloads)
+        self.metrics.observe('request', time.perf_counter() - start)
+        if self.process_mode:
+            record = self.metrics.record
+            for payload, result in zip(payloads, results):
+                record(payload, result)
+        return results
+
+    async def handle_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as e:
+                    await self._send(writer, e.status, {'error': str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+
+                method, path, headers, body, keep_alive = request
+                self.requests += 1
+                try:
+                    status, payload = await self._route(method, path, headers, body)
+                except HTTPError as e:
+                    status, payload = e.status, {'error': str(e)}
+                except Exception as e:
+                    # Bug analisis satu request: jawab 500, koneksi tetap hidup
+                    print(f"[serve] {method} {path}: {type(e).__name__}: {e}",
+                          file=sys.stderr, flush=True)
+                    status, payload = 500, {'error': REASONS[500]}
+                await self._send(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader) -> Optional[Tuple]:
+        """Baca satu request; None bila koneksi ditutup dengan bersih."""
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError as e:
+            if e.partial.strip():
+                raise HTTPError(400, 'request tidak lengkap')
+            return None
+        except asyncio.LimitOverrunError:
+            raise HTTPError(431)
+
+        lines = head.decode('latin-1').split('\r\n')
+        parts = lines[0].split(' ')
+        if len(parts) != 3 or not parts[2].startswith('HTTP/1.'):
+            raise HTTPError(400, 'request line tidak valid')
+        method, path, version = parts
+
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, sep, value = line.partition(':')
+                if not sep:
+                    raise HTTPError(400, 'header tidak valid')
+                headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get('connection', '').lower()
+        if version == 'HTTP/1.0':
+            keep_alive = connection == 'keep-alive'
+        else:
+            keep_alive = connection != 'close'
+
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            raise HTTPError(411, 'gunakan Content-Length')
+        try:
+            length = int(headers.get('content-length', '0'))
+        except ValueError:
+            raise HTTPError(400, 'Content-Length tidak valid')
+        if length < 0:
+            raise HTTPError(400, 'Content-Length tidak valid')
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413)
+        body = await reader.readexactly(length) if length else b''
+        return method, path, headers, body, keep_alive
+
+    async def _route(self, method: str, path: str, headers: dict, body: bytes):
+        path, _, query = path.partition('?')
+        if path == '/metrics':
+            if method != 'GET':
+                raise HTTPError(405)
+            if 'format=json' in query:
+                return 200, self.metrics.snapshot(self.engine)
+            return 200, self.metrics.prometheus(self.engine)
+        if path == '/health':
+            if method != 'GET':
+                raise HTTPError(405)
+            health = {'status': 'ok', 'tiers': self.engine.tier_stats()}
+            if self.engine.cache is not None:
+                health['cache'] = self.engine.cache.stats()
+            return 200, health
+        if path != '/analyze':
+            raise HTTPError(404)
+        if method != 'POST':
+            raise HTTPError(405)
+
+        payloads, single = self._parse_body(headers, body)
+        results = await self.analyze(payloads)
+        if single:
+            return 200, {'result': results[0]}
+        return 200, {'results': results}
+
+    @staticmethod
+    def _parse_body(headers: dict, body: bytes) -> Tuple[List[str], bool]:
+        """Body JSON (payload/payloads) atau teks mentah → daftar payload."""
+        if 'json' not in headers.get('content-type', 'application/json'):
+            return [body.decode('utf-8', errors='replace')], True
+        try:
+            data = json.loads(body)
+        except ValueError:
+            raise HTTPError(400, 'JSON tidak valid')
+        if isinstance(data, dict) and isinstance(data.get('payload'), str):
+            return [data['payload']], True
+        if isinstance(data, dict) and isinstance(data.get('payloads'), list):
+            payloads = data['payloads']
+            if len(payloads) > MAX_BATCH or not all(isinstance(p, str) for p in payloads):
+                raise HTTPError(400, f'payloads harus list string (maks {MAX_BATCH})')
+            return payloads, False
+        raise HTTPError(400, 'body harus {"payload": str} atau {"payloads": [str]}')
+
+    @staticmethod
+    async def _send(writer, status: int, payload, keep_alive: bool):
+        """payload dict → JSON; str → text/plain (format Prometheus)."""
+        if isinstance(payload, str):
+            body = payload.encode('utf-8')
+            content_type = 'text/plain; version=0.0.4; charset=utf-8'
+        else:
+            body = json.dumps(payload).encode('utf-8')
+            content_type = 'application/json'
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+
+async def serve(host: str, port: int, engine: Engine, max_concurrency: int = 64,
+                executor_kind: str = 'thread', workers: int = 4,
+                rules_path: Optional[str] = None, ready=None):
+    """Jalankan server sampai dihentikan (Ctrl+C)."""
+    if executor_kind == 'process':
+        # Fork mewarisi engine yang sudah dibangun; spawn membangun ulang
+        global _process_engine
+        _process_engine = engine
+        executor = ProcessPoolExecutor(workers, initializer=_init_process,
+                                       initargs=(rules_path, engine.normalizer,
+                                                 engine.all_matches, engine.allowlist,
+                                                 engine.fingerprints,
+                                                 engine.simulator.rule_order.adaptive))
+    else:
+        executor = ThreadPoolExecutor(workers)
+
+    app = InspectionServer(engine, max_concurrency, executor,
+                           process_mode=(executor_kind == 'process'))
+    server = await asyncio.start_server(app.handle_connection, host, port,
+                                        limit=MAX_HEADER_BYTES)
+    addr = server.sockets[0].getsockname()
+    print(f"[serve] Mini-IDS mendengarkan di http://{addr[0]}:{addr[1]} "
+          f"(executor={executor_kind}, workers={workers}, konkurensi={max_concurrency})",
+          file=sys.stderr, flush=True)
+    if ready is not None:
+        ready(addr)
+
+    # SIGTERM diperlakukan seperti Ctrl+C agar worker pool ikut dihentikan
+    task = asyncio.current_task()
+    loop = asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(signal.SIGTERM, task.cancel)
+    except (NotImplementedError, RuntimeError):
+        pass
+    try:
+        async with server:
+            await server.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def parse_address(value: str) -> Tuple[str, int]:
+    """'8080' atau 'host:8080' → (host, port); ValueError bila port tidak valid."""
+    host, sep, port = value.rpartition(':')
+    if not port.isdigit() or not 0 <= int(port) <= 65535:
+        raise ValueError(f"port harus angka 0-65535: {value!r}")
+    return (host or '127.0.0.1') if sep else '127.0.0.1', int(port)
@@ -0,0 +1,160 @@
+"""
+Prefilter Batch Tervektorisasi (NumPy, opsional)
+================================================
+Untuk batch besar, cek tier 0 per payload di loop Python mendominasi.
+VectorPrefilter memeriksa satu batch sekaligus dan menandai baris yang
+PASTI bersih; hanya baris sisanya yang masuk DFASimulator.
+
+Sinyal diturunkan dari literal wajib setiap pattern (prefilter.py):
+setiap match memuat salah satu literal dari setiap grup, jadi juga
+awalannya. Sinyal = awalan literal (maks MAX_SIGNAL karakter, lowercase):
+
+    '\\s*(OR|AND)\\s*'   →  "'"  ∧  ("or" ∨ "and")  ∧  "'"
+    '--                 →  "'--"   (quote diikuti '-')
+    '#                  →  "'#"
+
+Baris bersih bila untuk setiap pattern ada grup yang tidak satu pun
+sinyalnya muncul. Dibanding tier 0 (hanya karakter pertama, maks 3
+grup), adjacency ini juga membersihkan payload seperti "men's jacket".
+
+Backend NumPy: batch dikemas menjadi satu buffer uint8 (baris dipisah
+NUL) plus vektor panjang/offset, tanpa padding per baris. Per karakter
+sinyal satu perbandingan atas seluruh buffer; sinyal satu karakter
+direduksi per baris dengan logical_or.reduceat, sinyal lebih panjang
+= AND dua karakter pertama (adjacency, mis. quote diikuti '-') lalu
+karakter sisanya hanya di posisi kandidat, dan searchsorted atas
+offset memetakan posisi ke baris. Backend Python
+(tanpa NumPy) memakai substring search per payload; hasil keduanya
+identik.
+
+Baris non-ASCII selalu lolos ke DFA: dengan IGNORECASE karakter
+seperti 'K' (Kelvin) cocok dengan 'k'.
+"""
+
+import re
+from typing import List, Optional, Sequence
+
+from prefilter import required_literals
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAS_NUMPY = np is not None
+
+# Panjang maksimal sinyal (awalan literal) yang dicek
+MAX_SIGNAL = 4
+# Batch lebih kecil dari ini tidak sebanding dengan biaya packing NumPy
+MIN_NUMPY_ROWS = 64
+
+
+class VectorPrefilter:
+    """
+    Penanda baris pasti bersih untuk sekumpulan pattern regex.
+
+    clean(payloads) → list bool (True = tidak mungkin cocok dengan
+    pattern mana pun). enabled False bila ada pattern tanpa literal
+    wajib: semua baris harus lolos.
+    """
+
+    def __init__(self, patterns: Sequence[str], flags: int = re.IGNORECASE,
+                 backend: Optional[str] = None):
+        if backend is None:
+            backend = 'numpy' if HAS_NUMPY else 'python'
+        if backend == 'numpy' and not HAS_NUMPY:
+            raise ValueError("backend 'numpy' butuh NumPy")
+        self.backend = backend
+        self.rules = []
+        self.enabled = True
+        for pattern in patterns:
+            groups = []
+            for group in required_literals(pattern, flags):
+                # Literal non-ASCII bisa cocok dengan teks ASCII lewat IGNORECASE
+                if all(lit.isascii() for lit in group):
+                    groups.append(tuple(sorted({lit[:MAX_SIGNAL] for lit in group})))
+            if not groups:
+                self.enabled = False
+                break
+            self.rules.append(tuple(groups))
+        self.signals = sorted({s for groups in self.rules for group in groups for s in group})
+
+    def clean(self, payloads: Sequence[str]) -> List[bool]:
+        if not self.enabled or not payloads:
+            return [False] * len(payloads)
+        if self.backend == 'numpy' and len(payloads) >= MIN_NUMPY_ROWS:
+            return self._clean_numpy(payloads).tolist()
+        return self._clean_python(payloads)
+
+    def _clean_python(self, payloads: Sequence[str]) -> List[bool]:
+        rules = self.rules
+        out = []
+        for payload in payloads:
+            if not payload.isascii():
+                out.append(False)
+                continue
+            text = payload.lower()
+            out.append(not any(all(any(s in text for s in group) for group in groups)
+                               for groups in rules))
+        return out
+
+    def _clean_numpy(self, payloads: Sequence[str]):
+        n = len(payloads)
+        # Baris non-ASCII selalu lolos; di buffer diganti string kosong
+        ascii_rows = np.fromiter(map(str.isascii, payloads), dtype=bool, count=n)
+        rows = [p if ok else '' for p, ok in zip(payloads, ascii_rows.tolist())]
+        lengths = np.fromiter(map(len, rows), dtype=np.int64, count=n)
+        # Setiap baris diikuti NUL: segmen tidak pernah kosong dan sinyal
+        # tidak bisa menyeberang ke baris berikutnya
+        ends = np.cumsum(lengths + 1)
+        starts = ends - lengths - 1
+        total = int(ends[-1])
+        buffer = ('\0'.join(rows) + '\0' * MAX_SIGNAL).encode('ascii')
+        flat = np.frombuffer(buffer, dtype=np.uint8)
+        folded = None
+        equal = {}
+
+        def eq(char: str):
+            """Posisi karakter (huruf: case-insensitive) sebagai array bool."""
+            nonlocal folded
+            mask = equal.get(char)
+            if mask is None:
+                if char.isalpha():
+                    if folded is None:
+                        folded = flat | 0x20
+                    mask = folded == ord(char)
+                else:
+                    mask = flat == ord(char)
+                equal[char] = mask
+            return mask
+
+        present = {}
+        for signal in self.signals:
+            if len(signal) == 1 and signal != '\0':
+                present[signal] = np.logical_or.reduceat(eq(signal)[:total], starts)
+                continue
+            # Dua karakter pertama dense, sisanya hanya di posisi kandidat
+            hits = eq(signal[0])[:total]
+            if len(signal) > 1:
+                hits = hits & eq(signal[1])[1:total + 1]
+            hits = np.flatnonzero(hits)
+            for shift, char in enumerate(signal[2:], 2):
+                hits = hits[eq(char)[hits + shift]]
+            row_ids = np.searchsorted(ends, hits, side='right')
+            if '\0' in signal:
+                # Hanya sinyal ber-NUL yang bisa menyentuh separator baris
+                row_ids = row_ids[hits + len(signal) <= starts[row_ids] + lengths[row_ids]]
+            found = np.zeros(n, dtype=bool)
+            found[row_ids] = True
+            present[signal] = found
+
+        survive = ~ascii_rows
+        for groups in self.rules:
+            matched = None
+            for group in groups:
+                any_signal = present[group[0]]
+                for signal in group[1:]:
+                    any_signal = any_signal | present[signal]
+                matched = any_signal if matched is None else matched & any_signal
+            survive |= matched
+        return ~survive